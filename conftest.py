@@ -0,0 +1,11 @@
+import sys
+
+
+collect_ignore = []
+if sys.version_info < (3, 5):
+    # Modules using async and await
+    collect_ignore = ['pymenu/aio.py',
+                      'pymenu/ext/xdmenu/aio.py',
+                      'tests/unit/test_aio.py',
+                      'tests/integration/test_aio.py',
+                      'tests/integration/ext/test_xdmenu_aio.py']
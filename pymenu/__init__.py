@@ -12,41 +12,74 @@ from __future__ import unicode_literals
 import os
 from collections import OrderedDict
 import errno
+import time
+import types
 
 import anytree
 import six
 
-from pkg_resources import get_distribution, DistributionNotFound
+__project__ = 'pymenu'
 
-__project__ = 'xdmenu'
-__version__ = None  # required for initial installation
 
-try:
-    distribution = get_distribution(__project__)
-    __version__ = distribution.version
+def __getattr__(name):
+    # Looking up the installed distribution is slow, so the version is only
+    # looked up when needed (see PEP 562).
+    if name == '__version__':
+        version = get_version()
+        globals()['__version__'] = version
+        return version
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__,
+                                                                    name))
 
-except DistributionNotFound:
-    # This will happen if the package is not installed.
-    # For more informations about development installation, read about
-    # the 'develop' setup.py command or the '--editable' pip option.
-    # Note that development installations may break other packages from
-    # the same implicit namespace
-    # (see https://github.com/pypa/packaging-problems/issues/12)
-    __version__ = '(local)'
-else:
-    pass
+
+def get_version():
+    """
+    Provide the version of the installed `pymenu` distribution.
+
+    On Python 3.7 and later, this is also available as ``pymenu.__version__``.
+
+    Returns:
+        str: The version, or ``'(local)'`` if `pymenu` is not installed.
+    """
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+    except ImportError:
+        # python < 3.8
+        from pkg_resources import get_distribution
+        from pkg_resources import DistributionNotFound as PackageNotFoundError
+
+        def version(project):
+            return get_distribution(project).version
+
+    try:
+        return version(__project__)
+    except PackageNotFoundError:
+        # This will happen if the package is not installed.
+        # For more informations about development installation, read about
+        # the 'develop' setup.py command or the '--editable' pip option.
+        # Note that development installations may break other packages from
+        # the same implicit namespace
+        # (see https://github.com/pypa/packaging-problems/issues/12)
+        return '(local)'
 
 
 class Menu(object):
-    def __init__(self, root_entry, prompt):
+    def __init__(self, root_entry, prompt, frecency=None, prefetcher=None):
         """
 
         Args:
             root_entry (pymenu.MenuEntry):
             prompt (pymenu.Prompt):
+            frecency (pymenu.frecency.FrecencyStore): When provided, chosen
+                entries are recorded in it and choices are listed by
+                decreasing frecency.
+            prefetcher (pymenu.prefetch.Prefetcher): When provided, listed
+                entries are loaded in the background while prompting.
         """
         self._root = root_entry
         self._prompt = prompt
+        self._frecency = frecency
+        self._prefetcher = prefetcher
 
     @property
     def entry(self):
@@ -66,7 +99,7 @@ class Menu(object):
         current_menu = self
         while not current_menu.entry.is_leaf:
             current_menu = current_menu.choose_menu()
-        return current_menu.entry.value
+        return self._chosen_value(current_menu.entry)
 
     def choose_menu(self):
         """
@@ -75,14 +108,155 @@ class Menu(object):
         Returns:
             pymenu.Menu: The chosen menu object
         """
-        choices = OrderedDict()
+        chosen_ley = self._prompt_in_menu(self._prompt.prompt_for_one)
+        return self._submenu(self._chosen_entry(chosen_ley))
+
+    def choose_values(self):
+        """
+        Prompt until leaf menu items are chosen, several at once.
+
+        Choosing a single submenu opens it, like with :meth:`~choose_value`.
+        Choosing several items ends prompting: the chosen leaves are
+        provided, in the order they were chosen.  Submenus chosen with other
+        items are ignored, rather than walking whole trees under them.
+
+        Returns:
+            list: The associated values of the chosen items.  Empty if the
+            prompt was cancelled.
+
+        See Also:
+            :meth:`pymenu.Prompt.prompt_for_many`
+        """
+        current_menu = self
+        while not current_menu.entry.is_leaf:
+            labels = current_menu._prompt_in_menu(
+                self._prompt.prompt_for_many)
+            entries = current_menu._chosen_entries(labels)
+            if len(entries) != 1:
+                return self._chosen_values(entries)
+            current_menu = current_menu._submenu(entries[0])
+        return self._chosen_values([current_menu.entry])
+
+    def choose_flat_value(self, separator='/'):
+        """
+        Prompt once for any leaf menu item.
+
+        All leaves under this menu are listed together, labeled with their
+        path such as ``Development/Editors/Vim``.  The whole tree is walked,
+        loading lazy entries.
+
+        Args:
+            separator (str): Separates entry names in labels.
+
+        Returns:
+            Any: The associated value for the chosen item.
+
+        See Also:
+            :meth:`pymenu.MenuEntry.flat_choices`
+        """
+        choices = self.entry.flat_choices(separator)
+        chosen_key = self._prompt.prompt_for_one(self._sorted_labels(choices))
+        return self._chosen_value(choices[chosen_key])
+
+    def _prompt_in_menu(self, prompt_for):
+        """
+        Prompt for the child entries of this menu.
+
+        Args:
+            prompt_for (Callable): A method of the prompt, such as
+                :meth:`pymenu.Prompt.prompt_for_one`.
+
+        Returns:
+            Any: What `prompt_for` returned.
+        """
+        if self._frecency is None and self._prefetcher is None:
+            # Labels are given to the prompt while child entries are loaded
+            labels = self._stream_labels()
+            try:
+                return prompt_for(labels)
+            finally:
+                labels.close()
+        choices = self.entry.labeled_children()
+        labels = self._sorted_labels(choices)
+        job = None
+        if self._prefetcher is not None:
+            job = self._prefetcher.prefetch(choices[label] for label in labels)
+        try:
+            return prompt_for(self._menu_labels(labels))
+        finally:
+            if job is not None:
+                job.stop()
+
+    def _stream_labels(self):
         if self.entry.parent:
-            choices['..'] = self.entry.parent
-        for entry in self.entry.children:
-            choices[entry.name] = entry
+            yield '..'
+        labeled_children = self.entry.iter_labeled_children()
+        try:
+            for label, entry in labeled_children:
+                yield label
+        finally:
+            # Remaining entries are still loaded
+            labeled_children.close()
 
-        chosen_ley = self._prompt.prompt_for_one(choices.keys())
-        return self.__class__(choices[chosen_ley], self._prompt)
+    def _submenu(self, entry):
+        return self.__class__(entry, self._prompt, frecency=self._frecency,
+                              prefetcher=self._prefetcher)
+
+    def _menu_labels(self, labels):
+        """
+        Returns:
+            list: The labels to choose from, starting with ``'..'`` if this
+            menu has a parent.
+        """
+        labels = list(labels)
+        if self.entry.parent:
+            labels.insert(0, '..')
+        return labels
+
+    def _sorted_labels(self, choices):
+        labels = choices.keys()
+        if self._frecency is not None:
+            labels = sorted(labels, key=lambda label: -self._frecency.rank(
+                choices[label].usage_key))
+        return labels
+
+    def _chosen_entry(self, label):
+        """
+        Find the entry of a chosen label, in constant time.
+
+        Returns:
+            pymenu.MenuEntry
+        """
+        if label == '..' and self.entry.parent:
+            return self.entry.parent
+        return self.entry.labeled_children()[label]
+
+    def _chosen_entries(self, labels):
+        if len(labels) > 1:
+            # Going up is only meant to be chosen alone
+            labels = [label for label in labels if label != '..']
+        return [self._chosen_entry(label) for label in labels]
+
+    def _chosen_values(self, chosen_entries):
+        """
+        Record the chosen leaf entries, ignoring submenus.
+
+        Returns:
+            list: The values of the leaves.
+        """
+        return [self._chosen_value(entry) for entry in chosen_entries
+                if entry.is_leaf]
+
+    def _chosen_value(self, chosen_entry):
+        """
+        Record the chosen leaf entry.
+
+        Returns:
+            Any: Its value.
+        """
+        if self._frecency is not None:
+            self._frecency.record_entry(chosen_entry)
+        return chosen_entry.value
 
 
 class MenuEntry(anytree.Node):
@@ -102,11 +276,228 @@ class MenuEntry(anytree.Node):
         super(MenuEntry, self).__init__(name,
                                         parent=parent)
         self._value = value
+        self._flat_choices_cache = None
+        # Whether a flat_choices result of this entry or an ancestor may
+        # include entries under this one
+        self._in_flat_choices = False
+        self._labeled_children_cache = None
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        self._name = name
+        parent = self.parent
+        if parent is not None:
+            # Labels of the siblings and flat labels above are made from names
+            parent._children_changed()
 
     @property
     def value(self):
         return self._value
 
+    @property
+    def usage_key(self):
+        """
+        Identify this entry in usage records, across menu instances.
+
+        Returns:
+            str: The names of the entries leading to this one.
+
+        See Also:
+            :class:`pymenu.frecency.FrecencyStore`
+        """
+        return '/'.join(entry.name for entry in self.path)
+
+    def flat_choices(self, separator='/'):
+        """
+        Map labels to all the leaves under this entry.
+
+        The result is cached until entries are attached or detached under
+        this entry.  Lazy entries are loaded without counting as visited, so
+        that other entries are not unloaded during the walk.
+
+        Args:
+            separator (str): Separates entry names in labels.
+
+        Returns:
+            OrderedDict: Leaf entries indexed by their unique label, in
+            tree order.
+
+        See Also:
+            :meth:`~path_label`
+        """
+        cache = self._flat_choices_cache
+        if cache is not None and cache[0] == separator:
+            return cache[1]
+
+        choices = OrderedDict()
+        stack = [self]
+        while stack:
+            entry = stack.pop()
+            children = _loaded_children(entry)
+            # Changes under this entry now reach the cache
+            entry._in_flat_choices = True
+            if children:
+                stack.extend(reversed(children))
+            elif entry is not self:
+                label = entry.path_label(self, separator)
+                choices[_unique_label(label, choices)] = entry
+        self._flat_choices_cache = (separator, choices)
+        return choices
+
+    def iter_children(self):
+        """
+        Provide child entries one by one.
+
+        Lazy entries load child entries while they are iterated, so that
+        the first ones can be used before the last ones are loaded.
+
+        Returns:
+            Iterator[pymenu.MenuEntry]: Has a ``close`` method, like
+            generators.
+        """
+        for child in self.children:
+            yield child
+
+    def labeled_children(self):
+        """
+        Map unique labels to child entries.
+
+        Labels are entry names, numbered when siblings share a name, such as
+        ``Firefox`` and ``Firefox (2)``.  No label is ``'..'``, which menus
+        use for the parent entry.  The result is cached until child entries
+        are attached, detached or renamed.
+
+        Returns:
+            OrderedDict: Child entries indexed by their label, in order.
+        """
+        if self._labeled_children_cache is None:
+            for item in self.iter_labeled_children():
+                pass
+        return self._labeled_children_cache
+
+    def iter_labeled_children(self):
+        """
+        Provide child entries one by one, with their label.
+
+        Once all the entries are provided, :meth:`~labeled_children` is
+        cached.
+
+        Returns:
+            Iterator[Tuple[str, pymenu.MenuEntry]]: Has a ``close`` method,
+            like generators.
+
+        See Also:
+            :meth:`~iter_children`
+        """
+        labeled_children = self._labeled_children_cache
+        if labeled_children is not None:
+            for item in six.iteritems(labeled_children):
+                yield item
+            return
+
+        labeled_children = OrderedDict([('..', None)])
+        children = self.iter_children()
+        try:
+            for child in children:
+                label = _unique_label(child.name, labeled_children)
+                labeled_children[label] = child
+                yield label, child
+        finally:
+            children.close()
+        del labeled_children['..']
+        self._labeled_children_cache = labeled_children
+
+    def path_label(self, ancestor, separator='/'):
+        """
+        Make a label from the names of entries leading to this one.
+
+        Args:
+            ancestor (pymenu.MenuEntry): Where the path starts, excluded.
+            separator (str): Separates entry names.
+
+        Returns:
+            str
+        """
+        names = []
+        for entry in self.iter_path_reverse():
+            if entry is ancestor:
+                break
+            names.append(entry.name)
+        return separator.join(reversed(names))
+
+    def _new_child(self, name, value=None):
+        """
+        Create a child entry of the same class, without children.
+
+        The constructor of the class is not called, so that trees can be
+        built with a work stack instead of recursive constructor calls.
+        Subclasses with attributes of their own set them in
+        :meth:`~init_new_child`.
+
+        Args:
+            name (str): A name for the child.
+            value (Any): Its associated value.
+
+        Returns:
+            pymenu.MenuEntry
+        """
+        child = self.__class__.__new__(self.__class__)
+        MenuEntry.__init__(child, name, value=value)
+        self.init_new_child(child)
+        self._attach_new(child)
+        return child
+
+    def init_new_child(self, child):
+        """
+        Initialize what the constructor of a subclass would for a child.
+
+        Dictionary, stream and XDG menu trees create the entries below their
+        root without calling the constructor of their class.  Subclasses
+        setting attributes in their constructor override this method to set
+        them on these entries.  It does nothing by default.
+
+        Args:
+            child (pymenu.MenuEntry): The child, with its name and value, not
+                attached yet.
+        """
+
+    def _attach_new(self, child):
+        """
+        Append a newly created entry to the children of this one.
+
+        Unlike setting :attr:`parent`, this does not check that `child` is not
+        an ancestor of this entry, which takes a time proportional to the
+        depth of the tree.  This is always true for new entries.
+
+        Args:
+            child (pymenu.MenuEntry): An entry without parent nor children.
+        """
+        child._pre_attach(self)
+        # The storage of anytree.NodeMixin
+        self.__dict__.setdefault('_NodeMixin__children', []).append(child)
+        child._NodeMixin__parent = self
+        child._post_attach(self)
+
+    def _post_attach(self, parent):
+        parent._children_changed()
+
+    def _post_detach(self, parent):
+        parent._children_changed()
+
+    def _children_changed(self):
+        """
+        Drop the cached views of trees which include the children of this
+        entry.
+        """
+        self._labeled_children_cache = None
+        if self._in_flat_choices:
+            for entry in self.iter_path_reverse():
+                entry._flat_choices_cache = None
+
 
 class Prompt(object):
     """
@@ -117,13 +508,30 @@ class Prompt(object):
         """
 
         Args:
-            choices (list): List from which to choose from.
+            choices (Iterable[str]): Choices to choose from.  This may be an
+                iterator still loading choices, to be iterated only once.
 
         Returns:
             str
         """
         raise NotImplementedError
 
+    def prompt_for_many(self, choices):
+        """
+        Prompt for any number of choices at once.
+
+        The default implementation lets the user choose a single one with
+        :meth:`~prompt_for_one`.
+
+        Args:
+            choices (Iterable[str]): See :meth:`~prompt_for_one`.
+
+        Returns:
+            list: The chosen items, in the order they were chosen.
+        """
+        choice = self.prompt_for_one(choices)
+        return [] if choice is None else [choice]
+
 
 class DictMenuEntry(MenuEntry):
     def __init__(self, name, data, parent=None):
@@ -142,38 +550,615 @@ class DictMenuEntry(MenuEntry):
                                             value=menuvalue,
                                             parent=parent)
 
+        stack = [(self, data)]
+        while stack:
+            entry, entry_data = stack.pop()
+            try:
+                items = six.iteritems(entry_data)
+            except AttributeError:
+                # entry_data is not a dictionnary
+                continue
+            for key, value in items:
+                if _is_dict(value):
+                    stack.append((entry._new_child(key), value))
+                else:
+                    entry._new_child(key, value)
+
+
+class LazyMenuEntry(MenuEntry):
+    def __init__(self, name, value=None, parent=None, max_loaded=None):
+        """
+        A menu tree node which child nodes are created on demand.
+
+        Child entries are created by :meth:`~_load_children` the first time
+        :attr:`~children` is accessed, which usually happens when a
+        :class:`~Menu` prompts for them.  Sub classes must implement
+        :meth:`~_load_children` and may implement :meth:`~_has_children`.
+
+        Args:
+            name (str): A name for this node.
+            value (Any): Associated value.
+            parent (pymenu.MenuEntry): Parent entry node.
+            max_loaded (int): Only used by root entries.  When set, at most
+                this many entries of the tree keep their child entries
+                loaded.  The least recently visited entries are unloaded
+                first, except for the visited entry and its ancestors.
+        """
+        super(LazyMenuEntry, self).__init__(name,
+                                            value=value,
+                                            parent=parent)
+        self._loaded = False
+        if isinstance(parent, LazyMenuEntry):
+            self._loaded_entries = parent._loaded_entries
+        else:
+            self._loaded_entries = _LoadedEntries(max_loaded)
+
+    @MenuEntry.children.getter
+    def children(self):
+        self.load()
+        self._loaded_entries.touch(self)
+        return super(LazyMenuEntry, self).children
+
+    @property
+    def is_leaf(self):
+        if self._loaded:
+            return super(LazyMenuEntry, self).is_leaf
+        return not self._has_children()
+
+    @property
+    def is_loaded(self):
+        """
+        Returns:
+            bool: Whether child entries were created.
+        """
+        return self._loaded
+
+    @property
+    def loaded_children(self):
+        """
+        Provide child entries without creating them.
+
+        Returns:
+            tuple: Child entries, empty if they were not loaded.
+        """
+        return super(LazyMenuEntry, self).children
+
+    def load(self):
+        """
+        Create child entries if it was not already done.
+        """
+        if not self._loaded:
+            self._loaded = True
+            try:
+                self._load_children()
+            except Exception:
+                # Loading again is attempted on the next visit
+                self.unload()
+                raise
+
+    def iter_children(self):
+        self._loaded_entries.touch(self)
+        if self._loaded:
+            for child in self.loaded_children:
+                yield child
+            return
+        self._loaded = True
+        children = self._iter_load_children()
         try:
-            for key, value in six.iteritems(data):
-                DictMenuEntry(key, value, self)
-        except AttributeError:
-            # data is not a dictionnary
+            try:
+                for child in children:
+                    yield child
+            finally:
+                # Child entries are loaded even if iteration stops early
+                for child in children:
+                    pass
+        except Exception:
+            self.unload()
+            raise
+
+    def iter_labeled_children(self):
+        self._loaded_entries.touch(self)
+        return super(LazyMenuEntry, self).iter_labeled_children()
+
+    def unload(self):
+        """
+        Drop child entries.
+
+        They will be created again the next time :attr:`~children` is
+        accessed.
+        """
+        if not self._loaded:
+            return
+        # Loaded descendants are unloaded as well, with a work stack rather
+        # than recursively, so that deep trees can be unloaded
+        loaded = []
+        stack = [self]
+        while stack:
+            entry = stack.pop()
+            if isinstance(entry, LazyMenuEntry) and entry._loaded:
+                loaded.append(entry)
+                stack.extend(super(LazyMenuEntry, entry).children)
+        # Parents first: children detached from a detached entry only drop
+        # the cached views of its subtree, instead of the whole path
+        for entry in loaded:
+            for child in super(LazyMenuEntry, entry).children:
+                child.parent = None
+            entry._loaded = False
+            entry._labeled_children_cache = None
+            entry._loaded_entries.forget(entry)
+
+    def _load_children(self):
+        """
+        Create child entries of this node, with this node as their parent.
+        """
+        raise NotImplementedError
+
+    def _iter_load_children(self):
+        """
+        Create child entries of this node, providing them as they are made.
+
+        The default implementation provides them once
+        :meth:`~_load_children` made all of them.  Sub classes may override
+        this, and then implement :meth:`~_load_children` with it.
+
+        Returns:
+            Iterator[pymenu.MenuEntry]
+        """
+        self._load_children()
+        return iter(self.loaded_children)
+
+    def _post_attach(self, parent):
+        super(LazyMenuEntry, self)._post_attach(parent)
+        if isinstance(parent, LazyMenuEntry):
+            self._loaded_entries = parent._loaded_entries
+
+    def _has_children(self):
+        """
+        Tell whether this node has child entries before they are loaded.
+
+        The default implementation loads child entries.  Sub classes should
+        override this with a cheaper check when possible.
+
+        Returns:
+            bool
+        """
+        return bool(self.children)
+
+
+class _LoadedEntries(object):
+    def __init__(self, max_loaded=None):
+        """
+        Loaded entries of a lazy tree, least recently visited first.
+
+        Args:
+            max_loaded (int): How many entries may stay loaded.  Unlimited
+                if ``None``.
+        """
+        self._max_loaded = max_loaded
+        self._entries = OrderedDict()
+
+    def touch(self, entry):
+        if self._max_loaded is None:
+            return
+        self._entries.pop(entry, None)
+        self._entries[entry] = None
+        if len(self._entries) <= self._max_loaded:
+            return
+        visited_path = set(entry.path)
+        for candidate in list(self._entries):
+            if len(self._entries) <= self._max_loaded:
+                break
+            if candidate not in visited_path:
+                candidate.unload()
+
+    def forget(self, entry):
+        self._entries.pop(entry, None)
+
+
+class LazyDictMenuEntry(LazyMenuEntry):
+    def __init__(self, name, data, parent=None, max_loaded=None):
+        """
+        A menu tree node made of a dictionary structure, on demand.
+
+        Like :class:`~DictMenuEntry`, but child entries of a dictionary are
+        only created when first visited.  The tree keeps a reference to
+        `data` instead of copying it.
+
+        Values may also make submenus on demand:
+
+        * a callable is called each time its entry is loaded, and returns a
+          dictionary or an iterable of ``(name, value)`` pairs;
+        * a generator of ``(name, value)`` pairs is consumed when its entry
+          is first loaded.
+
+        Such entries are never leaves before they are loaded, so callable
+        leaf values need another menu tree.
+
+        Args:
+            name (str): The name of this node.
+            data (Any): The value of this node.  If this is a dictionary, a
+                callable or a generator, child nodes will be created from it.
+            parent (pymenu.MenuEntry): Parent entry node.
+            max_loaded (int): See :class:`~LazyMenuEntry`.
+
+        Examples:
+
+            .. code-block:: python
+
+                def list_windows():
+                    return {window.title: window for window in get_windows()}
+
+                menu_entry = LazyDictMenuEntry('Menu', {
+                    'Windows': list_windows,
+                    'Settings': load_settings()})
+        """
+        menuvalue = None if _is_lazy_menu(data) else data
+        super(LazyDictMenuEntry, self).__init__(name,
+                                                value=menuvalue,
+                                                parent=parent,
+                                                max_loaded=max_loaded)
+        self._data = data
+
+    def _load_children(self):
+        for child in self._iter_load_children():
             pass
 
+    def _iter_load_children(self):
+        data = self._data
+        if not _is_lazy_menu(data):
+            return
+        recorded = None
+        if callable(data):
+            data = data()
+        elif isinstance(data, types.GeneratorType):
+            # Generators are consumed once, loading again reads their items
+            recorded = self._data = OrderedDict()
+        items = six.iteritems(data) if hasattr(data, 'items') else data
+        for key, value in items:
+            if recorded is not None:
+                recorded[key] = value
+            child = self.__class__(key, value)
+            self._attach_new(child)
+            yield child
+
+    def _has_children(self):
+        return _is_lazy_menu(self._data)
+
 
-class FileSystemMenuEntry(MenuEntry):
-    def __init__(self, path, parent=None):
+class FileSystemMenuEntry(LazyMenuEntry):
+    def __init__(self, path, parent=None, lazy=False, max_loaded=None,
+                 dir_entry=None, path_filter=None):
         """
         A menu tree node made from a filesystem path.
 
         Args:
             path (str): Filesystem path from which to build the menu tree.
             parent (pymenu.MenuEntry): Paren entry node.
+            lazy (bool): List a directory only when its child entries are
+                requested.  Otherwise, the whole tree is created at once.
+            max_loaded (int): See :class:`~LazyMenuEntry`.  This is only
+                useful when `lazy` is true.
+            dir_entry (os.DirEntry): What scanning the parent directory
+                returned for `path`, from which the type of the path is known
+                without a system call.
+            path_filter (pymenu.filters.PathFilter): Which paths to include
+                below `path`.  Excluded directories are never listed.
 
         Note:
-            The creation of child nodes if **not lazy**. This means that
-            creating an instance of this class from a top level folder of a
-            large file sets will consumes a lot of RAM.
+            Directories are never listed inside themselves, so symbolic links
+            to parent directories do not make endless trees.
+
+            The creation of child nodes is **not lazy** by default.  This
+            means that creating an instance of this class from a top level
+            folder of a large file sets will consumes a lot of RAM.
+
+            A lazy directory entry is never a leaf, even if the directory is
+            empty.
         """
         path = str(path)
         super(FileSystemMenuEntry, self).__init__(path,
                                                   value=path,
-                                                  parent=parent)
+                                                  parent=parent,
+                                                  max_loaded=max_loaded)
+        self._lazy = lazy
+        self._path_filter = path_filter
+        self._root_length = len(path)
+        # Only for the root: _make_child sets it for children
+        self._listable = getattr(path_filter, 'max_depth', None) != 0
+        self._dir_entry = dir_entry
+        self._stat = None
+        self._is_directory = None
+        if dir_entry is not None:
+            self._is_directory = dir_entry.is_dir()
+        if not lazy:
+            self.load()
+
+    @property
+    def is_directory(self):
+        """
+        Returns:
+            bool: Whether this entry is a directory.
+        """
+        if self._is_directory is None:
+            self._is_directory = os.path.isdir(self.value)
+        return self._is_directory
+
+    @property
+    def is_symlink(self):
+        """
+        Returns:
+            bool: Whether this entry is a symbolic link.
+        """
+        if self._dir_entry is not None:
+            return self._dir_entry.is_symlink()
+        return os.path.islink(self.value)
+
+    @property
+    def stat(self):
+        """
+        The status of the path, following symbolic links.
+
+        It is requested once and cached.  On Windows, scanning directories
+        already provides it.
+
+        Returns:
+            os.stat_result
+        """
+        if self._stat is None:
+            if self._dir_entry is not None:
+                self._stat = self._dir_entry.stat()
+            else:
+                self._stat = os.stat(self.value)
+        return self._stat
+
+    @property
+    def size(self):
+        """
+        Returns:
+            int: The size of the path, in bytes.
+        """
+        return self.stat.st_size
+
+    @property
+    def mtime(self):
+        """
+        Returns:
+            float: The last modification time of the path, as a timestamp.
+        """
+        return self.stat.st_mtime
+
+    def refresh(self):
+        """
+        Synchronize child entries with the content of the directory.
+
+        Only entries for added or removed paths are created or dropped.  This
+        does nothing if child entries were not loaded.
+        """
+        if not self._loaded or not self._listable:
+            return
+        try:
+            dir_entries = dict((dir_entry.name, dir_entry)
+                               for dir_entry in _scandir(self.value))
+        except OSError as e:
+            if e.errno not in (errno.ENOTDIR, errno.ENOENT):
+                raise e
+            dir_entries = {}
+        for child in self.loaded_children:
+            name = os.path.basename(child.value)
+            if name in dir_entries:
+                del dir_entries[name]
+            else:
+                child.parent = None
+        for child in self._make_children(dir_entries[name]
+                                         for name in sorted(dir_entries)):
+            if not child._lazy:
+                child.load()
+
+    def add_child(self, name):
+        """
+        Create the child entry for a new path in this directory.
+
+        Args:
+            name (str): The base name of the new path.
+
+        Returns:
+            pymenu.FileSystemMenuEntry: The new entry, or ``None`` if child
+            entries were not loaded, if it already exists or if it is
+            excluded.
+        """
+        if not self._loaded or self.get_child(name) is not None:
+            return None
+        for child in self._make_children([_ListedEntry(self.value, name)]):
+            if not child._lazy:
+                child.load()
+            return child
+        return None
+
+    def remove_child(self, name):
+        """
+        Drop the child entry of a removed path in this directory.
+
+        Args:
+            name (str): The base name of the removed path.
+
+        Returns:
+            pymenu.FileSystemMenuEntry: The dropped entry, if any.
+        """
+        child = self.get_child(name)
+        if child is not None:
+            child.parent = None
+        return child
+
+    def rename_child(self, name, new_name):
+        """
+        Rename the child entry of a renamed path in this directory.
+
+        The paths of loaded descendants are updated as well.  A child
+        already named `new_name`, which the renamed path replaced, is
+        dropped.
+
+        Args:
+            name (str): The previous base name.
+            new_name (str): The new base name.
+
+        Returns:
+            pymenu.FileSystemMenuEntry: The renamed entry, if any.
+        """
+        child = self.get_child(name)
+        if name != new_name:
+            # Renaming overwrites the target
+            self.remove_child(new_name)
+        if child is None:
+            return self.add_child(new_name)
+        old_path = child.value
+        new_path = os.path.join(self.value, new_name)
+        renamed = [child]
+        while renamed:
+            entry = renamed.pop()
+            path = new_path + entry.value[len(old_path):]
+            entry.name = entry._value = path
+            entry._dir_entry = entry._stat = None
+            renamed.extend(entry.loaded_children)
+        return child
+
+    def get_child(self, name):
+        """
+        Find a loaded child entry by base name.
+
+        Args:
+            name (str): The base name of the child path.
+
+        Returns:
+            pymenu.FileSystemMenuEntry: The child entry, if any.
+        """
+        path = os.path.join(self.value, name)
+        for child in self.loaded_children:
+            if child.value == path:
+                return child
+        return None
+
+    def _make_children(self, dir_entries, lazy=None):
+        return list(self._iter_new_children(dir_entries, lazy=lazy))
+
+    def _iter_new_children(self, dir_entries, lazy=None):
+        path_filter = self._path_filter
+        if path_filter is not None:
+            relative_path, depth = self._relative_location()
+            prefix = relative_path + '/' if relative_path else ''
+        one_filesystem = getattr(path_filter, 'one_filesystem', False)
+        for dir_entry in dir_entries:
+            listable = True
+            if path_filter is not None:
+                if not path_filter.accepts(dir_entry, prefix + dir_entry.name):
+                    continue
+                listable = path_filter.lists(dir_entry, depth + 1)
+            if listable and dir_entry.is_dir():
+                listable = self._is_new_directory(dir_entry, one_filesystem)
+            yield self._make_child(dir_entry.name, dir_entry, lazy=lazy,
+                                   listable=listable)
+
+    def _is_new_directory(self, dir_entry, one_filesystem=False):
+        """
+        Tell whether a child directory should be listed.
+
+        A directory is not listed if it is one of its ancestors, which
+        happens with symbolic links to parent directories.
+
+        Args:
+            dir_entry (os.DirEntry): The child directory.
+            one_filesystem (bool): Whether to also refuse directories on
+                another filesystem than this entry, and so than the root
+                entry.
+
+        Returns:
+            bool
+        """
+        # Only symbolic links can lead to an ancestor
+        symlink = dir_entry.is_symlink()
+        if not symlink and not one_filesystem:
+            return True
         try:
-            for sub in os.listdir(path):
-                self.__class__(os.path.join(path, sub), self)
+            stat = dir_entry.stat()
+        except OSError:
+            return False
+        if one_filesystem and stat.st_dev != self.stat.st_dev:
+            return False
+        entry = self
+        while symlink and isinstance(entry, FileSystemMenuEntry):
+            if _same_file(stat, entry.stat):
+                return False
+            entry = entry.parent
+        return True
+
+    def _make_child(self, name, dir_entry=None, lazy=None, listable=True):
+        # Child entries are not loaded here, so that eager trees are loaded
+        # with a work stack rather than recursively.
+        child = self.__class__(os.path.join(self.value, name),
+                               lazy=True, dir_entry=dir_entry,
+                               path_filter=self._path_filter)
+        child._lazy = self._lazy if lazy is None else lazy
+        child._listable = listable
+        child._root_length = self._root_length
+        self._attach_new(child)
+        return child
+
+    def _relative_location(self):
+        """
+        Returns:
+            Tuple[str, int]: The path of this entry relative to the root
+            entry, with ``/`` separators, and its depth.
+        """
+        relative_path = self.value[self._root_length:].lstrip(os.sep)
+        if os.sep != '/':
+            relative_path = relative_path.replace(os.sep, '/')
+        depth = relative_path.count('/') + 1 if relative_path else 0
+        return relative_path, depth
+
+    def _load_children(self):
+        for child in self._iter_load_children():
+            pass
+
+    def _iter_load_children(self):
+        for child in self._iter_directory():
+            yield child
+        if self._lazy:
+            return
+        stack = list(self.loaded_children)
+        while stack:
+            entry = stack.pop()
+            if not entry._loaded:
+                entry._loaded = True
+                entry._list_directory()
+                stack.extend(entry.loaded_children)
+
+    def _list_directory(self):
+        for child in self._iter_directory():
+            pass
+
+    def _iter_directory(self):
+        if self._is_directory is False or not self._listable:
+            return
+        try:
+            dir_entries = _scandir(self.value)
         except OSError as e:
             if e.errno != errno.ENOTDIR:
                 raise e
+            self._is_directory = False
+            return
+        self._is_directory = True
+        for child in self._iter_new_children(dir_entries):
+            yield child
+
+    def _has_children(self):
+        return self._listable and self.is_directory
+
+    @property
+    def usage_key(self):
+        return self.value
+
+    def path_label(self, ancestor, separator='/'):
+        relative_path = os.path.relpath(self.value, ancestor.value)
+        return relative_path.replace(os.sep, separator)
 
 
 class SimpleCommandPrompt(Prompt):
@@ -199,6 +1184,29 @@ class SimpleCommandPrompt(Prompt):
         Raises:
             KeyError: when the select item in not a valid choice.
         """
+        enumeration = self._print_choices(choices)
+        choice = input(self._prompt)
+        return enumeration[choice]
+
+    def prompt_for_many(self, choices):
+        """
+        Choices are typed as numbers separated by commas, and ranges of
+        numbers, such as ``0,3-5``.
+
+        Args:
+            choices (list): List from which to choose from.
+
+        Returns:
+            list: Chosen keys, in the typed order and without repeats.
+
+        Raises:
+            KeyError: when a selected item is not a valid choice.
+        """
+        enumeration = self._print_choices(choices)
+        answer = input(self._prompt)
+        return [enumeration[number] for number in _parse_numbers(answer)]
+
+    def _print_choices(self, choices):
         enumeration = OrderedDict()
         for k, v in enumerate(choices):
             enumeration[str(k)] = v
@@ -206,13 +1214,126 @@ class SimpleCommandPrompt(Prompt):
         print(self._question)
         for num, path in six.iteritems(enumeration):
             print('{:>4} {!s}'.format(num, path))
-        choice = input(self._prompt)
-        return enumeration[choice]
+        return enumeration
 
 
-def _is_dict(data):
+# How long lines written by _write_lines may wait in a buffer, in seconds.
+_FLUSH_INTERVAL = 0.05
+
+
+def _loaded_children(entry):
+    """
+    Provide the child entries of an entry, loading them if needed.
+
+    Unlike :attr:`pymenu.LazyMenuEntry.children`, this does not count as a
+    visit, which may unload other entries of the tree.
+    """
+    if isinstance(entry, LazyMenuEntry):
+        entry.load()
+        return entry.loaded_children
+    return entry.children
+
+
+def _write_lines(stream, lines):
+    """
+    Write text lines to a binary stream, such as the input of a selector.
+
+    The first line is flushed at once, and the next ones at least every
+    :data:`~_FLUSH_INTERVAL` seconds while lines are written, so that the
+    reader gets slowly produced lines early.  Writing stops when the reader
+    closes the stream.
+    """
+    flushed = None
     try:
-        for _, _ in six.iteritems(data):
-            return True
-    except AttributeError:
-        return False
+        for line in lines:
+            stream.write(line.encode('utf8') + b'\n')
+            if flushed is None or time.time() - flushed > _FLUSH_INTERVAL:
+                stream.flush()
+                flushed = time.time()
+        stream.flush()
+    except (IOError, OSError) as e:
+        if e.errno != errno.EPIPE:
+            raise e
+
+
+def _unique_label(label, taken):
+    """
+    Make a label unique by numbering it.
+
+    Examples:
+
+        >>> _unique_label('vim', {})
+        'vim'
+        >>> _unique_label('vim', {'vim': None, 'vim (2)': None})
+        'vim (3)'
+    """
+    if label not in taken:
+        return label
+    number = 2
+    while '{!s} ({:d})'.format(label, number) in taken:
+        number += 1
+    return '{!s} ({:d})'.format(label, number)
+
+
+def _parse_numbers(answer):
+    """
+    Read numbers separated by commas, and ranges of numbers.
+
+    Examples:
+
+        >>> _parse_numbers('4, 0-2,1')
+        ['4', '0', '1', '2']
+        >>> _parse_numbers(' ')
+        []
+        >>> _parse_numbers('2-a')
+        ['2-a']
+    """
+    numbers = OrderedDict()
+    for part in answer.split(','):
+        part = part.strip()
+        first, dash, last = part.partition('-')
+        if dash and first.isdigit() and last.isdigit():
+            for number in range(int(first), int(last) + 1):
+                numbers[str(number)] = None
+        elif part:
+            # Checked by the caller
+            numbers[part] = None
+    return list(numbers)
+
+
+class _ListedEntry(object):
+    def __init__(self, directory, name):
+        # A minimal os.DirEntry, for single paths and python < 3.5
+        self.name = name
+        self.path = os.path.join(directory, name)
+
+    def is_dir(self):
+        return os.path.isdir(self.path)
+
+    def is_symlink(self):
+        return os.path.islink(self.path)
+
+    def stat(self):
+        return os.stat(self.path)
+
+
+def _listdir_entries(path):
+    return [_ListedEntry(path, name) for name in os.listdir(path)]
+
+
+_scandir = getattr(os, 'scandir', _listdir_entries)
+
+
+def _same_file(stat, other_stat):
+    return (stat.st_ino == other_stat.st_ino
+            and stat.st_dev == other_stat.st_dev)
+
+
+def _is_dict(data):
+    # Empty mappings are values rather than menus
+    return hasattr(data, 'items') and bool(data)
+
+
+def _is_lazy_menu(data):
+    return (_is_dict(data) or callable(data)
+            or isinstance(data, types.GeneratorType))
@@ -0,0 +1,163 @@
+#!/usr/bin/python
+# coding: utf8
+
+
+"""
+Menus for asyncio applications, such as window managers.
+
+An :class:`~AsyncMenu` awaits an :class:`~AsyncPrompt` instead of blocking
+the event loop on it.  Lazy entries are loaded in a worker thread, and the
+entries which may be chosen next are loaded while the user thinks.
+
+This module requires Python 3.5 or later.
+"""
+
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import asyncio
+
+from pymenu import LazyMenuEntry, Menu
+from pymenu.prefetch import PrefetchJob, unloaded_entries
+
+
+class AsyncPrompt(object):
+    """
+    Abstract class for menu user interfaces used from an event loop.
+    """
+
+    async def prompt_for_one(self, choices):
+        """
+
+        Args:
+            choices (list): List from which to choose from.
+
+        Returns:
+            str
+        """
+        raise NotImplementedError
+
+    async def prompt_for_many(self, choices):
+        """
+        See :meth:`pymenu.Prompt.prompt_for_many`.
+        """
+        choice = await self.prompt_for_one(choices)
+        return [] if choice is None else [choice]
+
+
+class AsyncMenu(Menu):
+    def __init__(self, root_entry, prompt, frecency=None, prefetcher=None,
+                 preload=True):
+        """
+        A menu which prompts without blocking an event loop.
+
+        Its methods are coroutines.  While a prompt waits for the user, the
+        listed entries are loaded in the default executor of the event loop,
+        one after the other, until the user chooses.  Menu trees must not be
+        changed elsewhere meanwhile.
+
+        Args:
+            root_entry (pymenu.MenuEntry):
+            prompt (pymenu.aio.AsyncPrompt):
+            frecency (pymenu.frecency.FrecencyStore): See :class:`pymenu.Menu`.
+            prefetcher (pymenu.prefetch.Prefetcher): Chooses which listed
+                entries are loaded.  All of them by default.
+            preload (bool): Whether to load listed entries during prompts.
+
+        Examples:
+
+            .. code-block:: python
+
+                from pymenu.ext.xdmenu.aio import AsyncDmenuPrompt
+
+                menu = AsyncMenu(menu_entry, AsyncDmenuPrompt())
+                value = await menu.choose_value()
+        """
+        super(AsyncMenu, self).__init__(root_entry, prompt, frecency=frecency,
+                                        prefetcher=prefetcher)
+        self._preload = preload
+
+    async def choose_value(self):
+        """
+        Prompt until a leaf menu item is choosen.
+
+        Returns:
+            Any: The associated value for the chosen item.
+        """
+        current_menu = self
+        while not current_menu.entry.is_leaf:
+            current_menu = await current_menu.choose_menu()
+        return self._chosen_value(current_menu.entry)
+
+    async def choose_menu(self):
+        """
+        Prompt for a choice of menu items.
+
+        Returns:
+            pymenu.aio.AsyncMenu: The chosen menu object
+        """
+        chosen_key = await self._prompt_in_menu(self._prompt.prompt_for_one)
+        return self._submenu(self._chosen_entry(chosen_key))
+
+    async def choose_values(self):
+        """
+        Prompt until leaf menu items are chosen, several at once.
+
+        See Also:
+            :meth:`pymenu.Menu.choose_values`
+        """
+        current_menu = self
+        while not current_menu.entry.is_leaf:
+            labels = await current_menu._prompt_in_menu(
+                self._prompt.prompt_for_many)
+            entries = current_menu._chosen_entries(labels)
+            if len(entries) != 1:
+                return self._chosen_values(entries)
+            current_menu = current_menu._submenu(entries[0])
+        return self._chosen_values([current_menu.entry])
+
+    async def choose_flat_value(self, separator='/'):
+        """
+        Prompt once for any leaf menu item.
+
+        The whole tree is walked in a worker thread.
+
+        See Also:
+            :meth:`pymenu.Menu.choose_flat_value`
+        """
+        choices = await _in_thread(self.entry.flat_choices, separator)
+        chosen_key = await self._prompt.prompt_for_one(
+            self._sorted_labels(choices))
+        return self._chosen_value(choices[chosen_key])
+
+    async def _prompt_in_menu(self, prompt_for):
+        entry = self.entry
+        if isinstance(entry, LazyMenuEntry) and not entry.is_loaded:
+            await _in_thread(entry.load)
+        choices = entry.labeled_children()
+        labels = self._sorted_labels(choices)
+        if not self._preload:
+            return await prompt_for(self._menu_labels(labels))
+        entries = [choices[label] for label in labels]
+        if self._prefetcher is not None:
+            job = self._prefetcher.make_job(entries)
+        else:
+            job = PrefetchJob(unloaded_entries(entries))
+        loading = _in_thread(job.run)
+        try:
+            return await prompt_for(self._menu_labels(labels))
+        finally:
+            job.stop(wait=False)
+            # At most one entry is still loading
+            await loading
+
+    def _submenu(self, entry):
+        return self.__class__(entry, self._prompt, frecency=self._frecency,
+                              prefetcher=self._prefetcher,
+                              preload=self._preload)
+
+
+def _in_thread(function, *args):
+    return asyncio.get_event_loop().run_in_executor(None, function, *args)
@@ -0,0 +1,23 @@
+#!/usr/bin/python
+# coding: utf8
+
+
+"""
+The ``pymenu`` command, a client for :class:`pymenu.server.MenuServer`.
+
+See :mod:`pymenu.client`, which can also be run as a script without
+importing the :mod:`pymenu` package.
+"""
+
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import sys
+
+from pymenu.client import main
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/python
+# coding: utf8
+
+
+"""
+The client of :class:`pymenu.server.MenuServer`, and the ``pymenu`` command.
+
+This module only uses the standard library, so that launchers start quickly.
+Running it as a script, such as ``python /path/to/pymenu/client.py apps``,
+does not even import the :mod:`pymenu` package and its dependencies.
+
+The protocol is a single line of JSON each way.  A request is an object
+such as ``{"command": "choose", "menu": "apps"}`` and the response is either
+``{"value": ...}``, ``{"cancelled": true}`` or ``{"error": "..."}``.
+"""
+
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import json
+import os
+import socket
+import sys
+import tempfile
+
+
+class ServerError(Exception):
+    """
+    The menu server could not serve a request.
+    """
+
+
+class PromptCancelled(Exception):
+    """
+    The user cancelled the prompt instead of choosing a value.
+    """
+
+
+def request_value(menu, socket_path=None, command='choose'):
+    """
+    Ask a :class:`pymenu.server.MenuServer` to prompt for a value.
+
+    Args:
+        menu (str): The name of the menu.
+        socket_path (str): The socket of the server.  Defaults to
+            :func:`~default_socket_path`.
+        command (str): Either ``'choose'`` or ``'refresh'``.
+
+    Returns:
+        Any: The value sent by the server.
+
+    Raises:
+        ServerError: when the server failed to serve the request.
+        PromptCancelled: when the prompt was cancelled.
+    """
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path or default_socket_path())
+        request = json.dumps({'command': command, 'menu': menu}) + '\n'
+        client.sendall(request.encode('utf8'))
+        response = client.makefile('rb').readline()
+    finally:
+        client.close()
+    if not response:
+        raise ServerError('The server closed the connection')
+    response = json.loads(response.decode('utf8'))
+    if 'error' in response:
+        raise ServerError(response['error'])
+    if response.get('cancelled'):
+        raise PromptCancelled()
+    return response['value']
+
+
+def default_socket_path():
+    """
+    Provide the default socket path for the current user.
+
+    Returns:
+        str: ``pymenu.sock`` in ``$XDG_RUNTIME_DIR``, or a user specific
+        socket in the temporary directory.
+    """
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return os.path.join(runtime_dir, 'pymenu.sock')
+    return os.path.join(tempfile.gettempdir(),
+                        'pymenu-{!s}.sock'.format(os.getuid()))
+
+
+def main(argv=None):
+    """
+    Prompt for a value of a served menu and print it.
+
+    Menus are only served by Python code registering them in a
+    :class:`pymenu.server.MenuServer`, so there is no command to start a
+    server.
+
+    Args:
+        argv (list): Command line arguments.  Defaults to :data:`sys.argv`.
+
+    Returns:
+        int: The exit status, 1 if the prompt was cancelled or failed.
+    """
+    parser = argparse.ArgumentParser(
+        prog='pymenu',
+        description='Prompt for a value of a menu served by a pymenu server.')
+    parser.add_argument('menu', help='name of the menu')
+    parser.add_argument('--socket', help='path of the server socket')
+    parser.add_argument('--refresh', action='store_true',
+                        help='rebuild the menu instead of prompting')
+    args = parser.parse_args(argv)
+
+    command = 'refresh' if args.refresh else 'choose'
+    try:
+        value = request_value(args.menu, args.socket, command=command)
+    except PromptCancelled:
+        return 1
+    except (ServerError, OSError) as error:
+        print(error, file=sys.stderr)
+        return 1
+    if value is not None:
+        print(value)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
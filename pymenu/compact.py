@@ -0,0 +1,396 @@
+#!/usr/bin/python
+# coding: utf8
+
+
+"""
+Compact, read-only menu trees for large menus.
+
+A :class:`pymenu.MenuEntry` is a full Python object per node.  A
+:class:`~CompactTree` instead stores a whole tree in a few arrays: the parent
+index of every node, the range of its children and the index of its name in
+a table of unique names.  Nodes are numbered breadth first, so the children
+of a node are contiguous.
+
+Menus use :class:`~CompactMenuEntry` views, which are only created while
+browsing and expose the usual ``name``, ``value``, ``parent``, ``children``
+and ``is_leaf`` attributes.
+"""
+
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from array import array
+from collections import OrderedDict, deque
+import errno
+import os
+
+from pymenu import _scandir, _unique_label
+
+
+class CompactTree(object):
+    def __init__(self, root_name, root_value=None):
+        """
+        A read-only menu tree stored as a structure of arrays.
+
+        Trees are usually made with :meth:`~from_entry` or, for filesystems,
+        :meth:`CompactFileSystemTree.from_directory`.  Nodes are added breadth
+        first with :meth:`~add_children`.
+
+        Args:
+            root_name (str): The name of the root entry.
+            root_value (Any): The value of the root entry.
+        """
+        self._parents = array(str('i'), [-1])
+        self._first_children = array(str('i'), [0])
+        self._child_counts = array(str('i'), [0])
+        self._name_ids = array(str('i'))
+        self._names = []
+        self._name_table = {}
+        self._values = [root_value]
+        self._name_ids.append(self._intern(root_name))
+        self._next_parent = 0
+        # Labeled children of visited nodes, by node index
+        self._labeled_children = {}
+
+    @classmethod
+    def from_entry(cls, entry):
+        """
+        Copy a menu tree.
+
+        Lazy entries of `entry` are all loaded.
+
+        Args:
+            entry (pymenu.MenuEntry): The root of the tree to copy.
+
+        Returns:
+            pymenu.compact.CompactTree
+        """
+        tree = cls(entry.name, entry.value)
+        queue = deque([entry])
+        while queue:
+            children = queue.popleft().children
+            tree.add_children((child.name, child.value) for child in children)
+            queue.extend(children)
+        return tree
+
+    def __len__(self):
+        return len(self._parents)
+
+    @property
+    def root(self):
+        """
+        Returns:
+            pymenu.compact.CompactMenuEntry: The root entry.
+        """
+        return CompactMenuEntry(self, 0)
+
+    def add_children(self, children):
+        """
+        Add the children of the next node, breadth first.
+
+        The first call adds the children of the root, the next calls add the
+        children of its first child, then of its second child, and so on.
+
+        Args:
+            children (Iterable[Tuple[str, Any]]): Names and values of the
+                children.
+        """
+        parent = self._next_parent
+        if parent >= len(self._parents):
+            raise ValueError('Every node already has its children')
+        first = len(self._parents)
+        for name, value in children:
+            self._add_node(parent, name, value)
+        self._first_children[parent] = first
+        self._child_counts[parent] = len(self._parents) - first
+        self._next_parent += 1
+
+    def name(self, index):
+        return self._names[self._name_ids[index]]
+
+    def value(self, index):
+        return self._values[index]
+
+    def usage_key(self, index):
+        names = []
+        while index >= 0:
+            names.append(self.name(index))
+            index = self._parents[index]
+        return '/'.join(reversed(names))
+
+    def parent(self, index):
+        """
+        Returns:
+            int: The index of the parent node, or -1 for the root.
+        """
+        return self._parents[index]
+
+    def children(self, index):
+        """
+        Returns:
+            range: The indices of the child nodes.
+        """
+        first = self._first_children[index]
+        return range(first, first + self._child_counts[index])
+
+    def _add_node(self, parent, name, value):
+        self._parents.append(parent)
+        self._first_children.append(0)
+        self._child_counts.append(0)
+        self._name_ids.append(self._intern(name))
+        if self._values is not None:
+            self._values.append(value)
+
+    def _intern(self, name):
+        name_id = self._name_table.get(name)
+        if name_id is None:
+            name_id = len(self._names)
+            self._name_table[name] = name_id
+            self._names.append(name)
+        return name_id
+
+
+class CompactFileSystemTree(CompactTree):
+    def __init__(self, path):
+        """
+        A compact tree of filesystem paths.
+
+        Only the base name of every path is stored.  Like with
+        :class:`pymenu.FileSystemMenuEntry`, both the name and the value of
+        an entry are its full path, which is computed when requested.
+
+        Args:
+            path (str): The root directory.
+        """
+        super(CompactFileSystemTree, self).__init__(str(path))
+        self._values = None
+        self._is_directory = array(str('b'), [0])
+
+    @classmethod
+    def from_directory(cls, path):
+        """
+        List a whole directory tree.
+
+        Directories are never listed inside themselves, so symbolic links to
+        parent directories do not make endless trees.
+
+        Args:
+            path (str): The root directory.
+
+        Returns:
+            pymenu.compact.CompactFileSystemTree
+        """
+        tree = cls(path)
+        tree._is_directory[0] = os.path.isdir(tree.value(0))
+        listed = set([0]) if tree._is_directory[0] else set()
+        # Device and inode numbers of the directories checked for loops
+        file_ids = {}
+        index = 0
+        while index < len(tree):
+            dir_entries = []
+            if index in listed:
+                try:
+                    dir_entries = list(_scandir(tree.value(index)))
+                except OSError as e:
+                    if e.errno != errno.ENOTDIR:
+                        raise e
+                    tree._is_directory[index] = 0
+            first = len(tree)
+            tree.add_children((dir_entry.name, None)
+                              for dir_entry in dir_entries)
+            for offset, dir_entry in enumerate(dir_entries):
+                if not dir_entry.is_dir():
+                    continue
+                tree._is_directory[first + offset] = 1
+                # Only symbolic links can lead to an ancestor
+                if (not dir_entry.is_symlink()
+                        or not tree._is_ancestor(index, dir_entry, file_ids)):
+                    listed.add(first + offset)
+            listed.discard(index)
+            index += 1
+        return tree
+
+    def name(self, index):
+        return self.value(index)
+
+    def value(self, index):
+        names = []
+        while index > 0:
+            names.append(self._names[self._name_ids[index]])
+            index = self._parents[index]
+        names.append(self._names[self._name_ids[0]])
+        return os.path.join(*reversed(names))
+
+    def usage_key(self, index):
+        return self.value(index)
+
+    def _is_ancestor(self, index, dir_entry, file_ids):
+        try:
+            file_id = _file_id(dir_entry.stat())
+        except OSError:
+            # A broken link is not listed either
+            return True
+        while index >= 0:
+            if index not in file_ids:
+                file_ids[index] = _file_id(os.stat(self.value(index)))
+            if file_ids[index] == file_id:
+                return True
+            index = self._parents[index]
+        return False
+
+    def is_directory(self, index):
+        return bool(self._is_directory[index])
+
+    def _add_node(self, parent, name, value):
+        super(CompactFileSystemTree, self)._add_node(parent, name, value)
+        self._is_directory.append(0)
+
+
+class CompactMenuEntry(object):
+    __slots__ = ('_tree', '_index')
+
+    def __init__(self, tree, index):
+        """
+        A lightweight view of a node of a :class:`~CompactTree`.
+
+        Views of the same node compare equal.  They can be used wherever a
+        :class:`pymenu.MenuEntry` is read, such as in a :class:`pymenu.Menu`.
+
+        Args:
+            tree (pymenu.compact.CompactTree):
+            index (int): The node of the tree.
+        """
+        self._tree = tree
+        self._index = index
+
+    def __eq__(self, other):
+        return (isinstance(other, CompactMenuEntry)
+                and other._tree is self._tree
+                and other._index == self._index)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((id(self._tree), self._index))
+
+    def __repr__(self):
+        return '{!s}({!r})'.format(self.__class__.__name__, self.name)
+
+    @property
+    def name(self):
+        return self._tree.name(self._index)
+
+    @property
+    def value(self):
+        return self._tree.value(self._index)
+
+    @property
+    def parent(self):
+        parent = self._tree.parent(self._index)
+        if parent < 0:
+            return None
+        return CompactMenuEntry(self._tree, parent)
+
+    @property
+    def children(self):
+        tree = self._tree
+        return tuple(CompactMenuEntry(tree, index)
+                     for index in tree.children(self._index))
+
+    @property
+    def is_leaf(self):
+        return not self._tree.children(self._index)
+
+    def iter_children(self):
+        """
+        See :meth:`pymenu.MenuEntry.iter_children`.
+        """
+        tree = self._tree
+        for index in tree.children(self._index):
+            yield CompactMenuEntry(tree, index)
+
+    def labeled_children(self):
+        """
+        See :meth:`pymenu.MenuEntry.labeled_children`.
+
+        Trees are read-only, so the result is cached for good.
+        """
+        cache = self._tree._labeled_children
+        labeled_children = cache.get(self._index)
+        if labeled_children is None:
+            labeled_children = OrderedDict([('..', None)])
+            for child in self.iter_children():
+                label = _unique_label(child.name, labeled_children)
+                labeled_children[label] = child
+            del labeled_children['..']
+            cache[self._index] = labeled_children
+        return labeled_children
+
+    def iter_labeled_children(self):
+        """
+        See :meth:`pymenu.MenuEntry.iter_labeled_children`.
+        """
+        for item in self.labeled_children().items():
+            yield item
+
+    @property
+    def is_root(self):
+        return self._index == 0
+
+    @property
+    def path(self):
+        """
+        Returns:
+            tuple: The entries from the root to this one.
+        """
+        return tuple(reversed(list(self._iter_path_reverse())))
+
+    @property
+    def usage_key(self):
+        """
+        See :attr:`pymenu.MenuEntry.usage_key`.
+        """
+        return self._tree.usage_key(self._index)
+
+    def flat_choices(self, separator='/'):
+        """
+        See :meth:`pymenu.MenuEntry.flat_choices`.
+        """
+        tree = self._tree
+        choices = OrderedDict()
+        stack = [self._index]
+        while stack:
+            index = stack.pop()
+            children = tree.children(index)
+            if children:
+                stack.extend(reversed(children))
+            elif index != self._index:
+                entry = CompactMenuEntry(tree, index)
+                label = entry.path_label(self, separator)
+                choices[_unique_label(label, choices)] = entry
+        return choices
+
+    def path_label(self, ancestor, separator='/'):
+        """
+        See :meth:`pymenu.MenuEntry.path_label`.
+        """
+        tree = self._tree
+        names = []
+        index = self._index
+        while index >= 0 and index != ancestor._index:
+            names.append(tree._names[tree._name_ids[index]])
+            index = tree.parent(index)
+        return separator.join(reversed(names))
+
+    def _iter_path_reverse(self):
+        index = self._index
+        while index >= 0:
+            yield CompactMenuEntry(self._tree, index)
+            index = self._tree.parent(index)
+
+
+def _file_id(stat):
+    return stat.st_dev, stat.st_ino
@@ -0,0 +1,138 @@
+#!/usr/bin/python
+# coding: utf8
+
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import inotify_simple
+from inotify_simple import flags
+
+from pymenu.watch import TreeWatcher, loaded_directories
+
+
+_WATCH_MASK = (flags.CREATE | flags.DELETE | flags.MOVED_FROM |
+               flags.MOVED_TO | flags.DELETE_SELF)
+
+
+class InotifyFileSystemWatcher(TreeWatcher):
+    def __init__(self, root_entry):
+        """
+        Watch a :class:`pymenu.FileSystemMenuEntry` tree with inotify.
+
+        Every loaded directory of the tree is watched.  Directories loaded
+        later, for instance by lazy entries, are watched starting from the
+        next call to :meth:`~poll`, which first refreshes them in case they
+        changed in between.  If the kernel drops events because too many
+        happened at once, every loaded directory is refreshed.  Renamed
+        paths keep their entry.
+
+        Args:
+            root_entry (pymenu.FileSystemMenuEntry):
+        """
+        self._root = root_entry
+        self._inotify = inotify_simple.INotify()
+        self._entries = {}
+        self._descriptors = {}
+        self._sync_watches()
+
+    def poll(self, timeout=None):
+        # Directories loaded since the last call were not watched yet
+        changed = _refresh(self._sync_watches())
+        timeout_ms = None if timeout is None else int(timeout * 1000)
+        events = self._inotify.read(timeout=timeout_ms or 0)
+        moved_from = {}
+        overflowed = False
+        for event in events:
+            if event.mask & flags.Q_OVERFLOW:
+                overflowed = True
+                continue
+            entry = self._entries.get(event.wd)
+            if entry is None:
+                continue
+            if event.mask & flags.MOVED_FROM:
+                moved_from[event.cookie] = (entry, event.name)
+            elif event.mask & flags.MOVED_TO and event.cookie in moved_from:
+                source, name = moved_from.pop(event.cookie)
+                if source is entry:
+                    entry.rename_child(name, event.name)
+                else:
+                    source.remove_child(name)
+                    entry.remove_child(event.name)
+                    entry.add_child(event.name)
+                    changed.append(source)
+            elif event.mask & (flags.CREATE | flags.MOVED_TO):
+                # A moved path may replace an existing one
+                entry.remove_child(event.name)
+                entry.add_child(event.name)
+            elif event.mask & flags.DELETE:
+                entry.remove_child(event.name)
+            else:
+                continue
+            changed.append(entry)
+        for source, name in moved_from.values():
+            # Moved out of the watched tree
+            source.remove_child(name)
+            changed.append(source)
+        if overflowed:
+            changed.extend(_refresh(list(loaded_directories(self._root))))
+        if events:
+            self._sync_watches()
+        return _unique(changed)
+
+    def close(self):
+        self._inotify.close()
+
+    def _sync_watches(self):
+        """
+        Watch the loaded directories, and only them.
+
+        Returns:
+            list: The newly watched directory entries.
+        """
+        directories = set(loaded_directories(self._root))
+        for descriptor, entry in list(self._entries.items()):
+            if entry not in directories:
+                self._unwatch(descriptor)
+        watched = []
+        for entry in directories:
+            if entry not in self._descriptors:
+                try:
+                    descriptor = self._inotify.add_watch(entry.value,
+                                                         _WATCH_MASK)
+                except OSError:
+                    continue
+                self._entries[descriptor] = entry
+                self._descriptors[entry] = descriptor
+                watched.append(entry)
+        return watched
+
+    def _unwatch(self, descriptor):
+        entry = self._entries.pop(descriptor)
+        self._descriptors.pop(entry, None)
+        try:
+            self._inotify.rm_watch(descriptor)
+        except OSError:
+            # The directory was already removed
+            pass
+
+
+def _refresh(entries):
+    """
+    Returns:
+        list: The entries which children changed.
+    """
+    changed = []
+    for entry in entries:
+        children = entry.loaded_children
+        entry.refresh()
+        if entry.loaded_children != children:
+            changed.append(entry)
+    return changed
+
+
+def _unique(entries):
+    seen = set()
+    return [entry for entry in entries
+            if not (entry in seen or seen.add(entry))]
@@ -6,12 +6,21 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import unicode_literals
 
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import re
 import subprocess
+import time
 
+import six
+import xdg.BaseDirectory
+import xdg.Locale
 import xdg.Menu
-import tatsu
 
 from pymenu import MenuEntry
+from pymenu.watch import TreeWatcher, merge_entries
 
 
 class XdgMenuEntry(MenuEntry):
@@ -20,9 +29,12 @@ class XdgMenuEntry(MenuEntry):
         Wrap an XDG menu entry.
 
         Args:
-            wrapped_entry: An object defined in the :mod:`xdg.Menu` module.
+            wrapped_entry: An object defined in the :mod:`xdg.Menu` module,
+                or its :class:`~CachedMenu` or :class:`~CachedMenuEntry`
+                counterpart.
             app_factory (Callable): A function that takes a
-                :class:`xdg.Menu.MenuEntry` and returns a :class:`~Application`.
+                :class:`xdg.Menu.MenuEntry` and returns a
+                :class:`~Application`.
             parent:
 
         See Also:
@@ -30,20 +42,25 @@ class XdgMenuEntry(MenuEntry):
         """
         app_factory = app_factory or Application
 
-        if isinstance(wrapped_entry, xdg.Menu.Menu):
-            key = wrapped_entry.getName()
-            value = wrapped_entry
-        elif isinstance(wrapped_entry, xdg.Menu.MenuEntry):
-            key = wrapped_entry.DesktopEntry.getName()
-            value = app_factory(wrapped_entry)
+        key, value = _describe(wrapped_entry, app_factory)
         super(XdgMenuEntry, self).__init__(key,
                                            value=value,
-                                           app_factory=app_factory,
                                            parent=parent)
 
-        if isinstance(wrapped_entry, xdg.Menu.Menu):
-            for child in _menulike_children(wrapped_entry):
-                XdgMenuEntry(child, self)
+        stack = [(self, wrapped_entry)]
+        while stack:
+            entry, wrapped = stack.pop()
+            if not isinstance(wrapped, _MENU_TYPES):
+                continue
+            for child in _menulike_children(wrapped):
+                key, value = _describe(child, app_factory)
+                stack.append((entry._new_child(key, value), child))
+
+    @property
+    def usage_key(self):
+        if isinstance(self.value, Application):
+            return self.value.entry.filename
+        return super(XdgMenuEntry, self).usage_key
 
     @classmethod
     def from_xdg_menu_file(cls, menu_def_file):
@@ -56,14 +73,90 @@ class XdgMenuEntry(MenuEntry):
         return make_xdg_menu_entry(menu_def_file, cls=cls)
 
 
+class CachedMenu(object):
+    def __init__(self, name, entries=None, app_dirs=None):
+        """
+        A stand-in for :class:`xdg.Menu.Menu` loaded from a menu cache.
+
+        Args:
+            name (str): The localized name of this menu.
+            entries (list): :class:`~CachedMenu` and :class:`~CachedMenuEntry`
+                objects in this menu.
+            app_dirs (list): Directories searched for desktop entries.
+        """
+        self._name = name
+        self.Entries = entries or []
+        self.AppDirs = app_dirs or []
+
+    def getName(self):
+        return self._name
+
+    def getEntries(self):
+        return iter(self.Entries)
+
+
+class CachedMenuEntry(object):
+    def __init__(self, desktop_entry):
+        """
+        A stand-in for :class:`xdg.Menu.MenuEntry` loaded from a menu cache.
+
+        Args:
+            desktop_entry (CachedDesktopEntry):
+        """
+        self.DesktopEntry = desktop_entry
+
+
+class CachedDesktopEntry(object):
+    def __init__(self, name, exec_string, terminal=False, icon='',
+                 filename=''):
+        """
+        The fields of a :class:`xdg.DesktopEntry.DesktopEntry` that
+        :class:`~Application` needs.
+
+        Args:
+            name (str): The localized name.
+            exec_string (str): The Exec key.
+            terminal (bool): The Terminal key.
+            icon (str): The Icon key.
+            filename (str): Path to the desktop entry file.
+        """
+        self._name = name
+        self._exec = exec_string
+        self._terminal = terminal
+        self._icon = icon
+        self.filename = filename
+
+    def getName(self):
+        return self._name
+
+    def getExec(self):
+        return self._exec
+
+    def getTerminal(self):
+        return self._terminal
+
+    def getIcon(self):
+        return self._icon
+
+
+_MENU_TYPES = (xdg.Menu.Menu, CachedMenu)
+_MENU_ENTRY_TYPES = (xdg.Menu.MenuEntry, CachedMenuEntry)
+
+
+def _describe(wrapped_entry, app_factory):
+    if isinstance(wrapped_entry, _MENU_TYPES):
+        return wrapped_entry.getName(), wrapped_entry
+    return wrapped_entry.DesktopEntry.getName(), app_factory(wrapped_entry)
+
+
 def _menulike_children(menu):
     children = menu.getEntries()
     for child in children:
-        if isinstance(child, (xdg.Menu.Menu, xdg.Menu.MenuEntry)):
+        if isinstance(child, _MENU_TYPES + _MENU_ENTRY_TYPES):
             yield child
 
 
-def make_xdg_menu_entry(menu_def_file=None, cls=None):
+def make_xdg_menu_entry(menu_def_file=None, cls=None, cache_dir=None):
     """
     Make a :class:`pymenu.MenuEntry` based on a XDG .menu file.
 
@@ -89,32 +182,299 @@ def make_xdg_menu_entry(menu_def_file=None, cls=None):
 
             .. _`Desktop Menu Specification`: https://specifications.freedesktop.org/menu-spec/menu-spec-1.0.html  # noqa: E501
         cls (type): The subclass of :class:`pymenu.MenuEntry` to create.  The
-            default is :class:`~XdgMenuEntry`.
+            default is :class:`~XdgMenuEntry`.  The constructor is only
+            called for the root entry: see
+            :meth:`pymenu.MenuEntry.init_new_child`.
+        cache_dir (str): When provided, the parsed menu is stored in this
+            directory and loaded from there on later calls, unless the
+            `.menu` file, the files it merges or any directory holding its
+            desktop entries was modified since.  Use :func:`~default_cache_dir` for a sensible
+            location.
 
     See Also:
         :class:`pymenu.MenuEntry`
     """
     menu_def_file = menu_def_file or '/etc/xdg/menus/applications.menu'
     cls = cls or XdgMenuEntry
-    xdg_base_menu = xdg.Menu.parse(str(menu_def_file))
+    if cache_dir is None:
+        xdg_base_menu = xdg.Menu.parse(str(menu_def_file))
+    else:
+        xdg_base_menu = load_cached_xdg_menu(menu_def_file, cache_dir)
     menu_entry = cls(xdg_base_menu)
     return menu_entry
 
 
-def launch_xdg_menu_entry(entry, *targets):
+def load_cached_xdg_menu(menu_def_file, cache_dir):
+    """
+    Parse a `.menu` file, or load it from a cache file in `cache_dir`.
+
+    The cache is invalidated when the modification time of the `.menu` file,
+    of the `.menu` files and directories it merges, or of any directory
+    holding its desktop entries changes.  Changing a desktop entry file in
+    place does not invalidate the cache.  A cache that cannot be written is
+    ignored.
+
+    Args:
+        menu_def_file (str): Path to a `.menu` file.
+        cache_dir (str): Directory for the cache file.
+
+    Returns:
+        The :class:`~CachedMenu` loaded from the cache or the
+        :class:`xdg.Menu.Menu` freshly parsed.
+    """
+    menu_def_file = os.path.abspath(str(menu_def_file))
+    langs = list(xdg.Locale.langs)
+    checksum = hashlib.sha1(menu_def_file.encode('utf8'))
+    cache_file = os.path.join(str(cache_dir), 'menu_{!s}.json'.format(
+        checksum.hexdigest()[:12]))
+
+    try:
+        with open(cache_file) as opened:
+            cache = json.load(opened)
+    except (IOError, OSError, ValueError):
+        cache = None
+
+    if (cache
+            and cache.get('version') == _MENU_CACHE_VERSION
+            and cache.get('langs') == langs
+            and cache.get('mtimes') == _mtimes(cache.get('mtimes', {}))):
+        try:
+            return _decode_menu(cache['menu'])
+        except (KeyError, IndexError, TypeError, AttributeError):
+            # A corrupted cache is parsed again
+            pass
+
+    builder = _MergeRecordingBuilder()
+    xdg_menu = builder.parse(menu_def_file)
+    paths = watched_paths(xdg_menu, menu_def_file) | builder.merged_paths
+    cache = {'version': _MENU_CACHE_VERSION,
+             'langs': langs,
+             'menu': _encode_menu(xdg_menu),
+             'mtimes': _mtimes(paths)}
+    try:
+        _write_atomically(cache_file,
+                          json.dumps(cache, separators=(',', ':')))
+    except (IOError, OSError):
+        # Such as a read-only cache directory: the menu is parsed each time
+        pass
+    return xdg_menu
+
+
+def watched_paths(menu, menu_def_file=None):
+    """
+    List the paths which modification invalidates a parsed menu.
+
+    Args:
+        menu: A :class:`xdg.Menu.Menu` or :class:`~CachedMenu`.
+        menu_def_file (str): The `.menu` file it was parsed from.
+
+    Returns:
+        set: The `.menu` file, the AppDirs and every directory holding a
+        desktop entry of the menu.
+    """
+    paths = set()
+    if menu_def_file:
+        paths.add(os.path.abspath(str(menu_def_file)))
+    menus = [menu]
+    while menus:
+        current = menus.pop()
+        paths.update(current.AppDirs)
+        for child in _menulike_children(current):
+            if isinstance(child, _MENU_TYPES):
+                menus.append(child)
+            else:
+                paths.add(os.path.dirname(child.DesktopEntry.filename))
+    return paths
+
+
+class _MergeRecordingBuilder(xdg.Menu.XMLMenuBuilder):
+    def __init__(self):
+        """
+        Parse a `.menu` file, recording the `.menu` files and directories
+        merged into it.
+        """
+        super(_MergeRecordingBuilder, self).__init__()
+        #: Paths which modification changes the parsed menu, including
+        #: merged files and directories that do not exist yet.
+        self.merged_paths = set()
+
+    def parse_merge_file(self, value, child, filename, parent):
+        if child.attrib.get('type') != 'parent':
+            self.merged_paths.add(_merged_path(value, filename))
+        super(_MergeRecordingBuilder, self).parse_merge_file(
+            value, child, filename, parent)
+
+    def parse_merge_dir(self, value, child, filename, parent):
+        self.merged_paths.add(_merged_path(value, filename))
+        super(_MergeRecordingBuilder, self).parse_merge_dir(
+            value, child, filename, parent)
+
+    def merge_file(self, filename, child, parent):
+        self.merged_paths.add(os.path.abspath(filename))
+        super(_MergeRecordingBuilder, self).merge_file(filename, child,
+                                                       parent)
+
+
+def _merged_path(value, filename):
+    # Relative paths are relative to the `.menu` file merging them
+    return os.path.abspath(os.path.join(os.path.dirname(filename), value))
+
+
+_MENU_CACHE_VERSION = 4
+
+
+def _encode_menu(menu):
+    # Menus are listed flat rather than nested, so that neither encoding,
+    # the json module nor decoding recurse through deep menus.  Each node
+    # gives the index of its parent menu, and follows its previous sibling.
+    nodes = []
+    stack = [(None, menu)]
+    while stack:
+        parent, current = stack.pop()
+        if isinstance(current, _MENU_TYPES):
+            nodes.append({'parent': parent,
+                          'name': current.getName(),
+                          'app_dirs': current.AppDirs})
+            index = len(nodes) - 1
+            stack.extend((index, child) for child in
+                         reversed(list(_menulike_children(current))))
+        else:
+            desktop_entry = current.DesktopEntry
+            nodes.append([parent,
+                          desktop_entry.getName(),
+                          desktop_entry.getExec(),
+                          desktop_entry.getTerminal(),
+                          desktop_entry.getIcon(),
+                          desktop_entry.filename])
+    return nodes
+
+
+def _decode_menu(nodes):
+    menus = []
+    for node in nodes:
+        if isinstance(node, dict):
+            parent = node['parent']
+            decoded = CachedMenu(node['name'], [], node['app_dirs'])
+            menus.append(decoded)
+        else:
+            parent = node[0]
+            decoded = CachedMenuEntry(CachedDesktopEntry(*node[1:]))
+            # Keeps menu indices aligned with the nodes
+            menus.append(None)
+        if parent is not None:
+            menus[parent].Entries.append(decoded)
+    return menus[0]
+
+
+def _mtimes(paths):
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[path] = os.stat(path).st_mtime
+        except OSError:
+            mtimes[path] = None
+    return mtimes
+
+
+def _write_atomically(path, text):
+    temporary_path = '{!s}.{!s}.tmp'.format(path, os.getpid())
+    with open(temporary_path, 'w') as opened:
+        opened.write(text)
+    os.rename(temporary_path, path)
+
+
+class XdgMenuWatcher(TreeWatcher):
+    def __init__(self, root_entry, menu_def_file=None, cache_dir=None):
+        """
+        Keep a :class:`~XdgMenuEntry` tree up to date by polling.
+
+        When the `.menu` file or a directory holding desktop entries changes,
+        the menu is parsed again and merged into the existing tree: only the
+        entries of added or removed applications change.
+
+        Args:
+            root_entry (pymenu.ext.pyxdg.XdgMenuEntry): The tree to update.
+            menu_def_file (str): See :func:`~make_xdg_menu_entry`.
+            cache_dir (str): See :func:`~make_xdg_menu_entry`.
+        """
+        self._root = root_entry
+        self._menu_def_file = os.path.abspath(
+            str(menu_def_file or '/etc/xdg/menus/applications.menu'))
+        self._cache_dir = cache_dir
+        self._mtimes = _mtimes(watched_paths(root_entry.value,
+                                             self._menu_def_file))
+
+    def poll(self, timeout=None):
+        if timeout:
+            time.sleep(timeout)
+        if self._mtimes == _mtimes(self._mtimes):
+            return []
+        new_root = make_xdg_menu_entry(self._menu_def_file,
+                                       cls=self._root.__class__,
+                                       cache_dir=self._cache_dir)
+        self._mtimes = _mtimes(watched_paths(new_root.value,
+                                             self._menu_def_file))
+        return merge_entries(self._root, new_root)
+
+
+def launch_xdg_menu_entry(entry, *targets, **kwargs):
     """
     A convenient launcher for desktop entries.
 
     This uses the :class:`~Application` with default values.
 
     Args:
-        entry (xdg.Menu.MenuEntry):
+        entry (xdg.Menu.MenuEntry): The desktop entry, or an
+            :class:`~Application` such as the values of
+            :class:`~XdgMenuEntry` leaves.
+        *targets: See :meth:`~Application.launch`.
+        frecency (pymenu.frecency.FrecencyStore): When provided as a keyword
+            argument, the launch is recorded in it.
 
     Returns:
         None
     """
-    desktop_app = Application(entry)
-    desktop_app.launch(*targets)
+    frecency = kwargs.pop('frecency', None)
+    if isinstance(entry, Application):
+        desktop_app = entry
+    else:
+        desktop_app = Application(entry)
+    desktop_app.launch(*targets, **kwargs)
+    if frecency is not None:
+        frecency.record(desktop_app.entry.filename)
+
+
+def launch_xdg_menu_entries(entries, *targets, **kwargs):
+    """
+    Launch several desktop entries at once.
+
+    Every application is launched with all the targets, in as few processes
+    as its Exec field codes allow (see :meth:`~Application.launch`).
+    Applications of the same desktop file are launched once.
+
+    Args:
+        entries (Iterable): Desktop entries or :class:`~Application` objects,
+            such as the values chosen with :meth:`pymenu.Menu.choose_values`
+            in a :class:`~XdgMenuEntry` tree.
+        *targets: See :meth:`~Application.launch`.
+        frecency (pymenu.frecency.FrecencyStore): When provided as a keyword
+            argument, the launches are recorded in it.
+
+    Returns:
+        list: All subprocesses launched.
+    """
+    frecency = kwargs.pop('frecency', None)
+    desktop_apps = OrderedDict()
+    for entry in entries:
+        if not isinstance(entry, Application):
+            entry = Application(entry)
+        desktop_apps.setdefault(entry.entry.filename, entry)
+    processes = []
+    for filename, desktop_app in six.iteritems(desktop_apps):
+        processes.extend(desktop_app.launch(*targets, **kwargs))
+        if frecency is not None:
+            frecency.record(filename)
+    return processes
 
 
 class Application(object):
@@ -137,7 +497,9 @@ class Application(object):
                         ]
                     ]
 
-                The default parser should work in most cases.
+                Words may also be plain strings, as returned by
+                :func:`~exec_tokenizer`.  The default parser
+                (:func:`~exec_tokenizer`) should work in most cases.
 
             term_args (list): Command line argument prefixes for terminal
                 applications.  In XDG compliant desktop environments, the
@@ -153,7 +515,7 @@ class Application(object):
                 .. _Qtile: http://www.qtile.org
         """
         self._entry = entry.DesktopEntry  # type: xdg.DesktopEntry.DesktopEntry
-        self._parse = parser or exec_parser
+        self._parse = parser or exec_tokenizer
         self._executable_cache = None
         self._arguments_cache = None
         self._terminal = term_args or ['x-terminal-emulator', '-e']
@@ -168,25 +530,45 @@ class Application(object):
                 once, they are all parametrized in one subprocess.  If this
                 application can only handle one URI at a time, multiple
                 processes are launched.  If this application cannot handle
-                target URIs, this argument is ignored.
+                target URIs, this argument is ignored and a single process is
+                launched.
             **popen_kwargs: This application is launched as subprocesses using
                 :class:`subprocess.Popen`.  These keyword arguments are simply
-                passed along to this subprocess constructor.
+                passed along to this subprocess constructor.  A `spawner`
+                keyword argument may instead give a
+                :class:`pymenu.spawn.Spawner`, which starts the subprocesses
+                concurrently in the background, with ``os.posix_spawnp``
+                when possible.
 
         Returns:
-            list: All subprocesses launched.
+            list: All subprocesses launched, as
+            :class:`pymenu.spawn.SpawnedProcess` objects not started yet when
+            a `spawner` is given.
+
+        Examples:
+
+            .. code-block:: python
+
+                spawner = Spawner(max_workers=8)
+                # Returns at once, even for hundreds of files
+                application.launch(*paths, spawner=spawner)
         """
+        spawner = popen_kwargs.pop('spawner', None)
         cmds = []
 
-        if '%F' in self.arguments or '%U' in self.arguments:
+        if (not target_uris
+                or '%F' in self.arguments or '%U' in self.arguments):
             cmds.append(self._make_cmd(target_uris))
-        else:
+        elif '%f' in self.arguments or '%u' in self.arguments:
             for target in target_uris:
                 cmds.append(self._make_cmd(target))
+        else:
+            cmds.append(self._make_cmd())
 
+        spawn = subprocess.Popen if spawner is None else spawner.spawn
         processes = []
         for cmd in cmds:
-            processes.append(subprocess.Popen(cmd, **popen_kwargs))
+            processes.append(spawn(cmd, **popen_kwargs))
         return processes
 
     @property
@@ -267,14 +649,14 @@ class Application(object):
         exec_string = self._entry.getExec()
         exec_ast = self._parse(exec_string)
         executable_ast, arguments_ast = exec_ast
-        executable_path = ''.join(executable_ast)
+        executable_path = _join_word(executable_ast)
         self._executable_cache = []
         if self._entry.getTerminal():
             self._executable_cache.extend(self._terminal)
         self._executable_cache.append(executable_path)
 
         self._arguments_cache = []
-        unmapped_args = [''.join(argument_ast)
+        unmapped_args = [_join_word(argument_ast)
                          for argument_ast in arguments_ast]
 
         if 1 < len([arg
@@ -358,20 +740,166 @@ RESERVERDCHAR
 """
 
 
-_exec_parser = tatsu.compile(EXEC_GRAMMAR)
+FIELD_CODES = frozenset(['%f', '%F', '%u', '%U', '%d', '%D', '%n', '%N',
+                         '%i', '%c', '%k', '%v', '%m'])
+
+
+_exec_word = re.compile(r'[ \t\n]*(?:"((?:[^"\\]|\\.)*)"|([^ \t\n"]+))',
+                        re.DOTALL).match
+_exec_escaped_char = re.compile(r'\\([\\$`"])')
+
+
+def exec_tokenizer(exec_string):
+    """
+    Split a XDG Exec string into its executable and arguments.
+
+    This follows the quoting rules of the `Desktop Entry Specification`_
+    in a single pass.  Field codes are kept as they are.
+
+    .. _`Desktop Entry Specification`: https://specifications.freedesktop.org/desktop-entry-spec/latest/ar01s07.html  # noqa: E501
+
+    Args:
+        exec_string (str):
+
+    Returns:
+        list: The executable and the list of its arguments.
+
+    Raises:
+        ValueError: when the Exec string is empty or has unbalanced quotes.
+
+    Examples:
+
+        >>> exec_tokenizer(r'"my app" --flag "a \\"quoted\\" arg" %U')
+        ['my app', ['--flag', 'a "quoted" arg', '%U']]
+    """
+    words = []
+    exec_string = exec_string.strip()
+    position = 0
+    end = len(exec_string)
+    while position < end:
+        match = _exec_word(exec_string, position)
+        if match is None:
+            raise ValueError('Malformed Exec entry: {!s}'.format(exec_string))
+        quoted, word = match.groups()
+        if quoted is not None:
+            word = (_exec_escaped_char.sub(r'\1', quoted)
+                    if '\\' in quoted else quoted)
+        words.append(word)
+        position = match.end()
+    if not words:
+        raise ValueError('Empty Exec entry.')
+    return [words[0], words[1:]]
 
 
 def exec_parser(exec_string):
     """
     Make the AST for a XDG Exec string.
 
+    Words are split into lists of characters, except for field codes.
+
+    Args:
+        exec_string (str):
+
+    Returns:
+        list: AST
+
+    See Also:
+        :func:`~exec_tokenizer`
+    """
+    executable, arguments = exec_tokenizer(exec_string)
+    return [list(executable),
+            [[argument] if argument in FIELD_CODES else list(argument)
+             for argument in arguments]]
+
+
+_tatsu_parser = None
+
+
+def tatsu_exec_parser(exec_string):
+    """
+    Make the AST for a XDG Exec string using a PEG parser.
+
+    This is much slower than :func:`~exec_parser` and kept as an opt-in
+    alternative.  Its grammar is :data:`~EXEC_GRAMMAR`.  The parser is
+    built by :func:`~load_tatsu_exec_parser` on first use.
+
     Args:
         exec_string (str):
 
     Returns:
         list: AST
     """
-    return _exec_parser.parse(exec_string)
+    parser = _tatsu_parser or load_tatsu_exec_parser()
+    return parser.parse(exec_string)
+
+
+def load_tatsu_exec_parser(cache_dir=None):
+    """
+    Build the PEG parser used by :func:`~tatsu_exec_parser`.
+
+    Neither :mod:`tatsu` nor the grammar are loaded before this is called.
+    Calling this again replaces the parser in use.
+
+    Args:
+        cache_dir (str): When provided, the Python source of the parser is
+            generated by :mod:`tatsu` in this directory once, and simply
+            imported afterwards instead of compiling the grammar.  Use
+            :func:`~default_cache_dir` for a sensible location.
+
+    Returns:
+        The parser.  It has a ``parse`` method taking an Exec string.
+    """
+    global _tatsu_parser
+    if cache_dir is None:
+        import tatsu
+        _tatsu_parser = tatsu.compile(EXEC_GRAMMAR)
+    else:
+        module = _load_generated_parser(str(cache_dir))
+        _tatsu_parser = module.ExecParser()
+    return _tatsu_parser
+
+
+def default_cache_dir():
+    """
+    Provide the cache directory of `pymenu`, creating it if needed.
+
+    Returns:
+        str: A ``pymenu`` directory in ``$XDG_CACHE_HOME``.
+    """
+    return xdg.BaseDirectory.save_cache_path('pymenu')
+
+
+def _load_generated_parser(cache_dir):
+    import tatsu
+    checksum = hashlib.sha1(
+        '{!s}{!s}'.format(tatsu.__version__, EXEC_GRAMMAR).encode('utf8'))
+    module_name = 'exec_parser_{!s}'.format(checksum.hexdigest()[:12])
+    module_path = os.path.join(cache_dir, module_name + '.py')
+
+    if not os.path.exists(module_path):
+        source = tatsu.to_python_sourcecode(EXEC_GRAMMAR)
+        _write_atomically(module_path, source)
+
+    return _import_from_path(module_name, module_path)
+
+
+def _import_from_path(module_name, module_path):
+    try:
+        from importlib.util import spec_from_file_location, module_from_spec
+    except ImportError:
+        # python 2
+        import imp
+        return imp.load_source(module_name, module_path)
+    spec = spec_from_file_location(module_name, module_path)
+    module = module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _join_word(word_ast):
+    if isinstance(word_ast, six.string_types):
+        return word_ast
+    return ''.join(word_ast)
 
 
 if __name__ == '__main__':
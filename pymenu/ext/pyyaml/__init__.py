@@ -0,0 +1,111 @@
+#!/usr/bin/python
+# coding: utf8
+
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import io
+import os
+
+import six
+import yaml
+from yaml.constructor import SafeConstructor
+from yaml.resolver import Resolver
+
+from pymenu.stream import menu_from_events
+
+
+def load_yaml_menu(path, name=None):
+    """
+    Build a menu tree from a YAML file, without loading the whole document.
+
+    Mappings are menus and other values are leaves, like with
+    :class:`pymenu.DictMenuEntry`.
+
+    Args:
+        path (str): The YAML file.
+        name (str): The name of the root entry.  Defaults to the base name
+            of `path`.
+
+    Returns:
+        pymenu.stream.StreamedMenuEntry
+    """
+    with io.open(path, encoding='utf8') as opened:
+        return menu_from_events(name or os.path.basename(path),
+                                yaml_events(opened))
+
+
+def yaml_events(stream):
+    """
+    Parse a YAML document incrementally.
+
+    Scalars are resolved like with :func:`yaml.safe_load`.  Only the first
+    document of `stream` is parsed.
+
+    Args:
+        stream (io.TextIOBase): The document.
+
+    Yields:
+        Tuple[str, Any]: Events like those of
+        :func:`pymenu.stream.iter_json_events`.
+
+    Raises:
+        ValueError: when the document uses aliases, which would need
+            previous values to be kept.
+    """
+    resolver = Resolver()
+    constructor = SafeConstructor()
+    # Whether each open mapping waits for a key, None for sequences
+    expecting_keys = []
+    for event in yaml.parse(stream, Loader=yaml.SafeLoader):
+        if isinstance(event, yaml.DocumentEndEvent):
+            return
+        if isinstance(event, yaml.AliasEvent):
+            raise ValueError('Aliases are not supported, at {!s}'.format(
+                event.start_mark))
+        is_key = bool(expecting_keys) and expecting_keys[-1] is True
+        if (expecting_keys and expecting_keys[-1] is not None
+                and isinstance(event, yaml.NodeEvent)):
+            # Keys and values alternate in mappings
+            expecting_keys[-1] = not is_key
+        if isinstance(event, yaml.MappingStartEvent):
+            expecting_keys.append(True)
+            yield 'start_map', None
+        elif isinstance(event, yaml.SequenceStartEvent):
+            expecting_keys.append(None)
+            yield 'start_array', None
+        elif isinstance(event, yaml.MappingEndEvent):
+            expecting_keys.pop()
+            yield 'end_map', None
+        elif isinstance(event, yaml.SequenceEndEvent):
+            expecting_keys.pop()
+            yield 'end_array', None
+        elif isinstance(event, yaml.ScalarEvent):
+            value = _construct(resolver, constructor, event)
+            if is_key:
+                yield 'map_key', value
+            else:
+                yield _event_name(value), value
+
+
+def _construct(resolver, constructor, event):
+    tag = event.tag
+    if tag is None or tag == '!':
+        tag = resolver.resolve(yaml.ScalarNode, event.value, event.implicit)
+    node = yaml.ScalarNode(tag, event.value, event.start_mark,
+                           event.end_mark, style=event.style)
+    value = constructor.construct_object(node)
+    constructor.constructed_objects.clear()
+    return value
+
+
+def _event_name(value):
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'boolean'
+    if isinstance(value, six.integer_types + (float,)):
+        return 'number'
+    return 'string'
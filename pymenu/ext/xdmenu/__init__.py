@@ -6,17 +6,27 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import unicode_literals
 
+from collections import OrderedDict
+import subprocess
+
+import six
 import xdmenu
 
-from pymenu import Prompt
+from pymenu import Prompt, _write_lines
 
 
 class DmenuPrompt(Prompt):
     def __init__(self, dmenu=None):
         """
 
+        Choices are written to the command while they are iterated, so that
+        selectors reading their input incrementally can show them early.
+        dmenu itself reads them all before showing up.  When `dmenu` was
+        given a ``proc_runner``, it runs dmenu with all the choices instead.
+
         Args:
-            dmenu (xdmenu.BaseMenu):
+            dmenu (xdmenu.BaseMenu): Provides the dmenu command line, and
+                runs it if it has a ``proc_runner``.
         """
         self._dmenu = dmenu or xdmenu.Dmenu()
 
@@ -24,16 +34,74 @@ class DmenuPrompt(Prompt):
         """
 
         Args:
-            menu (list): List from which to choose from.
+            menu (Iterable[str]): Choices from which to choose from.
 
         Returns:
-            str
-        """
-        results = self._dmenu.run(menu)
+            str: The choice, or ``None`` if dmenu was cancelled.
 
+        Raises:
+            xdmenu.DmenuError: when dmenu cannot be run.
+        """
+        results = self._run(menu)
         try:
             choice = results[0]
         except IndexError:
             choice = None
 
         return choice
+
+    def prompt_for_many(self, menu):
+        """
+        Several items are chosen with Ctrl-Return, which keeps dmenu open,
+        the last one with Return.
+
+        Args:
+            menu (Iterable[str]): Choices from which to choose from.
+
+        Returns:
+            list: The choices, without repeats.  Empty if dmenu was
+            cancelled.
+
+        Raises:
+            xdmenu.DmenuError: when dmenu cannot be run.
+        """
+        return list(OrderedDict.fromkeys(self._run(menu)))
+
+    def _run(self, menu):
+        """
+        Returns:
+            list: The lines printed by dmenu.
+        """
+        if not _has_default_runner(self._dmenu):
+            return self._dmenu.run(list(menu))
+        cmd = self._dmenu.make_cmd()
+        try:
+            process = subprocess.Popen(cmd,
+                                       stdin=subprocess.PIPE,
+                                       stdout=subprocess.PIPE,
+                                       stderr=subprocess.PIPE)
+        except OSError as err:
+            six.raise_from(xdmenu.DmenuError(cmd, str(err)), err)
+        try:
+            _write_lines(process.stdin, menu)
+        except BaseException:
+            # Such as an error listing choices
+            process.kill()
+            process.communicate()
+            raise
+        # This closes stdin, so that dmenu knows all the choices
+        stdout, stderr = process.communicate()
+        stderr = stderr.decode('utf8', 'replace')
+        if 'usage' in stderr and process.returncode != 0:
+            raise xdmenu.DmenuUsageError(cmd, stderr)
+
+        return stdout.decode('utf8').strip().splitlines()
+
+
+def _has_default_runner(dmenu):
+    """
+    Tell whether dmenu is run by xdmenu itself, rather than by a
+    ``proc_runner`` that streaming choices would bypass.
+    """
+    return (getattr(dmenu, '_run_dmenu_process', None)
+            is xdmenu._run_dmenu_process)
@@ -0,0 +1,83 @@
+#!/usr/bin/python
+# coding: utf8
+
+
+"""
+A dmenu prompt for asyncio applications.
+
+This module requires Python 3.5 or later.
+"""
+
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import asyncio
+from collections import OrderedDict
+import subprocess
+
+import xdmenu
+
+from pymenu.aio import AsyncPrompt, _in_thread
+from pymenu.ext.xdmenu import _has_default_runner
+
+
+class AsyncDmenuPrompt(AsyncPrompt):
+    def __init__(self, dmenu=None):
+        """
+        Run dmenu as an asyncio subprocess.
+
+        Args:
+            dmenu (xdmenu.BaseMenu): Provides the dmenu command line.  If it
+                was given a ``proc_runner``, dmenu is run with it in a
+                worker thread.
+        """
+        self._dmenu = dmenu or xdmenu.Dmenu()
+
+    async def prompt_for_one(self, menu):
+        """
+
+        Args:
+            menu (list): List from which to choose from.
+
+        Returns:
+            str: The choice, or ``None`` if dmenu was cancelled.
+
+        Raises:
+            xdmenu.DmenuError: when dmenu cannot be run.
+        """
+        results = await self._run(menu)
+        try:
+            choice = results[0]
+        except IndexError:
+            choice = None
+
+        return choice
+
+    async def prompt_for_many(self, menu):
+        """
+        See :meth:`pymenu.ext.xdmenu.DmenuPrompt.prompt_for_many`.
+        """
+        return list(OrderedDict.fromkeys(await self._run(menu)))
+
+    async def _run(self, menu):
+        if not _has_default_runner(self._dmenu):
+            return await _in_thread(self._dmenu.run, list(menu))
+        cmd = self._dmenu.make_cmd()
+        # Listed before dmenu is started, which then never needs to be killed
+        menu_input = '\n'.join(menu).encode('utf8')
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE)
+        except OSError as err:
+            raise xdmenu.DmenuError(cmd, str(err)) from err
+        stdout, stderr = await process.communicate(menu_input)
+        stderr = stderr.decode('utf8', 'replace')
+        if 'usage' in stderr and process.returncode != 0:
+            raise xdmenu.DmenuUsageError(cmd, stderr)
+
+        return stdout.decode('utf8').strip().splitlines()
@@ -0,0 +1,217 @@
+#!/usr/bin/python
+# coding: utf8
+
+
+"""
+Choose which paths filesystem menu trees include.
+
+A :class:`~PathFilter` is checked while directories are listed, before
+entries are created.  Excluded directories are never listed, so excluding
+large trees such as ``.git`` or ``node_modules`` makes menus over source
+checkouts much faster to build.
+"""
+
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import re
+
+
+#: Symbolic links are listed and followed, like other paths.
+FOLLOW_SYMLINKS = 'follow'
+#: Symbolic links are listed, but linked directories are not.
+KEEP_SYMLINKS = 'keep'
+#: Symbolic links are excluded.
+SKIP_SYMLINKS = 'skip'
+
+_SYMLINK_POLICIES = (FOLLOW_SYMLINKS, KEEP_SYMLINKS, SKIP_SYMLINKS)
+
+
+class PathFilter(object):
+    def __init__(self, max_depth=None, ignore=None, include_hidden=True,
+                 symlinks=FOLLOW_SYMLINKS, predicate=None,
+                 one_filesystem=False):
+        """
+        Rules for the paths included in a filesystem menu tree.
+
+        Args:
+            max_depth (int): Directories at this depth below the root are
+                included but not listed.  The root is at depth 0, so it is
+                not listed either if this is 0.  Unlimited if ``None``.
+            ignore (Iterable[str]): gitignore-style patterns of excluded
+                paths.  See :class:`~IgnorePatterns`.
+            include_hidden (bool): Whether to include paths which name starts
+                with a dot.
+            symlinks (str): One of :data:`~FOLLOW_SYMLINKS`,
+                :data:`~KEEP_SYMLINKS` or :data:`~SKIP_SYMLINKS`.
+            predicate (Callable[[os.DirEntry], bool]): Only paths for which
+                it returns true are included.
+            one_filesystem (bool): Whether directories on another filesystem
+                than the root, such as mounted network shares, are included
+                without being listed, like with ``find -xdev``.
+
+        Examples:
+
+            .. code-block:: python
+
+                source_filter = PathFilter(
+                    ignore=['__pycache__/', 'node_modules/', '*.pyc'],
+                    include_hidden=False)
+                menu_entry = FileSystemMenuEntry('~/src',
+                                                 path_filter=source_filter)
+        """
+        if symlinks not in _SYMLINK_POLICIES:
+            raise ValueError('Unknown symlink policy {!r}'.format(symlinks))
+        self._max_depth = max_depth
+        self._ignore = IgnorePatterns(ignore or [])
+        self._include_hidden = include_hidden
+        self._symlinks = symlinks
+        self._predicate = predicate
+        self._one_filesystem = one_filesystem
+
+    @property
+    def max_depth(self):
+        return self._max_depth
+
+    @property
+    def one_filesystem(self):
+        return self._one_filesystem
+
+    def accepts(self, dir_entry, relative_path):
+        """
+        Tell whether a path is included.
+
+        Args:
+            dir_entry (os.DirEntry): The path, as listed in its directory.
+            relative_path (str): The path relative to the root of the tree,
+                with ``/`` separators.
+
+        Returns:
+            bool
+        """
+        if not self._include_hidden and dir_entry.name.startswith('.'):
+            return False
+        if self._symlinks == SKIP_SYMLINKS and dir_entry.is_symlink():
+            return False
+        if self._ignore and self._ignore.ignores(relative_path,
+                                                 dir_entry.is_dir()):
+            return False
+        if self._predicate is not None and not self._predicate(dir_entry):
+            return False
+        return True
+
+    def lists(self, dir_entry, depth):
+        """
+        Tell whether the content of an included directory is included.
+
+        Args:
+            dir_entry (os.DirEntry): The directory, as listed in its parent.
+            depth (int): The depth of the directory below the root.
+
+        Returns:
+            bool
+        """
+        if self._max_depth is not None and depth >= self._max_depth:
+            return False
+        if self._symlinks != FOLLOW_SYMLINKS and dir_entry.is_symlink():
+            return False
+        return True
+
+
+class IgnorePatterns(object):
+    def __init__(self, patterns):
+        """
+        Match paths with gitignore-style patterns.
+
+        Like in ``.gitignore`` files, ``*`` and ``?`` do not match ``/``, and
+        ``**`` matches any number of directories.  Patterns containing a
+        ``/`` are relative to the root, others match names at any depth.  A
+        trailing ``/`` only matches directories and a leading ``!``
+        includes paths excluded by previous patterns.  Blank lines and
+        lines starting with ``#`` are ignored.
+
+        Args:
+            patterns (Iterable[str]): Patterns, such as the lines of a
+                ``.gitignore`` file.
+
+        Examples:
+
+            >>> patterns = IgnorePatterns(['*.pyc', 'build/', '!keep.pyc'])
+            >>> patterns.ignores('pymenu/cli.pyc', is_directory=False)
+            True
+            >>> patterns.ignores('keep.pyc', is_directory=False)
+            False
+            >>> patterns.ignores('docs/build', is_directory=False)
+            False
+        """
+        self._rules = [rule for rule in (_compile(pattern.rstrip('\n'))
+                                         for pattern in patterns)
+                       if rule is not None]
+
+    def __bool__(self):
+        return bool(self._rules)
+
+    __nonzero__ = __bool__
+
+    def ignores(self, relative_path, is_directory):
+        """
+        Args:
+            relative_path (str): The path relative to the root, with ``/``
+                separators.
+            is_directory (bool): Whether the path is a directory.
+
+        Returns:
+            bool: Whether the last matching pattern excludes the path.
+        """
+        ignored = False
+        for match, negated, directory_only in self._rules:
+            if directory_only and not is_directory:
+                continue
+            if match(relative_path):
+                ignored = not negated
+        return ignored
+
+
+def _compile(pattern):
+    pattern = pattern.strip()
+    if not pattern or pattern.startswith('#'):
+        return None
+    negated = pattern.startswith('!')
+    if negated:
+        pattern = pattern[1:]
+    directory_only = pattern.endswith('/')
+    pattern = pattern.rstrip('/')
+    anchored = '/' in pattern
+    pattern = pattern.lstrip('/')
+
+    parts = []
+    index = 0
+    while index < len(pattern):
+        if pattern.startswith('**/', index):
+            parts.append('(?:.*/)?')
+            index += 3
+        elif pattern.startswith('**', index):
+            parts.append('.*')
+            index += 2
+        elif pattern[index] == '*':
+            parts.append('[^/]*')
+            index += 1
+        elif pattern[index] == '?':
+            parts.append('[^/]')
+            index += 1
+        elif pattern[index] == '[' and ']' in pattern[index + 2:]:
+            end = pattern.index(']', index + 2)
+            chars = pattern[index + 1:end]
+            if chars.startswith('!'):
+                chars = '^' + chars[1:]
+            parts.append('[' + chars + ']')
+            index = end + 1
+        else:
+            parts.append(re.escape(pattern[index]))
+            index += 1
+    prefix = '' if anchored else '(?:.*/)?'
+    regex = re.compile('^{!s}{!s}$'.format(prefix, ''.join(parts)),
+                       re.DOTALL)
+    return regex.match, negated, directory_only
@@ -0,0 +1,273 @@
+#!/usr/bin/python
+# coding: utf8
+
+
+"""
+Remember which menu entries are used, to list them first.
+
+Frecency combines how often and how recently something was used.  Every use
+adds a score that halves after a given time.  All scores decay at the same
+rate, so the order of entries only depends on a single logarithmic value per
+entry, updated in constant time.
+"""
+
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import io
+import json
+import logging
+import math
+import os
+import threading
+import time
+
+import six
+from six.moves import queue
+
+
+#: Default time after which the score of a use is halved, in seconds.
+HALF_LIFE = 3 * 24 * 60 * 60
+
+#: Default time the first ranking waits for the file to be read, in seconds.
+LOAD_TIMEOUT = 0.1
+
+_logger = logging.getLogger(__name__)
+
+
+class FrecencyStore(object):
+    def __init__(self, path=None, half_life=HALF_LIFE,
+                 load_timeout=LOAD_TIMEOUT):
+        """
+        Usage records of menu entries, kept in an append-only file.
+
+        The file is read and written by a background thread, so that
+        recording never waits for the disk.  The first ranking waits a
+        little for the file to be read, which is enough for most files.
+        Until it is read, only uses recorded since are known.
+
+        Args:
+            path (str): The file where uses are appended.  Nothing is
+                persisted if ``None``.  See :func:`~default_frecency_path`.
+            half_life (float): Time after which the score of a use is halved,
+                in seconds.
+            load_timeout (float): How long the first ranking, by
+                :meth:`~rank`, :meth:`~sort` or a :class:`pymenu.Menu`,
+                waits at most for the file to be read, in seconds.
+        """
+        self._path = path
+        self._load_timeout = load_timeout
+        self._waited = False
+        self._decay = math.log(2) / half_life
+        self._ranks = {}
+        self._lock = threading.Lock()
+        self._writes = queue.Queue()
+        self._loaded = threading.Event()
+        self._worker = None
+        if path is None:
+            self._loaded.set()
+        else:
+            self._worker = threading.Thread(target=self._work)
+            self._worker.daemon = True
+            self._worker.start()
+
+    def record(self, key, when=None):
+        """
+        Record a use.
+
+        Args:
+            key (str): What was used, such as
+                :attr:`pymenu.MenuEntry.usage_key`.
+            when (float): Timestamp of the use.  Defaults to now.
+        """
+        when = time.time() if when is None else when
+        self._add(key, when)
+        if self._path is not None:
+            self._writes.put((when, key))
+
+    def record_entry(self, entry):
+        """
+        Record the use of a menu entry and of all its ancestors.
+
+        Args:
+            entry (pymenu.MenuEntry):
+        """
+        when = time.time()
+        for node in entry.path:
+            self.record(node.usage_key, when)
+
+    def rank(self, key):
+        """
+        Provide a value that orders keys by frecency.
+
+        Args:
+            key (str):
+
+        Returns:
+            float: Greater for keys with a greater frecency.
+        """
+        self._wait_before_ranking()
+        return self._ranks.get(key, float('-inf'))
+
+    def score(self, key, now=None):
+        """
+        Provide the current frecency score of a key.
+
+        Args:
+            key (str):
+            now (float): Timestamp at which to compute the score.
+
+        Returns:
+            float: The sum of the decayed scores of all uses, each being
+            worth 1 when it is recorded.
+        """
+        now = time.time() if now is None else now
+        return math.exp(self.rank(key) - self._decay * now)
+
+    def sort(self, entries):
+        """
+        Sort menu entries by decreasing frecency.
+
+        Entries with the same frecency keep their order.
+
+        Args:
+            entries (list): :class:`pymenu.MenuEntry` objects.
+
+        Returns:
+            list
+        """
+        return sorted(entries, key=self._sort_key)
+
+    def wait_until_loaded(self, timeout=None):
+        """
+        Wait for the file to be read.
+
+        Args:
+            timeout (float): How long to wait at most, in seconds.
+
+        Returns:
+            bool: Whether it was.
+        """
+        return self._loaded.wait(timeout)
+
+    def close(self):
+        """
+        Write pending records and stop the background thread.
+        """
+        if self._worker is not None:
+            self._writes.put(None)
+            self._worker.join()
+            self._worker = None
+
+    def _wait_before_ranking(self):
+        # Only once, so that a large file delays a single ranking
+        if not self._waited:
+            self._waited = True
+            self.wait_until_loaded(self._load_timeout)
+
+    def _sort_key(self, entry):
+        return -self.rank(entry.usage_key)
+
+    def _add(self, key, when):
+        with self._lock:
+            _accumulate(self._ranks, key, self._decay * when)
+
+    def _work(self):
+        try:
+            self._load()
+        finally:
+            self._loaded.set()
+        while True:
+            writes = [self._writes.get()]
+            while not self._writes.empty():
+                writes.append(self._writes.get())
+            records = [write for write in writes if write is not None]
+            if records:
+                try:
+                    self._append(records)
+                except (IOError, OSError):
+                    # Uses are still ranked, and later ones may be written
+                    _logger.exception('Cannot record uses in %s', self._path)
+            if None in writes:
+                return
+
+    def _load(self):
+        ranks = {}
+        lines = 0
+        try:
+            with io.open(self._path, encoding='utf8') as opened:
+                for line in opened:
+                    record = _decode(line)
+                    if record is None:
+                        # An interrupted write, or not a record at all
+                        continue
+                    when, key = record
+                    _accumulate(ranks, key, self._decay * when)
+                    lines += 1
+        except (IOError, OSError):
+            return
+        with self._lock:
+            for key, rank in ranks.items():
+                _accumulate(self._ranks, key, rank)
+        if lines > 2 * len(ranks) + 100:
+            try:
+                self._compact(ranks)
+            except (IOError, OSError):
+                _logger.exception('Cannot compact %s', self._path)
+
+    def _compact(self, ranks):
+        # A single use at this time has the same score as all the uses
+        # of a key.
+        records = [(rank / self._decay, key) for key, rank in ranks.items()]
+        temporary_path = '{!s}.{!s}.tmp'.format(self._path, os.getpid())
+        with io.open(temporary_path, 'w', encoding='utf8') as opened:
+            opened.write(_encode(records))
+        os.rename(temporary_path, self._path)
+
+    def _append(self, records):
+        directory = os.path.dirname(self._path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        with io.open(self._path, 'a', encoding='utf8') as opened:
+            opened.write(_encode(records))
+
+
+def default_frecency_path():
+    """
+    Provide the default file for usage records.
+
+    Returns:
+        str: ``pymenu/frecency.log`` in ``$XDG_DATA_HOME``.
+    """
+    data_home = (os.environ.get('XDG_DATA_HOME')
+                 or os.path.join(os.path.expanduser('~'), '.local', 'share'))
+    return os.path.join(data_home, 'pymenu', 'frecency.log')
+
+
+def _accumulate(ranks, key, value):
+    rank = ranks.get(key)
+    if rank is None:
+        ranks[key] = value
+    else:
+        # log(exp(rank) + exp(value)), without overflowing
+        high, low = max(rank, value), min(rank, value)
+        ranks[key] = high + math.log1p(math.exp(low - high))
+
+
+def _encode(records):
+    return ''.join(json.dumps([when, key]) + '\n' for when, key in records)
+
+
+def _decode(line):
+    try:
+        when, key = json.loads(line)
+    except (ValueError, TypeError):
+        return None
+    if (isinstance(when, bool)
+            or not isinstance(when, six.integer_types + (float,))
+            or math.isinf(when) or math.isnan(when)
+            or not isinstance(key, six.string_types)):
+        return None
+    return when, key
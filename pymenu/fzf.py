@@ -0,0 +1,196 @@
+#!/usr/bin/python
+# coding: utf8
+
+
+"""
+A prompt keeping a single fzf_ process across menu levels.
+
+Running a selector such as dmenu for every prompt forks a process and sends
+it the whole list of choices each time.  A :class:`~FzfPrompt` instead starts
+fzf once, with ``--listen``, and swaps its list with a ``reload`` action sent
+over a Unix socket.  Choices are streamed to fzf through a named pipe as they
+are produced, and choosing one does not end fzf: it writes the choice to
+another named pipe that the prompt reads.
+
+.. _fzf: https://github.com/junegunn/fzf
+"""
+
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import errno
+import fcntl
+import io
+import os
+import select
+import shutil
+import socket
+import subprocess
+import tempfile
+import time
+
+from six.moves import shlex_quote
+
+from pymenu import Prompt, _write_lines
+
+
+class FzfError(Exception):
+    """
+    fzf could not be run or did not answer.
+    """
+
+
+class FzfPrompt(Prompt):
+    def __init__(self, fzf='fzf', options=None):
+        """
+        Prompt with an fzf process running across prompts.
+
+        fzf is started by the first prompt and runs until :meth:`~close` is
+        called, displaying the last list of choices between prompts.  Typing
+        Escape, or choosing when nothing matches, answers ``None``.  If the
+        user quits fzf, the next prompt starts it again.
+
+        Args:
+            fzf (str): The fzf executable, version 0.50 or later.
+            options (list): More command line options of fzf, such as
+                ``['--height', '40%']``.
+
+        Examples:
+
+            .. code-block:: python
+
+                prompt = FzfPrompt(options=['--prompt', 'pymenu> '])
+                try:
+                    value = Menu(menu_entry, prompt).choose_value()
+                finally:
+                    prompt.close()
+        """
+        self._fzf = fzf
+        self._options = list(options or [])
+        self._process = None
+        self._directory = None
+        self._selections = None
+        self._pending = b''
+        self._lists = 0
+
+    def prompt_for_one(self, choices):
+        """
+        Args:
+            choices (Iterable[str]): Choices to list, sent to fzf as they are
+                iterated.
+
+        Returns:
+            str: The chosen item, or ``None``.
+
+        Raises:
+            pymenu.fzf.FzfError: when fzf cannot be run.
+        """
+        if self._process is None or self._process.poll() is not None:
+            self._start(choices)
+        else:
+            self._reload(choices)
+        return self._read_selection()
+
+    def close(self):
+        """
+        Stop fzf.
+        """
+        if self._process is not None:
+            if self._process.poll() is None:
+                self._process.terminate()
+            self._process.wait()
+            self._process = None
+        if self._selections is not None:
+            os.close(self._selections)
+            self._selections = None
+        if self._directory is not None:
+            shutil.rmtree(self._directory, ignore_errors=True)
+            self._directory = None
+        self._pending = b''
+
+    def _start(self, choices):
+        self.close()
+        self._directory = tempfile.mkdtemp(prefix='pymenu-fzf-')
+        selections_path = os.path.join(self._directory, 'selections')
+        os.mkfifo(selections_path)
+        # Opened for writing too, so that reading never meets the end
+        self._selections = os.open(selections_path, os.O_RDWR)
+        target = shlex_quote(selections_path)
+        cmd = ([self._fzf,
+                '--listen={!s}'.format(self._socket_path()),
+                '--bind', 'enter:execute-silent(printf "%s\\n" {{}} > {!s})'
+                          '+clear-query'.format(target),
+                '--bind', 'esc:execute-silent(printf "\\n" > {!s})'
+                          '+clear-query'.format(target)]
+               + self._options)
+        try:
+            self._process = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+        except OSError as error:
+            self.close()
+            raise FzfError('Cannot run {!s}: {!s}'.format(self._fzf, error))
+        with self._process.stdin as stream:
+            _write_lines(stream, choices)
+
+    def _reload(self, choices):
+        self._lists += 1
+        path = os.path.join(self._directory,
+                            'choices-{:d}'.format(self._lists))
+        os.mkfifo(path)
+        try:
+            self._post('reload(cat {!s})'.format(shlex_quote(path)))
+            with self._open_for_writing(path) as stream:
+                _write_lines(stream, choices)
+        finally:
+            os.remove(path)
+
+    def _read_selection(self):
+        while b'\n' not in self._pending:
+            if self._process.poll() is not None:
+                # The user quit fzf
+                self.close()
+                return None
+            if select.select([self._selections], [], [], 0.1)[0]:
+                self._pending += os.read(self._selections, 4096)
+        line, self._pending = self._pending.split(b'\n', 1)
+        return line.decode('utf8') or None
+
+    def _post(self, action):
+        body = action.encode('utf8')
+        request = (b'POST / HTTP/1.1\r\nHost: localhost\r\n'
+                   b'Content-Length: ' + str(len(body)).encode('ascii')
+                   + b'\r\n\r\n' + body)
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            connection.connect(self._socket_path())
+            connection.sendall(request)
+            response = connection.recv(4096)
+        except (IOError, OSError) as error:
+            raise FzfError('fzf did not answer: {!s}'.format(error))
+        finally:
+            connection.close()
+        status = response.split(b'\r\n', 1)[0].split()
+        if status[1:2] != [b'200']:
+            raise FzfError('fzf refused {!r}: {!s}'.format(
+                action, response.decode('utf8', 'replace')))
+
+    def _open_for_writing(self, path):
+        # Opening a named pipe waits for a reader, which is never coming if
+        # fzf quits.
+        while True:
+            try:
+                fd = os.open(path, os.O_WRONLY | os.O_NONBLOCK)
+                break
+            except OSError as error:
+                if error.errno != errno.ENXIO:
+                    raise error
+            if self._process.poll() is not None:
+                raise FzfError('fzf exited')
+            time.sleep(0.001)
+        flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+        fcntl.fcntl(fd, fcntl.F_SETFL, flags & ~os.O_NONBLOCK)
+        return io.open(fd, 'wb')
+
+    def _socket_path(self):
+        return os.path.join(self._directory, 'fzf.sock')
@@ -0,0 +1,195 @@
+#!/usr/bin/python
+# coding: utf8
+
+
+"""
+Load the entries a user may choose next while a menu waits for a choice.
+
+Prompting a user takes seconds, while listing a directory or calling a
+submenu factory often takes milliseconds.  A :class:`~Prefetcher` loads the
+lazy entries listed by a prompt in a background thread, so that the chosen
+entry is usually loaded by the time it is displayed.  Loading stops as soon
+as the user chooses, so menu trees are never changed by two threads at once.
+"""
+
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import threading
+import time
+
+from six.moves import queue
+
+from pymenu import LazyMenuEntry
+
+
+class Prefetcher(object):
+    def __init__(self, limit=None, budget=None):
+        """
+        Load listed entries in a background thread during prompts.
+
+        Entries are loaded in the order they are listed, which is by
+        decreasing frecency when a menu has a
+        :class:`pymenu.frecency.FrecencyStore`.
+
+        Args:
+            limit (int): How many entries to load at most per prompt.
+                Unlimited if ``None``.
+            budget (float): How long to load entries at most per prompt, in
+                seconds.  The entry being loaded when the budget is spent is
+                still loaded.  Unlimited if ``None``.
+
+        Examples:
+
+            .. code-block:: python
+
+                menu = Menu(menu_entry, DmenuPrompt(),
+                            frecency=FrecencyStore(default_frecency_path()),
+                            prefetcher=Prefetcher(limit=5))
+        """
+        self._limit = limit
+        self._budget = budget
+        self._jobs = queue.Queue()
+        self._worker = None
+
+    def prefetch(self, entries):
+        """
+        Start loading entries in the background.
+
+        Args:
+            entries (Iterable[pymenu.MenuEntry]): The listed entries.  Only
+                unloaded :class:`pymenu.LazyMenuEntry` objects are loaded.
+
+        Returns:
+            pymenu.prefetch.PrefetchJob: Must be stopped before the trees of
+            `entries` are used again.
+        """
+        job = self.make_job(entries)
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._work)
+            self._worker.daemon = True
+            self._worker.start()
+        self._jobs.put(job)
+        return job
+
+    def make_job(self, entries):
+        """
+        Choose which entries to load, without starting to load them.
+
+        Args:
+            entries (Iterable[pymenu.MenuEntry]): The listed entries.
+
+        Returns:
+            pymenu.prefetch.PrefetchJob: To be run in any thread.
+        """
+        return PrefetchJob(unloaded_entries(entries, self._limit),
+                           self._budget)
+
+    def close(self):
+        """
+        Stop the background thread.
+        """
+        if self._worker is not None:
+            self._jobs.put(None)
+            self._worker.join()
+            self._worker = None
+
+    def _work(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            job.run()
+
+
+class PrefetchJob(object):
+    def __init__(self, entries, budget=None):
+        """
+        Entries loaded for a single prompt.
+
+        Args:
+            entries (list): :class:`pymenu.LazyMenuEntry` objects to load.
+            budget (float): See :class:`~Prefetcher`.
+        """
+        self._entries = entries
+        self._budget = budget
+        self._lock = threading.Lock()
+        self._started = False
+        self._stopped = threading.Event()
+        self._done = threading.Event()
+        if not entries:
+            self._done.set()
+
+    def run(self):
+        """
+        Load the entries until stopped, in the calling thread.
+
+        Nothing is loaded if the job was already stopped.
+        """
+        with self._lock:
+            if self._stopped.is_set():
+                return
+            self._started = True
+        try:
+            load_entries(self._entries, self._stopped, self._budget)
+        finally:
+            self._done.set()
+
+    def stop(self, wait=True):
+        """
+        Stop loading.
+
+        A job waiting to be run, such as behind the job of another menu
+        sharing the :class:`~Prefetcher`, is dropped without waiting.
+
+        Args:
+            wait (bool): Whether to wait for the entry being loaded, if any.
+        """
+        with self._lock:
+            self._stopped.set()
+            if not self._started:
+                self._done.set()
+        if wait:
+            self._done.wait()
+
+
+def load_entries(entries, stopped, budget=None):
+    """
+    Load lazy entries one after the other.
+
+    An entry failing to load is unloaded, so that the error is raised again
+    when it is visited.
+
+    Args:
+        entries (Iterable[pymenu.LazyMenuEntry]):
+        stopped (threading.Event): Stops loading when set.
+        budget (float): How long to load entries at most, in seconds.
+    """
+    deadline = None if budget is None else time.time() + budget
+    for entry in entries:
+        if stopped.is_set():
+            return
+        if deadline is not None and time.time() >= deadline:
+            return
+        try:
+            entry.load()
+        except Exception:
+            # Loading anything may fail, which is not the user's concern yet
+            entry.unload()
+
+
+def unloaded_entries(entries, limit=None):
+    """
+    Args:
+        entries (Iterable[pymenu.MenuEntry]):
+        limit (int): How many entries to provide at most.
+
+    Returns:
+        list: The :class:`pymenu.LazyMenuEntry` objects of `entries` which
+        are not loaded.
+    """
+    unloaded = [entry for entry in entries
+                if isinstance(entry, LazyMenuEntry) and not entry.is_loaded]
+    return unloaded if limit is None else unloaded[:limit]
@@ -0,0 +1,178 @@
+#!/usr/bin/python
+# coding: utf8
+
+
+"""
+Build whole filesystem menu trees by listing directories concurrently.
+
+On network filesystems and slow disks, listing a directory mostly waits for
+the storage.  A :class:`~ParallelScanner` lists many directories at once with
+a bounded pool of threads, while the entries of the tree are created on the
+calling thread only.
+"""
+
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from collections import namedtuple
+import errno
+import threading
+import time
+
+from six.moves import queue
+
+from pymenu import FileSystemMenuEntry, _scandir
+
+
+#: Default maximum number of directories listed at once.
+DEFAULT_MAX_WORKERS = 8
+
+
+class ScanReport(namedtuple('ScanReport',
+                            ['directories', 'entries', 'seconds'])):
+    """
+    Statistics of a scan.
+
+    Attributes:
+        directories (int): How many directories were listed.
+        entries (int): How many entries were created, including the root.
+        seconds (float): How long the scan took.
+    """
+
+    __slots__ = ()
+
+    @property
+    def entries_per_second(self):
+        if not self.seconds:
+            return float('inf')
+        return self.entries / self.seconds
+
+
+class ParallelScanner(object):
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, cls=None,
+                 path_filter=None):
+        """
+        Build eager filesystem menu trees with concurrent directory listing.
+
+        The resulting tree is the same as an eager
+        :class:`pymenu.FileSystemMenuEntry` tree.
+
+        Args:
+            max_workers (int): How many directories may be listed at once.
+            cls (type): The class of entries, a subclass of
+                :class:`pymenu.FileSystemMenuEntry` by default.
+            path_filter (pymenu.filters.PathFilter): Which paths to include.
+
+        Examples:
+
+            .. code-block:: python
+
+                scanner = ParallelScanner(max_workers=16)
+                menu_entry = scanner.scan('/mnt/nfs/share')
+                print('{:.0f} entries/s'.format(
+                    scanner.report.entries_per_second))
+        """
+        if max_workers < 1:
+            raise ValueError('At least one worker is needed')
+        self._max_workers = max_workers
+        self._cls = cls or FileSystemMenuEntry
+        self._path_filter = path_filter
+        self._report = None
+
+    @property
+    def report(self):
+        """
+        Returns:
+            pymenu.scan.ScanReport: Statistics of the last scan, if any.
+        """
+        return self._report
+
+    def scan(self, path):
+        """
+        Build the whole tree of a path.
+
+        Args:
+            path (str): The root of the tree.
+
+        Returns:
+            pymenu.FileSystemMenuEntry
+
+        Raises:
+            OSError: when a directory could not be listed.
+        """
+        start = time.time()
+        root = self._cls(path, lazy=True, path_filter=self._path_filter)
+        root._lazy = False
+        jobs = queue.Queue()
+        results = queue.Queue()
+        stat_directories = getattr(self._path_filter, 'one_filesystem',
+                                   False)
+        workers = [threading.Thread(target=_list_directories,
+                                    args=(jobs, results, stat_directories))
+                   for _ in range(self._max_workers)]
+        for worker in workers:
+            worker.daemon = True
+            worker.start()
+
+        directories = 0
+        entries = 1
+        try:
+            if root._listable:
+                jobs.put(root)
+                pending = 1
+            else:
+                root._loaded = True
+                pending = 0
+            while pending:
+                entry, dir_entries, error = results.get()
+                pending -= 1
+                entry._loaded = True
+                if error is not None:
+                    if error.errno != errno.ENOTDIR:
+                        raise error
+                    entry._is_directory = False
+                    continue
+                entry._is_directory = True
+                directories += 1
+                for child in entry._make_children(dir_entries):
+                    entries += 1
+                    if child._listable and child.is_directory:
+                        jobs.put(child)
+                        pending += 1
+                    else:
+                        child._loaded = True
+        finally:
+            for _ in workers:
+                jobs.put(None)
+            for worker in workers:
+                worker.join()
+
+        self._report = ScanReport(directories, entries, time.time() - start)
+        return root
+
+
+def _list_directories(jobs, results, stat_directories):
+    # Workers only read the path of entries: the tree is only modified by the
+    # calling thread.
+    while True:
+        entry = jobs.get()
+        if entry is None:
+            return
+        try:
+            dir_entries = list(_scandir(entry.value))
+        except OSError as error:
+            results.put((entry, None, error))
+            continue
+        for dir_entry in dir_entries:
+            # Linked directories are checked for loops, and all directories
+            # for their device in one filesystem mode, with their stat
+            # result, which os.DirEntry caches.
+            if ((stat_directories or dir_entry.is_symlink())
+                    and dir_entry.is_dir()):
+                try:
+                    dir_entry.stat()
+                except OSError:
+                    pass
+        results.put((entry, dir_entries, None))
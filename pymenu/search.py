@@ -0,0 +1,297 @@
+#!/usr/bin/python
+# coding: utf8
+
+
+"""
+Fuzzy search over the leaves of menu trees.
+
+The scoring is inspired by fzf_: every character of the query must appear in
+order in a label, and matches at word boundaries or on consecutive
+characters rank higher than scattered ones.
+
+.. _fzf: https://github.com/junegunn/fzf
+"""
+
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from collections import defaultdict
+from collections import namedtuple
+import heapq
+import re
+
+
+SCORE_MATCH = 16
+SCORE_GAP_START = -3
+SCORE_GAP_EXTENSION = -1
+BONUS_BOUNDARY = 8
+BONUS_CAMEL_CASE = 7
+BONUS_CONSECUTIVE = 4
+BONUS_FIRST_CHAR_MULTIPLIER = 2
+
+_BOUNDARY_CHARS = frozenset('/\\-_ .:')
+
+# The most a query character after the first one can add to a score
+_MAX_CHAR_SCORE = SCORE_MATCH + max(BONUS_BOUNDARY, BONUS_CAMEL_CASE,
+                                    BONUS_CONSECUTIVE)
+
+
+SearchResult = namedtuple('SearchResult', ['score', 'label', 'entry'])
+
+
+class SearchIndex(object):
+    def __init__(self, root_entry, separator='/'):
+        """
+        An index of the leaves of a menu tree, labeled with their path.
+
+        Args:
+            root_entry (pymenu.MenuEntry): The tree to search.
+            separator (str): Separates entry names in labels.
+
+        See Also:
+            :meth:`pymenu.MenuEntry.flat_choices`
+        """
+        choices = root_entry.flat_choices(separator)
+        self._labels = list(choices.keys())
+        self._entries = list(choices.values())
+        self._lowered = [label.lower() for label in self._labels]
+        self._masks = [_char_mask(label) for label in self._lowered]
+
+    def __len__(self):
+        return len(self._labels)
+
+    def search(self, query, limit=10):
+        """
+        Find the leaves best matching a query.
+
+        Args:
+            query (str): Characters to find in order.  Case insensitive.
+            limit (int): How many results to return at most.  All matches
+                are returned if ``None``.
+
+        Returns:
+            list: :class:`~SearchResult` tuples, best first.
+        """
+        return self._rank(query, self._match(query, range(len(self))), limit)
+
+    def session(self, limit=10):
+        """
+        Start searching as a user types.
+
+        Returns:
+            pymenu.search.SearchSession
+        """
+        return SearchSession(self, limit=limit)
+
+    def _match(self, query, candidates):
+        """
+        Filter candidate indices with entries matching the query.
+        """
+        lowered_query = query.lower()
+        if not lowered_query:
+            return list(candidates)
+        mask = _char_mask(lowered_query)
+        masks = self._masks
+        lowered = self._lowered
+        pattern = re.compile(
+            '.*?'.join(re.escape(char) for char in lowered_query),
+            re.DOTALL).search
+        return [index for index in candidates
+                if masks[index] & mask == mask and pattern(lowered[index])]
+
+    def _rank(self, query, matches, limit):
+        lowered_query = query.lower()
+        labels = self._labels
+        lowered = self._lowered
+        scored = ((fuzzy_score(lowered_query, lowered[index], labels[index]),
+                   index)
+                  for index in matches)
+        key = _sort_key(labels)
+        if limit is None:
+            best = sorted(scored, key=key)
+        else:
+            best = heapq.nsmallest(limit, scored, key=key)
+        return [SearchResult(score, labels[index], self._entries[index])
+                for score, index in best]
+
+    def _rank_bounded(self, query, matches, limit, bounds):
+        """
+        Rank matches without scoring those which cannot be among the best.
+
+        Args:
+            bounds (dict): Upper bounds of the scores of the matches, by
+                index.  They are replaced by the scores of the matches
+                which are scored.
+        """
+        if limit == 0:
+            return []
+        lowered_query = query.lower()
+        labels = self._labels
+        lowered = self._lowered
+        by_bound = defaultdict(list)
+        for index in matches:
+            by_bound[bounds[index]].append(index)
+        # The worst of the best matches so far is at the top of the heap
+        best = []
+        for bound in sorted(by_bound, reverse=True):
+            if limit is not None and len(best) >= limit \
+                    and bound < best[0][0]:
+                break
+            for index in by_bound[bound]:
+                full = limit is not None and len(best) >= limit
+                # Shorter labels win ties
+                if full and (bound, -len(labels[index]), -index) < best[0]:
+                    continue
+                score = fuzzy_score(lowered_query, lowered[index],
+                                    labels[index])
+                bounds[index] = score
+                item = score, -len(labels[index]), -index
+                if not full:
+                    heapq.heappush(best, item)
+                elif item > best[0]:
+                    heapq.heapreplace(best, item)
+        return [SearchResult(score, labels[-index], self._entries[-index])
+                for score, _, index in sorted(best, reverse=True)]
+
+
+class SearchSession(object):
+    def __init__(self, index, limit=10):
+        """
+        Incremental search, narrowing previous matches as a query grows.
+
+        The previous score of each match bounds its score for a longer
+        query, so that matches which cannot rank within `limit` are not
+        scored again.
+
+        Args:
+            index (pymenu.search.SearchIndex):
+            limit (int): How many results to return at most.
+        """
+        self._index = index
+        self._limit = limit
+        self._query = ''
+        self._matches = list(range(len(index)))
+        self._bounds = {}
+
+    def update(self, query):
+        """
+        Search again with a new query.
+
+        When the new query extends the previous one, only previous matches
+        are considered.
+
+        Args:
+            query (str): The whole query typed so far.
+
+        Returns:
+            list: :class:`~SearchResult` tuples, best first.
+        """
+        lowered_query = query.lower()
+        extends = lowered_query.startswith(self._query)
+        if extends:
+            candidates = self._matches
+        else:
+            candidates = range(len(self._index))
+        matches = self._index._match(query, candidates)
+        if extends and self._query:
+            extra = _MAX_CHAR_SCORE * (len(lowered_query) - len(self._query))
+            bounds = dict((index, self._bounds[index] + extra)
+                          for index in matches)
+        else:
+            bounds = dict.fromkeys(matches, _max_score(lowered_query))
+        self._query = lowered_query
+        self._matches = matches
+        self._bounds = bounds
+        return self._index._rank_bounded(query, matches, self._limit, bounds)
+
+
+def fuzzy_score(query, text, original=None):
+    """
+    Score how well a text matches a query.
+
+    Args:
+        query (str): Lowercased query.
+        text (str): Lowercased text.
+        original (str): The text with its original case, used for camel case
+            bonuses.  Defaults to `text`.
+
+    Returns:
+        int: The score, or ``None`` if the text does not match.
+
+    Examples:
+
+        >>> fuzzy_score('vim', 'vim') > fuzzy_score('vim', 'video image')
+        True
+        >>> fuzzy_score('ed', 'editors/vim') > fuzzy_score('ed', 'gedit')
+        True
+        >>> fuzzy_score('xyz', 'vim') is None
+        True
+    """
+    if not query:
+        return 0
+    original = original or text
+
+    # Every occurrence of the first character may start the best match, and
+    # matching the rest greedily from there favors consecutive characters.
+    best = None
+    first_char = query[0]
+    start = text.find(first_char)
+    while start >= 0:
+        score = _score_from(query, text, original, start)
+        if score is None:
+            break
+        if best is None or score > best:
+            best = score
+        start = text.find(first_char, start + 1)
+    return best
+
+
+def _max_score(query):
+    if not query:
+        return 0
+    return (SCORE_MATCH + BONUS_BOUNDARY * BONUS_FIRST_CHAR_MULTIPLIER
+            + _MAX_CHAR_SCORE * (len(query) - 1))
+
+
+def _score_from(query, text, original, start):
+    score = 0
+    previous = start - 1
+    for query_index, char in enumerate(query):
+        index = text.find(char, previous + 1)
+        if index < 0:
+            return None
+        gap = index - previous - 1
+        if query_index and gap:
+            score += SCORE_GAP_START + SCORE_GAP_EXTENSION * (gap - 1)
+        bonus = _bonus(original, index)
+        if query_index and not gap:
+            bonus = max(bonus, BONUS_CONSECUTIVE)
+        if not query_index:
+            bonus *= BONUS_FIRST_CHAR_MULTIPLIER
+        score += SCORE_MATCH + bonus
+        previous = index
+    return score
+
+
+def _bonus(text, index):
+    if index == 0 or text[index - 1] in _BOUNDARY_CHARS:
+        return BONUS_BOUNDARY
+    if text[index - 1].islower() and text[index].isupper():
+        return BONUS_CAMEL_CASE
+    return 0
+
+
+def _char_mask(text):
+    mask = 0
+    for char in set(text):
+        mask |= 1 << (ord(char) & 63)
+    return mask
+
+
+def _sort_key(labels):
+    def key(scored):
+        score, index = scored
+        return -score, len(labels[index]), index
+    return key
@@ -0,0 +1,302 @@
+#!/usr/bin/python
+# coding: utf8
+
+
+"""
+Serve menus from a long-lived process.
+
+Starting a Python interpreter, importing the dependencies of a menu and
+building its tree usually takes much longer than displaying it.  A
+:class:`~MenuServer` keeps menu trees in memory and answers requests on a
+Unix socket, so that a launcher only needs to run the tiny
+:mod:`pymenu.client` (or the ``pymenu`` command), which describes the
+protocol.
+
+Servers are started by Python code registering their menus, there is no
+command for it.
+"""
+
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import errno
+import json
+import logging
+import os
+import socket
+import stat
+import threading
+
+from six.moves import socketserver
+
+from pymenu import Menu, Prompt
+# The client is still provided here, where it used to be
+from pymenu.client import (  # noqa: F401
+    PromptCancelled, ServerError, default_socket_path, request_value)
+
+
+_logger = logging.getLogger(__name__)
+
+
+class MenuServer(object):
+    def __init__(self, socket_path=None, prompt=None, refresh_interval=None,
+                 frecency=None, prefetcher=None):
+        """
+        Serve menus on a Unix socket.
+
+        Args:
+            socket_path (str): Path of the Unix socket to listen on.  Defaults
+                to :func:`~default_socket_path`.
+            prompt (pymenu.Prompt): The default prompt of registered menus.
+            refresh_interval (float): When provided, every menu tree is
+                rebuilt in the background this often, in seconds.  Errors
+                rebuilding a tree are logged, and its previous tree is kept.
+            frecency (pymenu.frecency.FrecencyStore): When provided, choices
+                of every menu are listed by decreasing frecency.
+            prefetcher (pymenu.prefetch.Prefetcher): When provided, listed
+                entries of every menu are loaded while prompting.
+
+        Examples:
+
+            .. code-block:: python
+
+                server = MenuServer(prompt=DmenuPrompt(),
+                                    refresh_interval=60)
+                server.register('apps', make_xdg_menu_entry,
+                                action=launch_xdg_menu_entry)
+                server.serve_forever()
+        """
+        self._socket_path = socket_path or default_socket_path()
+        self._prompt = prompt
+        self._refresh_interval = refresh_interval
+        self._frecency = frecency
+        self._prefetcher = prefetcher
+        self._menus = {}
+        self._server = None
+        self._stopped = threading.Event()
+
+    @property
+    def socket_path(self):
+        return self._socket_path
+
+    def register(self, name, factory, action=None, prompt=None):
+        """
+        Build a menu tree and serve it.
+
+        Args:
+            name (str): The name clients use to request this menu.
+            factory (Callable[[], pymenu.MenuEntry]): Builds the root entry of
+                the menu tree.  It is called again when the menu is refreshed.
+            action (Callable[[Any], Any]): Applied to the chosen value in the
+                server process, for instance to launch an application.  What
+                it returns is sent to the client.  By default, the chosen
+                value itself is sent.
+            prompt (pymenu.Prompt): The prompt for this menu.  Defaults to
+                the prompt of this server.
+        """
+        self._menus[name] = _ServedMenu(factory,
+                                        action=action,
+                                        prompt=prompt or self._prompt,
+                                        frecency=self._frecency,
+                                        prefetcher=self._prefetcher)
+
+    def refresh(self, name=None):
+        """
+        Rebuild a menu tree, or all of them.
+
+        Requests keep being served from the previous tree until the new one
+        is built.
+
+        Args:
+            name (str): The menu to refresh.  All menus are refreshed if
+                ``None``.
+        """
+        names = [name] if name is not None else list(self._menus)
+        for menu_name in names:
+            self._get_menu(menu_name).refresh()
+
+    def choose_value(self, name):
+        """
+        Prompt for a choice in a served menu.
+
+        Args:
+            name (str): The menu name.
+
+        Returns:
+            Any: The chosen value, after the action of this menu was applied.
+
+        Raises:
+            pymenu.client.PromptCancelled: when the prompt was cancelled.
+        """
+        return self._get_menu(name).choose_value()
+
+    def serve_forever(self):
+        """
+        Listen on the socket until :meth:`~shutdown` is called.
+
+        Raises:
+            ServerError: when the socket path is used by another server, or
+                by something else than a socket.
+        """
+        _remove_stale_socket(self._socket_path)
+        self._server = _UnixServer(self._socket_path, _RequestHandler)
+        self._server.menu_server = self
+        self._stopped.clear()
+        if self._refresh_interval:
+            refresher = threading.Thread(target=self._refresh_periodically)
+            refresher.daemon = True
+            refresher.start()
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            os.remove(self._socket_path)
+
+    def shutdown(self):
+        """
+        Stop serving.  This must be called from another thread.
+        """
+        self._stopped.set()
+        if self._server is not None:
+            self._server.shutdown()
+
+    def handle(self, request):
+        """
+        Answer a decoded request.
+
+        Args:
+            request (dict): See the module documentation.
+
+        Returns:
+            dict: The response.
+        """
+        command = request.get('command', 'choose')
+        try:
+            if command == 'choose':
+                return {'value': self.choose_value(request.get('menu'))}
+            elif command == 'refresh':
+                self.refresh(request.get('menu'))
+                return {'value': None}
+            raise ServerError('Unknown command {!r}'.format(command))
+        except PromptCancelled:
+            return {'cancelled': True}
+        except Exception as error:
+            return {'error': '{!s}: {!s}'.format(error.__class__.__name__,
+                                                 error)}
+
+    def _get_menu(self, name):
+        try:
+            return self._menus[name]
+        except KeyError:
+            raise ServerError('Unknown menu {!r}'.format(name))
+
+    def _refresh_periodically(self):
+        while not self._stopped.wait(self._refresh_interval):
+            for name in list(self._menus):
+                try:
+                    self.refresh(name)
+                except Exception:
+                    # The previous tree keeps being served, and the next
+                    # refresh may succeed, such as once a package upgrade
+                    # restored a missing file.
+                    _logger.exception('Cannot refresh the %r menu', name)
+
+
+class _ServedMenu(object):
+    def __init__(self, factory, action=None, prompt=None, frecency=None,
+                 prefetcher=None):
+        self._factory = factory
+        self._action = action or _identity
+        self._prompt = prompt
+        self._frecency = frecency
+        self._prefetcher = prefetcher
+        self._choosing = threading.Lock()
+        self._entry = factory()
+
+    def refresh(self):
+        # The new tree replaces the previous one in a single assignment, so
+        # prompts in progress keep their own tree.
+        self._entry = self._factory()
+
+    def choose_value(self):
+        # Menu trees may load their children while they are browsed, which
+        # is not thread safe.
+        with self._choosing:
+            value = Menu(self._entry, _CancellablePrompt(self._prompt),
+                         frecency=self._frecency,
+                         prefetcher=self._prefetcher).choose_value()
+        return self._action(value)
+
+
+class _CancellablePrompt(Prompt):
+    def __init__(self, prompt):
+        """
+        Raise :class:`pymenu.client.PromptCancelled` instead of returning
+        ``None``, which a :class:`pymenu.Menu` would take for a label.
+
+        Args:
+            prompt (pymenu.Prompt): The prompt to use.
+        """
+        self._prompt = prompt
+
+    def prompt_for_one(self, choices):
+        choice = self._prompt.prompt_for_one(choices)
+        if choice is None:
+            raise PromptCancelled()
+        return choice
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            # Such as a server checking whether this one is running
+            return
+        try:
+            request = json.loads(line.decode('utf8'))
+        except ValueError as error:
+            response = {'error': 'Malformed request: {!s}'.format(error)}
+        else:
+            response = self.server.menu_server.handle(request)
+        self.wfile.write(_encode(response))
+
+
+def _remove_stale_socket(path):
+    """
+    Remove the socket left by a server that did not stop cleanly.
+    """
+    try:
+        mode = os.lstat(path).st_mode
+    except OSError as e:
+        if e.errno != errno.ENOENT:
+            raise e
+        return
+    if not stat.S_ISSOCK(mode):
+        raise ServerError('{!s} exists and is not a socket'.format(path))
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except socket.error as e:
+        if e.errno != errno.ECONNREFUSED:
+            raise e
+        os.remove(path)
+    else:
+        raise ServerError('A server already listens on {!s}'.format(path))
+    finally:
+        probe.close()
+
+
+def _encode(message):
+    # Values that JSON does not support, such as applications, are sent as
+    # their string representation.
+    return (json.dumps(message, default=str) + '\n').encode('utf8')
+
+
+def _identity(value):
+    return value
@@ -0,0 +1,440 @@
+#!/usr/bin/python
+# coding: utf8
+
+
+"""
+Start many processes without blocking nor leaving zombies.
+
+Launching applications from a large Python process, such as a window manager,
+is slow when each process is forked: the page tables of the parent are
+copied every time.  :func:`~spawn` uses ``os.posix_spawnp`` when it can,
+which does not copy them.  A :class:`~Spawner` starts processes from a
+bounded pool of threads and returns their handles at once, and a single
+background thread reaps all of them when they exit.
+"""
+
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import errno
+import fcntl
+import os
+import select
+import signal
+import subprocess
+import threading
+import time
+
+from six.moves import queue
+
+
+#: Default maximum number of processes started at once.
+DEFAULT_MAX_WORKERS = 4
+
+# Python ignores these signals, which subprocess.Popen restores for children
+_RESTORED_SIGNALS = tuple(getattr(signal, name)
+                          for name in ['SIGPIPE', 'SIGXFSZ']
+                          if hasattr(signal, name))
+
+# How often processes are polled when they cannot be watched with a pidfd,
+# at first and at most, in seconds
+_MIN_POLL_INTERVAL = 0.001
+_MAX_POLL_INTERVAL = 0.05
+
+
+class SpawnedProcess(object):
+    def __init__(self, args, popen_kwargs=None):
+        """
+        A process which may not be started yet.
+
+        It provides the ``args``, ``pid``, ``returncode``, ``poll`` and
+        ``wait`` members of :class:`subprocess.Popen`.
+
+        Args:
+            args (list): The command line.
+            popen_kwargs (dict): Keyword arguments of
+                :class:`subprocess.Popen`.  The process is started with
+                ``os.posix_spawnp`` if there are none besides ``env``.
+        """
+        self.args = list(args)
+        self._popen_kwargs = dict(popen_kwargs or {})
+        self._pid = None
+        self._popen = None
+        self._error = None
+        self._returncode = None
+        self._lock = threading.Lock()
+        self._started = threading.Event()
+        # Whether the reaper thread waits for the process, and reaps it alone
+        self._watched = False
+        self._exited = threading.Event()
+
+    @property
+    def pid(self):
+        """
+        Wait for the process to be started.
+
+        Returns:
+            int: Its process ID.
+
+        Raises:
+            OSError: when it could not be started.
+        """
+        self.wait_started()
+        return self._pid
+
+    @property
+    def returncode(self):
+        """
+        Returns:
+            int: The exit status, or ``None`` if the process did not exit or
+            was not waited for yet.  See :attr:`subprocess.Popen.returncode`.
+        """
+        return self._returncode
+
+    def wait_started(self, timeout=None):
+        """
+        Wait for the process to be started.
+
+        Args:
+            timeout (float): How long to wait at most, in seconds.
+
+        Returns:
+            bool: Whether it was started.
+
+        Raises:
+            OSError: when it could not be started.
+        """
+        if not self._started.wait(timeout):
+            return False
+        if self._error is not None:
+            raise self._error
+        return True
+
+    def poll(self):
+        """
+        Check whether the process exited, without waiting.
+
+        Returns:
+            int: The exit status, or ``None`` if it is still running or not
+            started yet.
+        """
+        if not self._started.is_set() or self._error is not None:
+            return None
+        with self._lock:
+            if self._returncode is None and not self._watched:
+                self._try_reap(block=False)
+        return self._returncode
+
+    def wait(self, timeout=None):
+        """
+        Wait for the process to exit.
+
+        Args:
+            timeout (float): How long to wait at most, in seconds.
+
+        Returns:
+            int: The exit status, or ``None`` if it is still running after
+            `timeout`.
+
+        Raises:
+            OSError: when it could not be started.
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        if not self.wait_started(timeout):
+            return None
+        self._watch()
+        self._exited.wait(None if deadline is None
+                          else max(deadline - time.time(), 0))
+        return self._returncode
+
+    def _watch(self):
+        """
+        Let the reaper thread wait for the process to exit, unless it
+        already does.
+        """
+        with self._lock:
+            if self._watched:
+                return
+            self._watched = True
+            if self._returncode is not None:
+                self._exited.set()
+                return
+        _reaper.watch(self)
+
+    def _try_reap(self, block):
+        """
+        Reap the process if it exited.
+
+        Args:
+            block (bool): Whether to wait for it to exit.
+
+        Returns:
+            bool: Whether it exited.
+        """
+        if self._popen is not None:
+            returncode = self._popen.wait() if block else self._popen.poll()
+        else:
+            returncode = _wait_for_pid(self._pid,
+                                       0 if block else os.WNOHANG)
+        if returncode is None:
+            return False
+        self._returncode = returncode
+        self._exited.set()
+        return True
+
+    def _start(self):
+        """
+        Start the process in the calling thread.
+
+        Errors are raised by :meth:`~wait_started`.
+        """
+        try:
+            if _can_posix_spawn(self._popen_kwargs):
+                env = self._popen_kwargs.get('env')
+                self._pid = os.posix_spawnp(
+                    self.args[0], self.args,
+                    os.environ if env is None else env,
+                    setsigdef=_RESTORED_SIGNALS)
+            else:
+                self._popen = subprocess.Popen(self.args,
+                                               **self._popen_kwargs)
+                self._pid = self._popen.pid
+        except Exception as error:
+            # Raised in the thread using this process
+            self._error = error
+        finally:
+            self._started.set()
+
+    def __repr__(self):
+        return '{!s}({!r})'.format(self.__class__.__name__, self.args)
+
+
+class Spawner(object):
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, reap=True):
+        """
+        Start processes in the background.
+
+        :meth:`~spawn` returns at once, while at most `max_workers` threads
+        start the queued processes.
+
+        Args:
+            max_workers (int): How many processes may be started at once.
+            reap (bool): Whether started processes are reaped in the
+                background, so that they do not stay zombies after they
+                exit.  A single thread reaps the processes of all spawners.
+                Otherwise, their ``wait`` method must be called.
+
+        Examples:
+
+            .. code-block:: python
+
+                spawner = Spawner()
+                processes = [spawner.spawn(['xdg-open', path])
+                             for path in paths]
+        """
+        if max_workers < 1:
+            raise ValueError('At least one worker is needed')
+        self._max_workers = max_workers
+        self._reap = reap
+        self._jobs = queue.Queue()
+        self._workers = []
+        self._lock = threading.Lock()
+
+    def spawn(self, cmd, **popen_kwargs):
+        """
+        Queue a process to start.
+
+        Args:
+            cmd (list): The command line.
+            **popen_kwargs: See :class:`~SpawnedProcess`.
+
+        Returns:
+            pymenu.spawn.SpawnedProcess: Not started yet.  Errors starting
+            it are raised by its methods.
+        """
+        process = SpawnedProcess(cmd, popen_kwargs)
+        with self._lock:
+            if len(self._workers) < self._max_workers:
+                worker = threading.Thread(target=self._work)
+                worker.daemon = True
+                worker.start()
+                self._workers.append(worker)
+        self._jobs.put(process)
+        return process
+
+    def close(self):
+        """
+        Wait for the queued processes to be started and stop the threads
+        starting them.
+
+        Processes still running keep being reaped in the background.
+        """
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            self._jobs.put(None)
+        for worker in workers:
+            worker.join()
+
+    def _work(self):
+        while True:
+            process = self._jobs.get()
+            if process is None:
+                return
+            process._start()
+            if self._reap and process._error is None:
+                process._watch()
+
+
+class _Reaper(object):
+    def __init__(self):
+        """
+        Reap watched processes from a single thread.
+
+        The thread waits for the pidfds of the processes when
+        ``os.pidfd_open`` is available, so that it sleeps until one exits.
+        Otherwise, it polls them, less and less often while none exits.
+        """
+        self._lock = threading.Lock()
+        # Processes by pidfd, and processes without one
+        self._pidfds = {}
+        self._polled = []
+        self._thread = None
+        self._wake_fd = None
+        self._waker_fd = None
+
+    def watch(self, process):
+        """
+        Reap a started process when it exits.
+
+        Args:
+            process (pymenu.spawn.SpawnedProcess):
+        """
+        pidfd = None
+        if hasattr(os, 'pidfd_open'):
+            try:
+                pidfd = os.pidfd_open(process._pid)
+            except OSError:
+                # Such as too many open files: the process is polled
+                pass
+        with self._lock:
+            if pidfd is None:
+                self._polled.append(process)
+            else:
+                self._pidfds[pidfd] = process
+            if self._thread is None:
+                self._wake_fd, self._waker_fd = os.pipe()
+                flags = fcntl.fcntl(self._waker_fd, fcntl.F_GETFL)
+                fcntl.fcntl(self._waker_fd, fcntl.F_SETFL,
+                            flags | os.O_NONBLOCK)
+                self._thread = threading.Thread(target=self._work)
+                self._thread.daemon = True
+                self._thread.start()
+            waker_fd = self._waker_fd
+        try:
+            os.write(waker_fd, b'\0')
+        except OSError as e:
+            # The pipe is full of pending wake ups already
+            if e.errno != errno.EAGAIN:
+                raise e
+
+    def _work(self):
+        interval = _MIN_POLL_INTERVAL
+        while True:
+            with self._lock:
+                fds = [self._wake_fd] + list(self._pidfds)
+                polled = bool(self._polled)
+            readable = _wait_readable(fds, interval if polled else None)
+            if self._wake_fd in readable:
+                os.read(self._wake_fd, 4096)
+                interval = _MIN_POLL_INTERVAL
+            else:
+                interval = min(2 * interval, _MAX_POLL_INTERVAL)
+            with self._lock:
+                exited = [(fd, self._pidfds.pop(fd)) for fd in readable
+                          if fd in self._pidfds]
+                polled, self._polled = self._polled, []
+            for fd, process in exited:
+                os.close(fd)
+                process._try_reap(block=True)
+            running = [process for process in polled
+                       if not process._try_reap(block=False)]
+            with self._lock:
+                self._polled.extend(running)
+
+
+_reaper = _Reaper()
+
+
+def spawn(cmd, **popen_kwargs):
+    """
+    Start a process in the calling thread.
+
+    Args:
+        cmd (list): The command line.
+        **popen_kwargs: See :class:`~SpawnedProcess`.
+
+    Returns:
+        pymenu.spawn.SpawnedProcess: Started.
+
+    Raises:
+        OSError: when the process cannot be started.
+    """
+    process = SpawnedProcess(cmd, popen_kwargs)
+    process._start()
+    process.wait_started()
+    return process
+
+
+def _can_posix_spawn(popen_kwargs):
+    # os.posix_spawnp is available since Python 3.8
+    return (hasattr(os, 'posix_spawnp')
+            and not set(popen_kwargs) - set(['env']))
+
+
+def _wait_for_pid(pid, options):
+    """
+    Returns:
+        int: The exit status of the process, or ``None`` if it is still
+        running.
+    """
+    while True:
+        try:
+            pid, status = os.waitpid(pid, options)
+        except OSError as e:
+            # Python < 3.5 does not retry interrupted calls
+            if e.errno == errno.EINTR:
+                continue
+            # Such as when SIGCHLD is ignored, and the process was reaped
+            # without its status: subprocess also takes it as a success.
+            return 0
+        return _exit_code(status) if pid else None
+
+
+def _wait_readable(fds, timeout):
+    """
+    Returns:
+        list: The file descriptors of `fds` ready to be read, empty after
+        `timeout` seconds unless it is ``None``.
+    """
+    try:
+        if not hasattr(select, 'poll'):
+            return select.select(fds, [], [], timeout)[0]
+        poller = select.poll()
+        for fd in fds:
+            poller.register(fd, select.POLLIN)
+        return [fd for fd, event in poller.poll(
+            None if timeout is None else timeout * 1000)]
+    except (select.error, OSError) as e:
+        # Python < 3.5 does not retry interrupted calls
+        if e.args[0] != errno.EINTR:
+            raise e
+        return []
+
+
+def _exit_code(status):
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
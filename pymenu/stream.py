@@ -0,0 +1,336 @@
+#!/usr/bin/python
+# coding: utf8
+
+
+"""
+Build menu trees from large documents without loading them in memory.
+
+A :class:`pymenu.DictMenuEntry` needs the whole document parsed as nested
+dictionaries.  The functions of this module instead build the tree from a
+stream of parsing events, so that only the tree is kept in memory.  Leaf
+values may even stay in the file until they are requested.
+
+Events are ``(event, value)`` pairs, like the ``basic_parse`` events of the
+ijson_ library: ``('start_map', None)``, ``('map_key', key)``,
+``('end_map', None)``, ``('start_array', None)``, ``('end_array', None)``
+and scalar events such as ``('string', value)`` or ``('number', value)``.
+
+.. _ijson: https://pypi.org/project/ijson/
+"""
+
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import io
+import json
+import os
+import re
+
+from pymenu import MenuEntry
+
+
+#: Default size of the chunks read from JSON files, in bytes.
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(br'[ \t\n\r]*')
+_TOKEN = re.compile(
+    br'[ \t\n\r]*(?:'
+    br'([{}\[\],:])'
+    br'|("[^"\\]*(?:\\.[^"\\]*)*")'
+    br'|(-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?)'
+    br'|(true|false|null))',
+    re.DOTALL)
+_NUMBER_TAIL = re.compile(br'[0-9+\-.eE]*')
+# What a token may start with when the buffer ends before it does.  The
+# scanned part of an unterminated string is its first group.
+_TOKEN_PREFIX = re.compile(
+    br'[ \t\n\r]*(?:'
+    br'("[^"\\]*(?:\\.[^"\\]*)*)\\?'
+    br'|-?(?:(?:0|[1-9][0-9]*)(?:\.[0-9]*)?(?:[eE][-+]?[0-9]*)?)?'
+    br'|t(?:r(?:ue?)?)?|f(?:a(?:l(?:se?)?)?)?|n(?:u(?:ll?)?)?)\Z',
+    re.DOTALL)
+_STRING_TAIL = re.compile(br'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+_LITERALS = {b'true': ('boolean', True),
+             b'false': ('boolean', False),
+             b'null': ('null', None)}
+_STRUCTURE = {b'{': 'start_map', b'}': 'end_map',
+              b'[': 'start_array', b']': 'end_array'}
+
+# What the parser expects next, and the tokens it then accepts
+_VALUE, _KEY, _COLON, _COMMA, _END = range(5)
+_ACCEPTED = {_VALUE: frozenset([b'{', b'[', 'string', 'scalar']),
+             _KEY: frozenset(['string']),
+             _COLON: frozenset([b':']),
+             _COMMA: frozenset([b',', b'}', b']']),
+             _END: frozenset()}
+
+
+class StreamedMenuEntry(MenuEntry):
+    """
+    A menu entry built from parsing events.
+
+    Values left in their file as a :class:`~FileValue` are read each time
+    :attr:`value` is accessed.
+    """
+
+    @property
+    def value(self):
+        if isinstance(self._value, FileValue):
+            return self._value.read()
+        return self._value
+
+
+class FileValue(object):
+    __slots__ = ('path', 'offset', 'length')
+
+    def __init__(self, path, offset, length):
+        """
+        A JSON value left in a file.
+
+        Args:
+            path (str): The JSON file.
+            offset (int): Where the value starts, in bytes.
+            length (int): Length of the value, in bytes.
+        """
+        self.path = path
+        self.offset = offset
+        self.length = length
+
+    def __repr__(self):
+        return '{!s}({!r}, {!r}, {!r})'.format(
+            self.__class__.__name__, self.path, self.offset, self.length)
+
+    def read(self):
+        """
+        Returns:
+            Any: The decoded value.
+        """
+        with io.open(self.path, 'rb') as opened:
+            opened.seek(self.offset)
+            return json.loads(opened.read(self.length).decode('utf8'))
+
+
+def load_json_menu(path, name=None, offsets=False, chunk_size=CHUNK_SIZE):
+    """
+    Build a menu tree from a JSON file.
+
+    Objects are menus and other values are leaves, like with
+    :class:`pymenu.DictMenuEntry`.
+
+    Args:
+        path (str): The JSON file.
+        name (str): The name of the root entry.  Defaults to the base name
+            of `path`.
+        offsets (bool): Whether to leave string values in the file until
+            they are requested.  See :class:`~FileValue`.
+        chunk_size (int): How many bytes to read at once.
+
+    Returns:
+        pymenu.stream.StreamedMenuEntry
+    """
+    with io.open(path, 'rb') as opened:
+        events = iter_json_events(opened, offsets=offsets,
+                                  chunk_size=chunk_size)
+        return menu_from_events(name or os.path.basename(path), events)
+
+
+def menu_from_events(name, events, cls=StreamedMenuEntry):
+    """
+    Build a menu tree from parsing events.
+
+    Maps are menus, unless they are empty or inside an array, and other
+    values are leaves.
+
+    Args:
+        name (str): The name of the root entry.
+        events (Iterable[Tuple[str, Any]]): See the module documentation.
+        cls (type): The class of entries.
+
+    Returns:
+        pymenu.MenuEntry
+    """
+    events = iter(events)
+    root = cls(name)
+    # Menus being filled, innermost last
+    menus = []
+    key = None
+    for event, value in events:
+        if event == 'map_key':
+            key = value
+        elif event == 'start_map':
+            menus.append(menus[-1]._new_child(key) if menus else root)
+        elif event == 'end_map':
+            entry = menus.pop()
+            if not entry.children:
+                entry._value = {}
+        else:
+            if event == 'start_array':
+                value = _read_array(events)
+            if menus:
+                menus[-1]._new_child(key, value)
+            else:
+                root._value = value
+    return root
+
+
+def _read_array(events):
+    # Values inside arrays are plain Python values.
+    containers = [[]]
+    keys = [None]
+    for event, value in events:
+        if event in ('end_array', 'end_map'):
+            value = containers.pop()
+            keys.pop()
+            if not containers:
+                return value
+        elif event == 'map_key':
+            keys[-1] = value
+            continue
+        elif event in ('start_array', 'start_map'):
+            containers.append([] if event == 'start_array' else {})
+            keys.append(None)
+            continue
+        elif isinstance(value, FileValue):
+            value = value.read()
+        container = containers[-1]
+        if isinstance(container, list):
+            container.append(value)
+        else:
+            container[keys[-1]] = value
+    raise ValueError('Unterminated array')
+
+
+def iter_json_events(stream, offsets=False, chunk_size=CHUNK_SIZE):
+    """
+    Parse a JSON document incrementally.
+
+    Args:
+        stream (io.BufferedIOBase): The document, opened in binary mode.
+        offsets (bool): Whether string values of objects are given as
+            :class:`~FileValue` instead of being decoded.  `stream` must
+            then be a file opened from a path.
+        chunk_size (int): How many bytes to read at once.
+
+    Yields:
+        Tuple[str, Any]: See the module documentation.
+
+    Raises:
+        ValueError: when the document is not valid JSON.  Events before the
+            error are yielded.
+
+    Examples:
+
+        >>> list(iter_json_events(io.BytesIO(b'{"a": [1, "b"]}')))
+        ... # doctest: +NORMALIZE_WHITESPACE
+        [('start_map', None), ('map_key', 'a'), ('start_array', None),
+         ('number', 1), ('string', 'b'), ('end_array', None),
+         ('end_map', None)]
+    """
+    path = stream.name if offsets else None
+    match = _TOKEN.match
+    buffer = b''
+    buffer_offset = 0
+    position = 0
+    end_of_stream = False
+    # Whether each open container is a map
+    maps = []
+    expected = _VALUE
+    # Whether a container was just opened, and may be closed at once
+    opened = False
+    # Where scanning an unterminated string resumes, so that long strings
+    # are not scanned again for every chunk
+    resume = None
+    while True:
+        if resume is not None:
+            resume = _STRING_TAIL.match(buffer, resume).end()
+            if buffer[resume:resume + 1] == b'"':
+                resume = None
+        found = match(buffer, position) if resume is None else None
+        # A token ending with the buffer may continue in the next chunk
+        if found is None or (not end_of_stream
+                             and (found.end() == len(buffer)
+                                  or (found.group(3) is not None
+                                      and _NUMBER_TAIL.match(
+                                          buffer, found.end()).end()
+                                      == len(buffer)))):
+            if not end_of_stream:
+                # Whitespace is skipped, so that it is not scanned again
+                position = _WHITESPACE.match(buffer, position).end()
+                if found is None and resume is None:
+                    prefix = _TOKEN_PREFIX.match(buffer, position)
+                    if prefix is None:
+                        # Reading more would not make a valid token
+                        raise ValueError('Invalid token at offset {:d}'.format(
+                            buffer_offset + position))
+                    if prefix.group(1) is not None:
+                        resume = prefix.end(1)
+                size = chunk_size
+                if resume is not None:
+                    # The buffer doubles, so that it is copied in linear time
+                    size = max(chunk_size, len(buffer) - position)
+                chunk = stream.read(size)
+                end_of_stream = not chunk
+                buffer = buffer[position:] + chunk
+                buffer_offset += position
+                if resume is not None:
+                    resume -= position
+                position = 0
+                continue
+            if _WHITESPACE.match(buffer, position).end() < len(buffer):
+                raise ValueError('Invalid token at offset {:d}'.format(
+                    buffer_offset + position))
+            if expected != _END:
+                raise ValueError('Unexpected end of document')
+            return
+
+        punctuation, string, number, literal = found.groups()
+        token_offset = buffer_offset + found.start(found.lastindex)
+        position = found.end()
+        token = punctuation or ('scalar' if string is None else 'string')
+        closing = token in (b'}', b']')
+        if ((token not in _ACCEPTED[expected] and not (opened and closing))
+                or (closing and maps[-1] != (token == b'}'))):
+            raise ValueError('Unexpected {!r} at offset {:d}'.format(
+                found.group(found.lastindex), token_offset))
+        opened = False
+
+        if string is not None and expected == _KEY:
+            expected = _COLON
+            yield 'map_key', _decode_string(string)
+        elif punctuation == b':':
+            expected = _VALUE
+        elif punctuation == b',':
+            expected = _KEY if maps[-1] else _VALUE
+        elif punctuation in (b'{', b'['):
+            maps.append(punctuation == b'{')
+            expected = _KEY if maps[-1] else _VALUE
+            opened = True
+            yield _STRUCTURE[punctuation], None
+        else:
+            # A whole value was read
+            if closing:
+                maps.pop()
+                yield _STRUCTURE[punctuation], None
+            elif string is not None:
+                if path is not None and maps and maps[-1]:
+                    yield 'string', FileValue(path, token_offset,
+                                              len(string))
+                else:
+                    yield 'string', _decode_string(string)
+            elif number is not None:
+                if b'.' in number or b'e' in number or b'E' in number:
+                    yield 'number', float(number)
+                else:
+                    yield 'number', int(number)
+            else:
+                yield _LITERALS[literal]
+            expected = _COMMA if maps else _END
+
+
+def _decode_string(token):
+    content = token[1:-1]
+    if b'\\' in content:
+        return json.loads(token.decode('utf8'))
+    return content.decode('utf8')
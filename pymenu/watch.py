@@ -0,0 +1,181 @@
+#!/usr/bin/python
+# coding: utf8
+
+
+"""
+Keep existing menu trees up to date.
+
+Watchers apply changes to the entries of a tree in place instead of building
+a new tree.  Entries that did not change are left untouched.
+"""
+
+
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import threading
+import time
+
+from pymenu import FileSystemMenuEntry, LazyMenuEntry
+
+
+class TreeWatcher(object):
+    """
+    Abstract class for keeping a menu tree up to date.
+    """
+
+    def poll(self, timeout=None):
+        """
+        Apply pending changes to the tree.
+
+        Args:
+            timeout (float): How long to wait for changes, in seconds.  Does
+                not wait if ``None``.
+
+        Returns:
+            list: The entries whose children changed.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Release resources held by this watcher.
+        """
+        pass
+
+    def run(self, interval=1.0, stop=None):
+        """
+        Poll until `stop` is set.
+
+        Args:
+            interval (float): Time between polls, in seconds.
+            stop (threading.Event): Stops polling when set.
+        """
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            self.poll(timeout=interval)
+
+
+class PollingFileSystemWatcher(TreeWatcher):
+    def __init__(self, root_entry):
+        """
+        Watch a :class:`pymenu.FileSystemMenuEntry` tree by polling.
+
+        Only the loaded directories of the tree are checked, with one
+        ``stat`` call each.  Directories which modification time changed are
+        listed again.
+
+        Args:
+            root_entry (pymenu.FileSystemMenuEntry):
+        """
+        self._root = root_entry
+        self._mtimes = {}
+        self._check()
+
+    def poll(self, timeout=None):
+        if timeout:
+            time.sleep(timeout)
+        return self._check()
+
+    def _check(self):
+        changed = []
+        mtimes = {}
+        for entry in loaded_directories(self._root):
+            try:
+                mtime = os.stat(entry.value).st_mtime
+            except OSError:
+                mtime = None
+            previous = self._mtimes.get(entry, mtime)
+            if previous != mtime:
+                entry.refresh()
+                changed.append(entry)
+            mtimes[entry] = mtime
+        self._mtimes = mtimes
+        return changed
+
+
+def filesystem_watcher(root_entry):
+    """
+    Make the best available watcher for a filesystem menu tree.
+
+    Args:
+        root_entry (pymenu.FileSystemMenuEntry):
+
+    Returns:
+        pymenu.watch.TreeWatcher: An inotify watcher if `inotify_simple` is
+        installed, or a :class:`~PollingFileSystemWatcher`.
+    """
+    try:
+        from pymenu.ext.inotify import InotifyFileSystemWatcher
+    except ImportError:
+        return PollingFileSystemWatcher(root_entry)
+    return InotifyFileSystemWatcher(root_entry)
+
+
+def loaded_directories(root_entry):
+    """
+    Iterate over the directory entries of a tree which children are loaded.
+
+    Args:
+        root_entry (pymenu.FileSystemMenuEntry):
+
+    Yields:
+        pymenu.FileSystemMenuEntry
+    """
+    stack = [root_entry]
+    while stack:
+        entry = stack.pop()
+        if (isinstance(entry, FileSystemMenuEntry)
+                and entry.is_loaded
+                and entry.is_directory):
+            yield entry
+            stack.extend(entry.loaded_children)
+
+
+def merge_entries(entry, new_entry):
+    """
+    Update a menu tree so that it matches another one.
+
+    Children are matched by name, in order.  Matching entries are kept and
+    get the value of their match, missing ones are removed and new ones are
+    moved from `new_entry`.
+
+    Args:
+        entry (pymenu.MenuEntry): The tree to update.
+        new_entry (pymenu.MenuEntry): A tree with the expected content.  Its
+            entries may be moved into `entry`.
+
+    Returns:
+        list: The entries whose children changed.
+    """
+    changed = []
+    stack = [(entry, new_entry)]
+    while stack:
+        current, expected = stack.pop()
+        current._value = expected.value
+        if isinstance(current, LazyMenuEntry):
+            if not current.is_loaded:
+                continue
+            children = current.loaded_children
+        else:
+            children = current.children
+        by_name = {}
+        for child in children:
+            by_name.setdefault(child.name, []).append(child)
+
+        merged = []
+        for expected_child in expected.children:
+            candidates = by_name.get(expected_child.name)
+            if candidates:
+                child = candidates.pop(0)
+                stack.append((child, expected_child))
+                merged.append(child)
+            else:
+                merged.append(expected_child)
+
+        if tuple(merged) != tuple(children):
+            current.children = merged
+            changed.append(current)
+    return changed
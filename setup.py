@@ -323,12 +323,16 @@ class ProjectMetadata(object):
         """
         XDG = ['pyxdg', 'tatsu']
         xdmenu = ['xdmenu']
+        inotify = ['inotify_simple']
+        yaml = ['PyYAML']
         develop = ['sphinx>=1.5',
                    'sphinx_rtd_theme']
         return {'XDG': XDG,
                 'xdmenu': xdmenu,
+                'inotify': inotify,
+                'yaml': yaml,
                 'develop': develop,
-                'all': XDG + xdmenu + develop}
+                'all': XDG + xdmenu + inotify + yaml + develop}
 
     def setup(self):
         """Run :func:`setuptools.setup` using :func:~`raw`."""
@@ -0,0 +1,17 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import stat
+
+import pytest
+
+
+@pytest.fixture
+def fake_dmenu(tmpdir):
+    # Chooses the second line
+    script = tmpdir.join('dmenu')
+    script.write('#!/bin/sh\nsed -n 2p\n')
+    os.chmod(str(script), stat.S_IRWXU)
+    return str(script)
@@ -0,0 +1,94 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+
+import pytest
+
+from pymenu import FileSystemMenuEntry
+
+inotify = pytest.importorskip('pymenu.ext.inotify')
+
+
+def _names(entry):
+    return sorted(os.path.basename(child.name)
+                  for child in entry.loaded_children)
+
+
+def test_inotify_watcher(tmpdir):
+    tmpdir.join('removed').write('')
+    folder = tmpdir.mkdir('folder')
+    folder.join('deepfile').write('')
+    root = FileSystemMenuEntry(str(tmpdir))
+    folder_entry = root.get_child('folder')
+    watcher = inotify.InotifyFileSystemWatcher(root)
+    try:
+        tmpdir.join('removed').remove()
+        tmpdir.join('added').write('')
+        folder.rename(tmpdir.join('renamed'))
+
+        assert watcher.poll(timeout=1) == [root]
+        assert _names(root) == ['added', 'renamed']
+        assert root.get_child('renamed') is folder_entry
+        assert [child.value for child in folder_entry.children] == [
+            str(tmpdir.join('renamed', 'deepfile'))]
+
+        tmpdir.join('renamed', 'new').write('')
+        assert watcher.poll(timeout=1) == [folder_entry]
+        assert _names(folder_entry) == ['deepfile', 'new']
+    finally:
+        watcher.close()
+
+
+def test_renaming_onto_an_existing_path(tmpdir):
+    tmpdir.join('a').write('a')
+    tmpdir.join('b').write('b')
+    root = FileSystemMenuEntry(str(tmpdir))
+    renamed = root.get_child('a')
+    watcher = inotify.InotifyFileSystemWatcher(root)
+    try:
+        tmpdir.join('a').rename(tmpdir.join('b'))
+
+        assert watcher.poll(timeout=1) == [root]
+        assert [child.value for child in root.children] == [
+            str(tmpdir.join('b'))]
+        assert root.get_child('b') is renamed
+    finally:
+        watcher.close()
+
+
+def test_lazily_loaded_directories_are_watched(tmpdir):
+    sub = tmpdir.mkdir('sub')
+    root = FileSystemMenuEntry(str(tmpdir), lazy=True)
+    root.load()
+    watcher = inotify.InotifyFileSystemWatcher(root)
+    try:
+        sub_entry = root.get_child('sub')
+        sub_entry.load()
+        sub.join('new').write('')
+
+        assert watcher.poll(timeout=0.1) == [sub_entry]
+        assert _names(sub_entry) == ['new']
+
+        sub.join('newer').write('')
+        assert watcher.poll(timeout=1) == [sub_entry]
+        assert _names(sub_entry) == ['new', 'newer']
+    finally:
+        watcher.close()
+
+
+def test_overflowed_events_refresh_the_tree(tmpdir, monkeypatch):
+    root = FileSystemMenuEntry(str(tmpdir))
+    watcher = inotify.InotifyFileSystemWatcher(root)
+    try:
+        tmpdir.join('added').write('')
+        overflow = inotify.inotify_simple.Event(
+            -1, inotify.flags.Q_OVERFLOW, 0, '')
+        monkeypatch.setattr(watcher._inotify, 'read',
+                            lambda timeout: [overflow])
+
+        assert watcher.poll(timeout=1) == [root]
+        assert _names(root) == ['added']
+    finally:
+        watcher.close()
@@ -0,0 +1,225 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+
+import pytest
+import xdg.Menu
+
+import pymenu.ext.pyxdg
+from pymenu.spawn import Spawner
+from pymenu.ext.pyxdg import (CachedMenu, XdgMenuWatcher,
+                              launch_xdg_menu_entries,
+                              load_tatsu_exec_parser, make_xdg_menu_entry,
+                              tatsu_exec_parser)
+
+
+MENU_FILE = """\
+<!DOCTYPE Menu PUBLIC "-//freedesktop//DTD Menu 1.0//EN"
+ "http://www.freedesktop.org/standards/menu-spec/1.0/menu.dtd">
+<Menu>
+  <Name>Applications</Name>
+  <AppDir>{appdir!s}</AppDir>
+  <Menu>
+    <Name>Editors</Name>
+    <Include><Category>TextEditor</Category></Include>
+  </Menu>
+  <Menu>
+    <Name>Utilities</Name>
+    <Include><Category>Utility</Category></Include>
+  </Menu>
+</Menu>
+"""
+
+
+def _write_desktop_entry(appdir, filename, **keys):
+    lines = ['[Desktop Entry]', 'Type=Application']
+    lines.extend('{!s}={!s}'.format(key, value)
+                 for key, value in sorted(keys.items()))
+    appdir.join(filename).write('\n'.join(lines) + '\n')
+
+
+@pytest.fixture
+def menu_file(tmpdir):
+    """
+    Make a `.menu` file with a few desktop entries.
+
+    Returns:
+        str: Path to the `.menu` file.
+    """
+    appdir = tmpdir.mkdir('applications')
+    _write_desktop_entry(appdir, 'vim.desktop', Name='Vim', Exec='vim %F',
+                         Terminal='true', Icon='gvim',
+                         Categories='Utility;TextEditor;')
+    _write_desktop_entry(appdir, 'calc.desktop', Name='Calculator',
+                         Exec='calc', Categories='Utility;')
+    menu = tmpdir.join('applications.menu')
+    menu.write(MENU_FILE.format(appdir=appdir))
+    return str(menu)
+
+
+def _describe(menu_entry):
+    return [(leaf.parent.name, leaf.name, leaf.value.executable,
+             leaf.value.arguments, leaf.value.entry.getIcon())
+            for leaf in menu_entry.leaves]
+
+
+def test_cached_xdg_menu(menu_file, tmpdir, monkeypatch):
+    cache_dir = str(tmpdir.mkdir('cache'))
+    parsed = make_xdg_menu_entry(menu_file)
+    cold = make_xdg_menu_entry(menu_file, cache_dir=cache_dir)
+
+    def fail(*args, **kwargs):
+        raise AssertionError('The menu should not be parsed')
+
+    with monkeypatch.context() as patch:
+        patch.setattr(xdg.Menu, 'parse', fail)
+        patch.setattr(xdg.Menu.XMLMenuBuilder, 'parse', fail)
+        warm = make_xdg_menu_entry(menu_file, cache_dir=cache_dir)
+
+    assert isinstance(warm.value, CachedMenu)
+    assert _describe(warm) == _describe(cold) == _describe(parsed)
+    assert ('Editors', 'Vim', ['x-terminal-emulator', '-e', 'vim'], ['%F'],
+            'gvim') in _describe(warm)
+
+
+def test_cached_xdg_menu_invalidation(menu_file, tmpdir):
+    cache_dir = str(tmpdir.mkdir('cache'))
+    make_xdg_menu_entry(menu_file, cache_dir=cache_dir)
+
+    appdir = tmpdir.join('applications')
+    _write_desktop_entry(appdir, 'ed.desktop', Name='Ed', Exec='ed',
+                         Categories='TextEditor;')
+    os.utime(str(appdir), (0, 0))
+
+    menu_entry = make_xdg_menu_entry(menu_file, cache_dir=cache_dir)
+
+    assert not isinstance(menu_entry.value, CachedMenu)
+    assert 'Ed' in [leaf.name for leaf in menu_entry.leaves]
+
+
+def test_cached_xdg_menu_invalidation_by_merged_files(menu_file, tmpdir):
+    cache_dir = str(tmpdir.mkdir('cache'))
+    menu = tmpdir.join('applications.menu')
+    menu.write(menu.read().replace(
+        '</Menu>\n</Menu>',
+        '</Menu>\n  <MergeFile>games.menu</MergeFile>\n'
+        '  <MergeDir>applications-merged</MergeDir>\n</Menu>'))
+    merged = tmpdir.join('games.menu')
+    merged.write('<Menu><Name>Applications</Name>'
+                 '<Menu><Name>Games</Name>'
+                 '<Include><Category>TextEditor</Category></Include>'
+                 '</Menu></Menu>')
+    make_xdg_menu_entry(menu_file, cache_dir=cache_dir)
+    warm = make_xdg_menu_entry(menu_file, cache_dir=cache_dir)
+    assert isinstance(warm.value, CachedMenu)
+
+    merged.write(merged.read().replace('Games', 'Toys'))
+    os.utime(str(merged), (0, 0))
+    menu_entry = make_xdg_menu_entry(menu_file, cache_dir=cache_dir)
+
+    assert not isinstance(menu_entry.value, CachedMenu)
+    assert 'Toys' in [child.name for child in menu_entry.children]
+
+    tmpdir.mkdir('applications-merged').join('office.menu').write(
+        '<Menu><Name>Applications</Name>'
+        '<Menu><Name>Office</Name>'
+        '<Include><Category>Utility</Category></Include>'
+        '</Menu></Menu>')
+    menu_entry = make_xdg_menu_entry(menu_file, cache_dir=cache_dir)
+
+    assert not isinstance(menu_entry.value, CachedMenu)
+    assert 'Office' in [child.name for child in menu_entry.children]
+
+
+def test_unwritable_cache_is_ignored(menu_file, tmpdir):
+    not_a_directory = tmpdir.join('cache')
+    not_a_directory.write('')
+
+    menu_entry = make_xdg_menu_entry(menu_file,
+                                     cache_dir=str(not_a_directory))
+
+    assert 'Vim' in [leaf.name for leaf in menu_entry.leaves]
+
+
+def test_generated_tatsu_parser_is_cached(tmpdir):
+    try:
+        load_tatsu_exec_parser(str(tmpdir))
+        generated = tmpdir.listdir(lambda path: path.ext == '.py')
+        assert len(generated) == 1
+
+        load_tatsu_exec_parser(str(tmpdir))
+        assert tmpdir.listdir(lambda path: path.ext == '.py') == generated
+
+        ast = tatsu_exec_parser('vim "%u" foo')
+        assert list(ast[0]) == ['v', 'i', 'm']
+        assert [list(arg) for arg in ast[1]] == [['%u'], ['f', 'o', 'o']]
+    finally:
+        pymenu.ext.pyxdg._tatsu_parser = None
+
+
+def test_xdg_menu_watcher(menu_file, tmpdir):
+    menu_entry = make_xdg_menu_entry(menu_file)
+    editors, utilities = menu_entry.children
+    watcher = XdgMenuWatcher(menu_entry, menu_file)
+
+    assert watcher.poll() == []
+
+    appdir = tmpdir.join('applications')
+    _write_desktop_entry(appdir, 'ed.desktop', Name='Ed', Exec='ed',
+                         Categories='TextEditor;')
+    os.utime(str(appdir), (0, 0))
+
+    assert watcher.poll() == [editors]
+    assert menu_entry.children == (editors, utilities)
+    assert [leaf.name for leaf in editors.children] == ['Ed', 'Vim']
+
+
+@pytest.mark.parametrize('exec_string, launches', [
+    ('touch %F', 1), ('touch %f', 3), ('true', 1)])
+def test_launch_in_few_processes(tmpdir, exec_string, launches):
+    appdir = tmpdir.mkdir('applications')
+    _write_desktop_entry(appdir, 'app.desktop', Name='App', Exec=exec_string,
+                         Categories='Utility;')
+    _write_desktop_entry(appdir, 'again.desktop', Name='App',
+                         Exec=exec_string, Categories='Utility;')
+    menu = tmpdir.join('applications.menu')
+    menu.write(MENU_FILE.format(appdir=appdir))
+    utilities = make_xdg_menu_entry(str(menu)).children[-1]
+    app = utilities.children[0].value
+    targets = [str(tmpdir.join(name)) for name in ['a', 'b', 'c']]
+
+    processes = launch_xdg_menu_entries([app, app], *targets)
+
+    assert len(processes) == launches
+    assert [process.wait() for process in processes] == [0] * launches
+    if '%' in exec_string:
+        assert all(os.path.exists(target) for target in targets)
+
+    # Without targets, each application runs once
+    processes = launch_xdg_menu_entries(
+        [leaf.value for leaf in utilities.children])
+
+    for process in processes:
+        process.wait()
+
+    assert len(processes) == 2
+
+
+def test_launch_with_a_spawner(tmpdir):
+    appdir = tmpdir.mkdir('applications')
+    _write_desktop_entry(appdir, 'app.desktop', Name='App', Exec='touch %f',
+                         Categories='Utility;')
+    menu = tmpdir.join('applications.menu')
+    menu.write(MENU_FILE.format(appdir=appdir))
+    app = make_xdg_menu_entry(str(menu)).children[-1].children[0].value
+    targets = [str(tmpdir.join('file_{:d}'.format(number)))
+               for number in range(10)]
+    spawner = Spawner(max_workers=3)
+
+    processes = app.launch(*targets, spawner=spawner)
+    spawner.close()
+
+    assert [process.wait() for process in processes] == [0] * 10
+    assert all(os.path.exists(target) for target in targets)
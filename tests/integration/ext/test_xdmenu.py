@@ -0,0 +1,74 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import errno
+import os
+import stat
+import time
+
+import pytest
+import xdmenu
+
+from pymenu.ext.xdmenu import DmenuPrompt
+
+
+def test_dmenu_prompt(fake_dmenu):
+    prompt = DmenuPrompt(xdmenu.Dmenu(dmenu=fake_dmenu))
+
+    assert prompt.prompt_for_one(['vim', 'émacs', 'nano']) == 'émacs'
+    assert prompt.prompt_for_one(['vim']) is None
+
+
+def test_dmenu_prompt_for_many(tmpdir):
+    # Chooses the first and third lines, the first one twice
+    script = tmpdir.join('dmenu')
+    script.write("#!/bin/sh\nsed -n '1p;3p;1p'\n")
+    os.chmod(str(script), stat.S_IRWXU)
+    prompt = DmenuPrompt(xdmenu.Dmenu(dmenu=str(script)))
+
+    assert prompt.prompt_for_many(['vim', 'émacs', 'nano']) == [
+        'vim', 'nano']
+    assert prompt.prompt_for_many([]) == []
+
+
+def test_choices_are_streamed_to_dmenu(tmpdir):
+    # Answers as soon as it reads the first line
+    script = tmpdir.join('dmenu')
+    shown = tmpdir.join('shown')
+    script.write('#!/bin/sh\nhead -n 1 | tee {!s}\n'.format(shown))
+    os.chmod(str(script), stat.S_IRWXU)
+    prompt = DmenuPrompt(xdmenu.Dmenu(dmenu=str(script)))
+
+    def list_slowly():
+        yield 'first'
+        deadline = time.time() + 5
+        while not shown.check() and time.time() < deadline:
+            time.sleep(0.01)
+        for number in range(10000):
+            yield 'later {:d}'.format(number)
+
+    started = time.time()
+    assert prompt.prompt_for_one(list_slowly()) == 'first'
+    assert time.time() - started < 5
+
+
+def test_dmenu_is_stopped_when_listing_choices_fails(tmpdir):
+    script = tmpdir.join('dmenu')
+    pid_file = tmpdir.join('pid')
+    script.write('#!/bin/sh\necho $$ > {!s}\nexec cat\n'.format(pid_file))
+    os.chmod(str(script), stat.S_IRWXU)
+    prompt = DmenuPrompt(xdmenu.Dmenu(dmenu=str(script)))
+
+    def list_failing():
+        yield 'first'
+        deadline = time.time() + 5
+        while not pid_file.check() and time.time() < deadline:
+            time.sleep(0.01)
+        raise RuntimeError('Cannot list more choices')
+
+    with pytest.raises(RuntimeError):
+        prompt.prompt_for_one(list_failing())
+    with pytest.raises(OSError) as raised:
+        os.kill(int(pid_file.read()), 0)
+    assert raised.value.errno == errno.ESRCH
@@ -0,0 +1,41 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import pytest
+import xdmenu
+
+from pymenu.ext.xdmenu.aio import AsyncDmenuPrompt
+
+from tests.unit.test_aio import run
+
+
+def test_async_dmenu_prompt(fake_dmenu):
+    prompt = AsyncDmenuPrompt(xdmenu.Dmenu(dmenu=fake_dmenu))
+
+    assert run(prompt.prompt_for_one(['vim', 'émacs', 'nano'])) == 'émacs'
+    assert run(prompt.prompt_for_one(['vim'])) is None
+
+
+def test_async_dmenu_prompt_for_many(fake_dmenu):
+    prompt = AsyncDmenuPrompt(xdmenu.Dmenu(dmenu=fake_dmenu))
+
+    assert run(prompt.prompt_for_many(['vim', 'émacs'])) == ['émacs']
+    assert run(prompt.prompt_for_many(['vim'])) == []
+
+
+def test_missing_dmenu(tmpdir):
+    missing = str(tmpdir.join('missing'))
+    prompt = AsyncDmenuPrompt(xdmenu.Dmenu(dmenu=missing))
+
+    with pytest.raises(xdmenu.DmenuError):
+        run(prompt.prompt_for_one(['vim']))
+
+
+def test_async_dmenu_prompt_uses_the_configured_runner():
+    def choose_last(cmd, input_lines=None):
+        return input_lines[-1:]
+
+    prompt = AsyncDmenuPrompt(xdmenu.Dmenu(proc_runner=choose_last))
+
+    assert run(prompt.prompt_for_one(['vim', 'emacs'])) == 'emacs'
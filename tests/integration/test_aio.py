@@ -0,0 +1,57 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import asyncio
+from collections import OrderedDict
+
+from pymenu import LazyDictMenuEntry
+from pymenu.aio import AsyncMenu
+
+from tests.unit.test_aio import ScriptedAsyncPrompt, run
+from tests.unit.test_prefetch import _make_lazy_tree
+
+
+class SlowPrompt(ScriptedAsyncPrompt):
+    def __init__(self, answers, root):
+        """
+        Answer once every listed entry of `root` is loaded.
+        """
+        super(SlowPrompt, self).__init__(answers)
+        self._root = root
+
+    async def prompt_for_one(self, choices):
+        while not all(child.is_loaded or child.name == 'Broken'
+                      for child in self._root.loaded_children):
+            await asyncio.sleep(0.001)
+        return await super(SlowPrompt, self).prompt_for_one(choices)
+
+
+def test_listed_entries_are_loaded_while_prompting():
+    root = _make_lazy_tree()
+    prompt = SlowPrompt(['Games', 'Chess'], root)
+
+    assert run(AsyncMenu(root, prompt).choose_value()) == 'chess'
+    windows, broken, games = root.loaded_children
+    assert windows.is_loaded and games.is_loaded
+    assert not broken.is_loaded
+
+
+def test_entries_are_not_loaded_without_preloading():
+    root = _make_lazy_tree()
+    prompt = ScriptedAsyncPrompt(['Games', 'Chess'])
+
+    assert run(AsyncMenu(root, prompt, preload=False).choose_value()) == (
+        'chess')
+    windows, broken, games = root.loaded_children
+    assert not windows.is_loaded and games.is_loaded
+
+
+def test_async_choose_flat_value():
+    root = LazyDictMenuEntry('root', OrderedDict([
+        ('Windows', lambda: {'Terminal': 'terminal'}),
+        ('Games', {'Chess': 'chess'})]))
+    prompt = ScriptedAsyncPrompt(['Games/Chess'])
+
+    assert run(AsyncMenu(root, prompt).choose_flat_value()) == 'chess'
+    assert prompt.prompted == [['Windows/Terminal', 'Games/Chess']]
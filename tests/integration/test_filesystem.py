@@ -0,0 +1,352 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+
+import pytest
+
+import pymenu
+from pymenu import FileSystemMenuEntry
+from pymenu.compact import CompactFileSystemTree
+from pymenu.filters import KEEP_SYMLINKS, SKIP_SYMLINKS, PathFilter
+from pymenu.scan import ParallelScanner
+
+
+@pytest.fixture
+def file_tree(tmpdir):
+    """
+    Make a small directory structure.
+
+    Returns:
+        str: Path to the root of the tree.
+    """
+    tmpdir.join('some_file').write('')
+    tmpdir.mkdir('empty')
+    folder = tmpdir.mkdir('folder')
+    folder.join('deepfile').write('')
+    subfolder = folder.mkdir('subfolder')
+    subfolder.join('deeperfile').write('')
+    return str(tmpdir)
+
+
+def _names(entries):
+    return sorted(os.path.basename(entry.name) for entry in entries)
+
+
+def test_eager_filesystem_entry(file_tree):
+    root = FileSystemMenuEntry(file_tree)
+
+    assert _names(root.children) == ['empty', 'folder', 'some_file']
+    assert _names(root.descendants) == ['deeperfile', 'deepfile', 'empty',
+                                        'folder', 'some_file', 'subfolder']
+
+
+def test_lazy_filesystem_entry_lists_on_demand(file_tree):
+    root = FileSystemMenuEntry(file_tree, lazy=True)
+
+    assert not root.is_loaded
+    assert not root.is_leaf
+
+    children = {os.path.basename(child.name): child
+                for child in root.children}
+
+    assert root.is_loaded
+    assert not children['folder'].is_loaded
+    assert not children['folder'].is_leaf
+    assert children['some_file'].is_leaf
+    assert _names(children['folder'].children) == ['deepfile', 'subfolder']
+
+
+def test_filesystem_children_are_streamed(file_tree):
+    lazy_root = FileSystemMenuEntry(file_tree, lazy=True)
+    children = lazy_root.iter_children()
+    first = next(children)
+
+    assert lazy_root.loaded_children == (first,)
+    children.close()
+    assert _names(lazy_root.children) == ['empty', 'folder', 'some_file']
+
+    root = FileSystemMenuEntry(file_tree)
+
+    assert (_names(root.iter_children())
+            == ['empty', 'folder', 'some_file'])
+    assert _names(root.descendants) == ['deeperfile', 'deepfile', 'empty',
+                                        'folder', 'some_file', 'subfolder']
+
+
+def test_lazy_filesystem_entry_unloads_left_levels(file_tree):
+    root = FileSystemMenuEntry(file_tree, lazy=True, max_loaded=2)
+    children = {os.path.basename(child.name): child
+                for child in root.children}
+    folder = children['folder']
+    empty = children['empty']
+
+    subfolder = [child for child in folder.children
+                 if not child.is_leaf][0]
+    assert _names(subfolder.children) == ['deeperfile']
+    # The visited entry and its ancestors are never unloaded
+    assert root.is_loaded and folder.is_loaded and subfolder.is_loaded
+
+    empty.children
+    assert root.is_loaded and empty.is_loaded
+    assert not folder.is_loaded
+    assert not subfolder.is_loaded
+
+    # Unloaded entries are loaded again when visited
+    assert _names(folder.children) == ['deepfile', 'subfolder']
+
+
+def test_filesystem_flat_choices(file_tree):
+    root = FileSystemMenuEntry(file_tree, lazy=True)
+
+    assert sorted(root.flat_choices()) == ['empty',
+                                           'folder/deepfile',
+                                           'folder/subfolder/deeperfile',
+                                           'some_file']
+
+
+def test_compact_filesystem_tree(file_tree):
+    root = CompactFileSystemTree.from_directory(file_tree).root
+    folder = [child for child in root.children
+              if child.name.endswith('folder')][0]
+
+    assert _names(root.children) == ['empty', 'folder', 'some_file']
+    assert folder.value == os.path.join(file_tree, 'folder')
+    assert folder.parent == root
+    assert _names(folder.children) == ['deepfile', 'subfolder']
+    assert sorted(root.flat_choices()) == sorted(
+        FileSystemMenuEntry(file_tree).flat_choices())
+
+
+def test_filesystem_entry_status(file_tree):
+    root = FileSystemMenuEntry(file_tree)
+    some_file = [child for child in root.children
+                 if child.name.endswith('some_file')][0]
+    some_file_path = os.path.join(file_tree, 'some_file')
+    with open(some_file_path, 'w') as opened:
+        opened.write('content')
+
+    assert not some_file.is_directory
+    assert not some_file.is_symlink
+    assert some_file.size == len('content')
+    assert some_file.mtime == os.stat(some_file_path).st_mtime
+
+
+def _describe(entry):
+    return sorted((descendant.value, descendant.is_directory)
+                  for descendant in entry.descendants)
+
+
+@pytest.mark.parametrize('max_workers', [1, 4])
+def test_parallel_scan(file_tree, max_workers):
+    scanner = ParallelScanner(max_workers=max_workers)
+    root = scanner.scan(file_tree)
+
+    assert _describe(root) == _describe(FileSystemMenuEntry(file_tree))
+    assert all(entry.is_loaded for entry in root.descendants)
+    assert scanner.report.directories == 4
+    assert scanner.report.entries == 7
+
+
+def test_parallel_scan_errors(tmpdir):
+    with pytest.raises(OSError):
+        ParallelScanner().scan(str(tmpdir.join('missing')))
+
+
+@pytest.fixture
+def source_tree(tmpdir):
+    """
+    Make a directory structure such as a source checkout.
+
+    Returns:
+        str: Path to the root of the tree.
+    """
+    tmpdir.mkdir('.git').join('HEAD').write('')
+    package = tmpdir.mkdir('package')
+    package.join('module.py').write('')
+    package.join('module.pyc').write('')
+    package.mkdir('__pycache__').join('module.pyc').write('')
+    package.mkdir('deeper').mkdir('deepest').join('data').write('')
+    tmpdir.join('README').write('')
+    os.symlink(str(package), str(tmpdir.join('link')))
+    return str(tmpdir)
+
+
+def _relative_paths(root):
+    return sorted(os.path.relpath(entry.value, root.value)
+                  for entry in root.descendants)
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_filtered_filesystem_entry(source_tree, lazy):
+    path_filter = PathFilter(ignore=['__pycache__/', '*.pyc', 'deeper/'],
+                             include_hidden=False,
+                             symlinks=SKIP_SYMLINKS)
+    root = FileSystemMenuEntry(source_tree, lazy=lazy,
+                               path_filter=path_filter)
+
+    assert _relative_paths(root) == ['README',
+                                     'package',
+                                     os.path.join('package', 'module.py')]
+
+
+def test_excluded_directories_are_not_listed(source_tree, monkeypatch):
+    listed = []
+    scandir = pymenu._scandir
+
+    def spying_scandir(path):
+        listed.append(os.path.relpath(path, source_tree))
+        return scandir(path)
+
+    monkeypatch.setattr(pymenu, '_scandir', spying_scandir)
+    FileSystemMenuEntry(source_tree,
+                        path_filter=PathFilter(max_depth=2,
+                                               include_hidden=False,
+                                               symlinks=KEEP_SYMLINKS,
+                                               predicate=_not_cache))
+
+    assert sorted(listed) == ['.', 'package']
+
+
+def _not_cache(dir_entry):
+    return dir_entry.name != '__pycache__'
+
+
+def test_filtered_parallel_scan(source_tree):
+    path_filter = PathFilter(max_depth=1, symlinks=KEEP_SYMLINKS)
+    root = ParallelScanner(path_filter=path_filter).scan(source_tree)
+    link = [child for child in root.children
+            if child.name.endswith('link')][0]
+
+    assert _relative_paths(root) == ['.git', 'README', 'link', 'package']
+    assert link.is_leaf
+
+
+@pytest.mark.parametrize('scan', [
+    lambda path, path_filter: FileSystemMenuEntry(path,
+                                                  path_filter=path_filter),
+    lambda path, path_filter: FileSystemMenuEntry(path, lazy=True,
+                                                  path_filter=path_filter),
+    lambda path, path_filter: ParallelScanner(
+        path_filter=path_filter).scan(path),
+])
+def test_root_is_not_listed_at_max_depth_zero(source_tree, scan):
+    root = scan(source_tree, PathFilter(max_depth=0))
+
+    assert root.children == ()
+
+
+@pytest.fixture
+def looping_tree(tmpdir):
+    """
+    Make a directory structure with a link to a parent directory.
+
+    Returns:
+        str: Path to the root of the tree.
+    """
+    folder = tmpdir.mkdir('folder')
+    folder.join('file').write('')
+    os.symlink(str(tmpdir), str(folder.join('loop')))
+    return str(tmpdir)
+
+
+def _looping_tree_paths():
+    return ['folder',
+            os.path.join('folder', 'file'),
+            os.path.join('folder', 'loop')]
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_symlink_loops_are_not_listed(looping_tree, lazy):
+    root = FileSystemMenuEntry(looping_tree, lazy=lazy)
+
+    assert sorted(root.flat_choices()) == ['folder/file', 'folder/loop']
+    assert _relative_paths(root) == _looping_tree_paths()
+
+
+def test_symlink_loops_are_not_scanned(looping_tree):
+    root = ParallelScanner().scan(looping_tree)
+
+    assert _relative_paths(root) == _looping_tree_paths()
+
+
+def test_symlink_loops_in_compact_trees(looping_tree):
+    root = CompactFileSystemTree.from_directory(looping_tree).root
+
+    assert sorted(root.flat_choices()) == ['folder/file', 'folder/loop']
+
+
+class FakeDirEntry(object):
+    def __init__(self, path, device):
+        self.name = os.path.basename(path)
+        self.path = path
+        self._stat = os.stat_result((0o40755, 1, device, 1, 0, 0, 0, 0, 0, 0))
+
+    def is_dir(self):
+        return True
+
+    def is_symlink(self):
+        return False
+
+    def stat(self):
+        return self._stat
+
+
+def test_one_filesystem(tmpdir):
+    root = FileSystemMenuEntry(str(tmpdir), lazy=True)
+    mount = FakeDirEntry(str(tmpdir.join('mount')), root.stat.st_dev + 1)
+
+    assert root._is_new_directory(mount)
+    assert not root._is_new_directory(mount, one_filesystem=True)
+
+
+def test_deep_filesystem_entry(tmpdir):
+    # Deeper paths would exceed the maximum path length of most systems
+    depth = 1500
+    deepest = str(tmpdir)
+    for _ in range(depth):
+        # os.makedirs is recursive
+        deepest = os.path.join(deepest, 'd')
+        os.mkdir(deepest)
+    open(os.path.join(deepest, 'file'), 'w').close()
+
+    try:
+        root = FileSystemMenuEntry(str(tmpdir))
+        leaf, = root.flat_choices().values()
+
+        assert leaf.value == os.path.join(deepest, 'file')
+        assert leaf.depth == depth + 1
+    finally:
+        # pytest removes temporary directories recursively
+        os.remove(os.path.join(deepest, 'file'))
+        for _ in range(depth):
+            os.rmdir(deepest)
+            deepest = os.path.dirname(deepest)
+
+
+def test_renamed_entries_are_labeled_again(file_tree):
+    root = FileSystemMenuEntry(file_tree)
+    assert os.path.join(file_tree, 'empty') in root.labeled_children()
+
+    os.rename(os.path.join(file_tree, 'empty'),
+              os.path.join(file_tree, 'renamed'))
+    root.rename_child('empty', 'renamed')
+
+    assert _names(root.labeled_children().values()) == [
+        'folder', 'renamed', 'some_file']
+    assert os.path.join(file_tree, 'renamed') in root.labeled_children()
+
+
+def test_renaming_onto_an_existing_path_replaces_it(file_tree):
+    root = FileSystemMenuEntry(file_tree)
+    folder = root.get_child('folder')
+
+    # Replaces the empty directory
+    os.rename(os.path.join(file_tree, 'folder'),
+              os.path.join(file_tree, 'empty'))
+
+    assert root.rename_child('folder', 'empty') is folder
+    assert _names(root.labeled_children().values()) == [
+        'empty', 'some_file']
+    assert root.get_child('empty') is folder
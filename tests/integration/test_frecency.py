@@ -0,0 +1,121 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import time
+
+from pymenu import Menu
+from pymenu.frecency import FrecencyStore
+
+from tests.unit.test_menu import ScriptedPrompt, _make_tree
+
+
+def test_uses_are_persisted(tmpdir):
+    path = str(tmpdir.join('pymenu', 'frecency.log'))
+    store = FrecencyStore(path)
+    store.record('vim', 10)
+    store.record('emacs', 20)
+    store.close()
+
+    reloaded = FrecencyStore(path)
+
+    assert reloaded.wait_until_loaded(5)
+    assert reloaded.rank('emacs') > reloaded.rank('vim')
+    reloaded.close()
+
+
+def test_log_is_compacted(tmpdir):
+    log = tmpdir.join('frecency.log')
+    store = FrecencyStore(str(log))
+    for when in range(500):
+        store.record('vim', when)
+    store.record('emacs', 0)
+    store.close()
+    expected = store.score('vim', now=500)
+
+    reloaded = FrecencyStore(str(log))
+    reloaded.wait_until_loaded(5)
+    reloaded.close()
+
+    assert len(log.readlines()) == 2
+    assert abs(reloaded.score('vim', now=500) - expected) < 1e-6
+    assert FrecencyStore(str(log)).wait_until_loaded(5)
+
+
+def test_interrupted_writes_are_ignored(tmpdir):
+    log = tmpdir.join('frecency.log')
+    log.write('[10, "vim"]\n[20, "em')
+    store = FrecencyStore(str(log))
+    store.wait_until_loaded(5)
+    store.close()
+
+    assert store.score('vim', now=10) == 1
+    assert store.rank('em') == float('-inf')
+
+
+def test_menus_wait_for_the_log_to_be_read(tmpdir, monkeypatch):
+    path = str(tmpdir.join('frecency.log'))
+    root = _make_tree()
+    store = FrecencyStore(path)
+    store.record(root.children[-1].usage_key, 10)
+    store.close()
+    load = FrecencyStore._load
+
+    def slow_load(self):
+        time.sleep(0.1)
+        load(self)
+
+    monkeypatch.setattr(FrecencyStore, '_load', slow_load)
+    prompt = ScriptedPrompt(['Games', 'Chess'])
+    menu = Menu(root, prompt,
+                frecency=FrecencyStore(path, load_timeout=5))
+
+    assert menu.choose_value() == 'chess'
+    assert prompt.prompted[0] == ['Games', 'Development']
+
+
+def test_malformed_records_are_ignored(tmpdir):
+    log = tmpdir.join('frecency.log')
+    log.write('[1]\n{}\n3\nnull\n[true, "a"]\n[1, 2]\n[[1], "b"]\n'
+              '{"c": 1, "d": 2}\n[NaN, "e"]\n[10, "vim"]\n')
+    store = FrecencyStore(str(log))
+
+    assert store.wait_until_loaded(5)
+    store.close()
+    assert store.score('vim', now=10) == 1
+    assert all(store.rank(key) == float('-inf') for key in 'abcde')
+
+
+def test_uses_are_ranked_when_they_cannot_be_written(tmpdir, caplog):
+    not_a_directory = tmpdir.join('pymenu')
+    not_a_directory.write('')
+    store = FrecencyStore(str(not_a_directory.join('frecency.log')))
+    store.record('vim', 10)
+    deadline = time.time() + 5
+    while not caplog.records and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert 'Cannot record uses' in caplog.text
+    assert store._worker.is_alive()
+
+    not_a_directory.remove()
+    store.record('emacs', 20)
+    store.close()
+    assert store.rank('emacs') > store.rank('vim') > float('-inf')
+    assert not_a_directory.join('frecency.log').read() == '[20, "emacs"]\n'
+
+
+def test_ranking_waits_for_the_log_to_be_read(tmpdir, monkeypatch):
+    path = str(tmpdir.join('frecency.log'))
+    store = FrecencyStore(path)
+    store.record('vim', 10)
+    store.close()
+    load = FrecencyStore._load
+
+    def slow_load(self):
+        time.sleep(0.1)
+        load(self)
+
+    monkeypatch.setattr(FrecencyStore, '_load', slow_load)
+
+    assert FrecencyStore(path, load_timeout=5).rank('vim') > float('-inf')
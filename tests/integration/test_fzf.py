@@ -0,0 +1,95 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import pty
+import select
+import threading
+import time
+
+import pytest
+
+from pymenu import DictMenuEntry, Menu
+from pymenu.fzf import FzfError, FzfPrompt
+
+
+def _find_executable(name):
+    for directory in os.environ.get('PATH', '').split(os.pathsep):
+        path = os.path.join(directory, name)
+        if os.access(path, os.X_OK):
+            return path
+    return None
+
+
+requires_fzf = pytest.mark.skipif(_find_executable('fzf') is None,
+                                  reason='fzf is not installed')
+
+
+class Terminal(object):
+    def __init__(self):
+        """
+        A pseudo terminal for fzf, where a user types.
+        """
+        self._master, self._slave = pty.openpty()
+        self.name = os.ttyname(self._slave)
+        self._closed = threading.Event()
+        self._reader = threading.Thread(target=self._drain)
+        self._reader.daemon = True
+        self._reader.start()
+
+    def type(self, *keys):
+        for key in keys:
+            # fzf filters asynchronously
+            time.sleep(0.3)
+            os.write(self._master, key.encode('utf8'))
+
+    def close(self):
+        self._closed.set()
+        self._reader.join()
+        os.close(self._master)
+        os.close(self._slave)
+
+    def _drain(self):
+        # fzf blocks when what it displays is not read
+        while not self._closed.is_set():
+            if select.select([self._master], [], [], 0.05)[0]:
+                os.read(self._master, 65536)
+
+
+@pytest.fixture
+def terminal():
+    terminal = Terminal()
+    yield terminal
+    terminal.close()
+
+
+def _answer(terminal, *keys):
+    thread = threading.Thread(target=terminal.type, args=keys)
+    thread.daemon = True
+    thread.start()
+    return thread
+
+
+@requires_fzf
+def test_fzf_prompt_across_levels(terminal):
+    root = DictMenuEntry('root', {'Development': {'Vim': 'vim',
+                                                  'Emacs': 'emacs'},
+                                  'Games': {'Chess': 'chess'}})
+    prompt = FzfPrompt(options=['--tty-default={!s}'.format(terminal.name)])
+    _answer(terminal, 'dev', '\r', 'emac', '\r', '\x1b')
+
+    try:
+        assert Menu(root, prompt).choose_value() == 'emacs'
+        fzf = prompt._process
+        assert prompt.prompt_for_one(iter(['a', 'b'])) is None
+        assert prompt._process is fzf
+    finally:
+        prompt.close()
+
+
+def test_missing_fzf(tmpdir):
+    prompt = FzfPrompt(fzf=str(tmpdir.join('missing')))
+
+    with pytest.raises(FzfError):
+        prompt.prompt_for_one(['vim'])
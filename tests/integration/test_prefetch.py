@@ -0,0 +1,103 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import threading
+import time
+
+from pymenu import LazyMenuEntry, Menu
+from pymenu.frecency import FrecencyStore
+from pymenu.prefetch import Prefetcher
+
+from tests.unit.test_menu import ScriptedPrompt
+from tests.unit.test_prefetch import _make_lazy_tree
+
+
+class WaitingPrompt(ScriptedPrompt):
+    def __init__(self, answers, loaded):
+        """
+        Answer once some entries are loaded.
+
+        Args:
+            answers (list): The successive choices.
+            loaded (Callable[[], bool]): Whether the expected entries are
+                loaded.
+        """
+        super(WaitingPrompt, self).__init__(answers)
+        self._loaded = loaded
+
+    def prompt_for_one(self, choices):
+        deadline = time.time() + 5
+        while not self._loaded() and time.time() < deadline:
+            time.sleep(0.001)
+        return super(WaitingPrompt, self).prompt_for_one(choices)
+
+
+def test_listed_entries_are_loaded_while_prompting():
+    root = _make_lazy_tree()
+    windows, broken, games = root.children
+    prefetcher = Prefetcher()
+    prompt = WaitingPrompt(['Games', 'Chess'],
+                           lambda: windows.is_loaded and games.is_loaded)
+
+    try:
+        assert Menu(root, prompt, prefetcher=prefetcher).choose_value() == (
+            'chess')
+    finally:
+        prefetcher.close()
+    assert windows.is_loaded and not broken.is_loaded
+
+
+def test_most_frecent_entries_are_loaded_first():
+    root = _make_lazy_tree()
+    windows, broken, games = root.children
+    frecency = FrecencyStore()
+    frecency.record(games.usage_key)
+    prefetcher = Prefetcher(limit=1)
+    prompt = WaitingPrompt(['Games', 'Chess'], lambda: games.is_loaded)
+
+    try:
+        Menu(root, prompt, frecency=frecency,
+             prefetcher=prefetcher).choose_value()
+    finally:
+        prefetcher.close()
+    assert games.is_loaded and not windows.is_loaded
+
+
+class BlockingMenuEntry(LazyMenuEntry):
+    def __init__(self, name, loading, release):
+        """
+        A lazy entry whose loading waits to be released.
+
+        Args:
+            loading (threading.Event): Set once loading started.
+            release (threading.Event): Ends loading when set.
+        """
+        super(BlockingMenuEntry, self).__init__(name)
+        self._loading = loading
+        self._release = release
+
+    def _load_children(self):
+        self._loading.set()
+        self._release.wait(5)
+        return []
+
+
+def test_jobs_are_stopped_without_waiting_for_other_jobs():
+    loading = threading.Event()
+    release = threading.Event()
+    prefetcher = Prefetcher()
+    try:
+        running = prefetcher.prefetch(
+            [BlockingMenuEntry('other menu', loading, release)])
+        assert loading.wait(5)
+        waiting = prefetcher.prefetch(_make_lazy_tree().children)
+
+        started = time.time()
+        waiting.stop()
+        assert time.time() - started < 1
+        assert not running._done.is_set()
+    finally:
+        release.set()
+        prefetcher.close()
+    assert not any(entry.is_loaded for entry in waiting._entries)
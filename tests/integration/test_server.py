@@ -0,0 +1,169 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+import pymenu.client
+from pymenu import DictMenuEntry, Prompt
+from pymenu.cli import main
+from pymenu.client import PromptCancelled
+from pymenu.server import MenuServer, ServerError, request_value
+
+
+class ScriptedPrompt(Prompt):
+    def __init__(self, answers):
+        """
+        Answer prompts from a list instead of asking a user.
+
+        Args:
+            answers (list): The successive choices.
+        """
+        self._answers = list(answers)
+
+    def prompt_for_one(self, choices):
+        answer = self._answers.pop(0)
+        assert answer in list(choices)
+        return answer
+
+
+class CancelledPrompt(Prompt):
+    def prompt_for_one(self, choices):
+        return None
+
+
+@pytest.fixture
+def server(tmpdir):
+    menu_server = MenuServer(socket_path=str(tmpdir.join('pymenu.sock')))
+    builds = []
+
+    def factory():
+        builds.append(len(builds))
+        return DictMenuEntry('root', {'tools': {'vim': 'vim-value'},
+                                      'build': len(builds)})
+
+    menu_server.register('main', factory,
+                         prompt=ScriptedPrompt(['tools', 'vim',
+                                                'build', 'build']))
+    menu_server.register('cancelled',
+                         lambda: DictMenuEntry('root', {'vim': 'vim-value'}),
+                         prompt=CancelledPrompt())
+    thread = threading.Thread(target=menu_server.serve_forever)
+    thread.start()
+    for _ in range(100):
+        if tmpdir.join('pymenu.sock').check():
+            break
+        time.sleep(0.01)
+    yield menu_server
+    menu_server.shutdown()
+    thread.join()
+
+
+def test_request_value(server):
+    assert request_value('main', server.socket_path) == 'vim-value'
+
+
+def test_refresh(server):
+    assert request_value('main', server.socket_path) == 'vim-value'
+    assert request_value('main', server.socket_path) == 1
+    request_value('main', server.socket_path, command='refresh')
+    assert request_value('main', server.socket_path) == 2
+
+
+def test_unknown_menu(server):
+    with pytest.raises(ServerError):
+        request_value('unknown', server.socket_path)
+
+
+def test_cli(server, capsys):
+    assert main(['main', '--socket', server.socket_path]) == 0
+    assert capsys.readouterr().out == 'vim-value\n'
+
+
+def test_cancelled_prompt(server, capsys):
+    with pytest.raises(PromptCancelled):
+        request_value('cancelled', server.socket_path)
+    assert main(['cancelled', '--socket', server.socket_path]) == 1
+    assert capsys.readouterr() == ('', '')
+
+
+def test_client_runs_without_the_package_dependencies(server):
+    # Without site-packages, neither anytree nor six can be imported
+    client = pymenu.client.__file__.replace('.pyc', '.py')
+    output = subprocess.check_output([sys.executable, '-S', client, 'main',
+                                      '--socket', server.socket_path])
+
+    assert output == b'vim-value\n'
+
+
+def test_running_server_is_not_replaced(server):
+    with pytest.raises(ServerError):
+        MenuServer(socket_path=server.socket_path).serve_forever()
+    assert request_value('main', server.socket_path) == 'vim-value'
+
+
+def test_other_files_are_not_replaced(tmpdir):
+    path = tmpdir.join('pymenu.sock')
+    path.write('data')
+
+    with pytest.raises(ServerError):
+        MenuServer(socket_path=str(path)).serve_forever()
+    assert path.read() == 'data'
+
+
+def test_stale_socket_is_replaced(tmpdir):
+    path = str(tmpdir.join('pymenu.sock'))
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()
+    menu_server = MenuServer(socket_path=path)
+    menu_server.register('main', lambda: DictMenuEntry('root', {}),
+                         prompt=ScriptedPrompt([]))
+    thread = threading.Thread(target=menu_server.serve_forever)
+    thread.start()
+    try:
+        with pytest.raises(ServerError):
+            # Served by the new server, once it replaced the stale socket
+            deadline = time.time() + 5
+            while time.time() < deadline:
+                try:
+                    request_value('unknown', path)
+                except OSError:
+                    time.sleep(0.01)
+    finally:
+        menu_server.shutdown()
+        thread.join()
+    assert not os.path.exists(path)
+
+
+def test_periodic_refresh_survives_errors(tmpdir, caplog):
+    menu_server = MenuServer(socket_path=str(tmpdir.join('pymenu.sock')),
+                             refresh_interval=0.01)
+    builds = []
+
+    def factory():
+        builds.append(len(builds))
+        if len(builds) == 2:
+            raise IOError('The .menu file is missing')
+        return DictMenuEntry('root', {'build': len(builds)})
+
+    menu_server.register('main', factory, prompt=ScriptedPrompt(['build']))
+    thread = threading.Thread(target=menu_server.serve_forever)
+    thread.start()
+    try:
+        deadline = time.time() + 5
+        while len(builds) < 4 and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        menu_server.shutdown()
+        thread.join()
+
+    assert len(builds) >= 4
+    assert 'Cannot refresh' in caplog.text
@@ -0,0 +1,141 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import signal
+import subprocess
+import threading
+
+import pytest
+
+from pymenu.spawn import Spawner, spawn
+
+
+def test_spawn():
+    process = spawn(['sh', '-c', 'exit 3'])
+
+    assert process.pid > 0
+    assert process.wait() == 3
+    assert process.returncode == 3
+    assert spawn(['sh', '-c', 'kill -9 $$']).wait() == -9
+
+
+def test_spawn_with_popen_arguments():
+    process = spawn(['sh', '-c', 'echo $GREETING'], stdout=subprocess.PIPE,
+                    env={'GREETING': 'hello'})
+
+    assert process.wait() == 0
+    assert process._popen.stdout.read() == b'hello\n'
+    process._popen.stdout.close()
+
+
+@pytest.mark.skipif(not os.path.exists('/proc/self/status'),
+                    reason='Needs the proc filesystem')
+def test_spawned_processes_do_not_ignore_sigpipe(tmpdir):
+    # Python ignores SIGPIPE, which must not be inherited
+    status = tmpdir.join('status')
+    script = 'grep SigIgn /proc/$$/status > {!s}'.format(status)
+
+    assert spawn(['sh', '-c', script]).wait() == 0
+    ignored = int(status.read().split()[1], 16)
+    assert not ignored & (1 << (signal.SIGPIPE - 1))
+
+
+def test_wait_timeout():
+    process = spawn(['sleep', '5'])
+
+    assert process.wait(timeout=0.05) is None
+    os.kill(process.pid, 9)
+    assert process.wait() == -9
+
+
+def test_missing_command():
+    with pytest.raises(OSError):
+        spawn(['/missing/command'])
+
+    process = Spawner().spawn(['/missing/command'])
+
+    with pytest.raises(OSError):
+        process.wait()
+    assert process.poll() is None
+
+
+def test_spawner_reaps_processes():
+    spawner = Spawner(max_workers=2)
+    processes = [spawner.spawn(['true']) for _ in range(20)]
+    spawner.close()
+    for process in processes:
+        process._exited.wait(5)
+
+    assert [process.returncode for process in processes] == [0] * 20
+
+
+def test_processes_are_reaped_by_a_single_thread():
+    threads = threading.active_count()
+    spawner = Spawner(max_workers=2)
+    processes = [spawner.spawn(['sleep', '0.5']) for _ in range(50)]
+    spawner.close()
+
+    assert all(process.wait_started(5) for process in processes)
+    assert threading.active_count() <= threads + 1
+    assert [process.wait(5) for process in processes] == [0] * 50
+
+
+def test_processes_are_reaped_without_pidfds(monkeypatch):
+    monkeypatch.delattr(os, 'pidfd_open', raising=False)
+    spawner = Spawner()
+    processes = [spawner.spawn(['sleep', '0.1']) for _ in range(5)]
+    spawner.close()
+
+    assert [process.wait(5) for process in processes] == [0] * 5
+
+
+@pytest.mark.parametrize('popen_kwargs', [{}, {'cwd': '/'}])
+def test_wait_when_sigchld_is_ignored(popen_kwargs):
+    # Exited processes are then reaped by the system, without a status
+    previous = signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    try:
+        process = Spawner().spawn(['true'], **popen_kwargs)
+
+        assert process.wait(5) == 0
+    finally:
+        signal.signal(signal.SIGCHLD, previous)
+
+
+@pytest.mark.skipif(not hasattr(os, 'pidfd_open'),
+                    reason='Processes are polled without pidfds')
+def test_processes_are_reaped_without_polling(monkeypatch):
+    waits = []
+    waitpid = os.waitpid
+
+    def spying_waitpid(pid, options):
+        waits.append(options)
+        return waitpid(pid, options)
+
+    monkeypatch.setattr(os, 'waitpid', spying_waitpid)
+    spawner = Spawner()
+    process = spawner.spawn(['sleep', '0.2'])
+    spawner.close()
+
+    assert process._exited.wait(5)
+    assert process.returncode == 0
+    assert process.wait() == 0
+    # A single blocking call when waiting for the process ID
+    assert waits in ([], [0])
+
+
+def test_spawner_without_reaping():
+    spawner = Spawner(reap=False)
+    process = spawner.spawn(['true'])
+    spawner.close()
+
+    assert process.wait_started(timeout=5)
+    assert process.returncode is None
+    assert not process._watched
+    assert process.wait() == 0
+
+
+def test_spawner_needs_workers():
+    with pytest.raises(ValueError):
+        Spawner(max_workers=0)
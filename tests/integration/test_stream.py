@@ -0,0 +1,23 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import json
+
+from pymenu.stream import FileValue, load_json_menu
+
+
+def test_values_are_read_from_the_file(tmpdir):
+    path = tmpdir.join('menu.json')
+    path.write(json.dumps({'Editors': {'Vim': 'vim "file"', 'Size': 3},
+                           'Tools': ['make', 'cmake']}))
+
+    root = load_json_menu(str(path), offsets=True, chunk_size=5)
+    editors, tools = root.children
+    vim, size = editors.children
+
+    assert root.name == 'menu.json'
+    assert isinstance(vim._value, FileValue)
+    assert vim.value == 'vim "file"'
+    assert size.value == 3
+    assert tools.value == ['make', 'cmake']
@@ -0,0 +1,35 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+
+import pytest
+
+from pymenu import FileSystemMenuEntry
+from pymenu.watch import PollingFileSystemWatcher
+
+
+def _names(entry):
+    return sorted(os.path.basename(child.name)
+                  for child in entry.loaded_children)
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_polling_watcher(tmpdir, lazy):
+    tmpdir.join('kept').write('')
+    tmpdir.join('removed').write('')
+    root = FileSystemMenuEntry(str(tmpdir), lazy=lazy)
+    kept = [child for child in root.children
+            if child.name.endswith('kept')][0]
+    watcher = PollingFileSystemWatcher(root)
+
+    assert watcher.poll() == []
+
+    tmpdir.join('removed').remove()
+    tmpdir.join('added').write('')
+    os.utime(str(tmpdir), (0, 0))
+
+    assert watcher.poll() == [root]
+    assert _names(root) == ['added', 'kept']
+    assert kept in root.children
@@ -0,0 +1,50 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import gc
+
+import pytest
+
+from pymenu import MenuEntry
+from pymenu.compact import CompactTree
+
+# Not available in Python 2
+tracemalloc = pytest.importorskip('tracemalloc')
+
+
+#: How many times less memory a compact tree must use.
+MEMORY_RATIO = 4
+
+
+def _make_wide_tree(directories=100, files=100):
+    root = MenuEntry('root')
+    for directory in range(directories):
+        parent = MenuEntry('directory_{:d}'.format(directory), parent=root)
+        for leaf in range(files):
+            MenuEntry('file_{:d}.txt'.format(leaf),
+                      value=leaf,
+                      parent=parent)
+    return root
+
+
+def _allocated(factory):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = factory()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, size
+
+
+def test_compact_tree_memory():
+    original, original_size = _allocated(_make_wide_tree)
+    # anytree allocates the children list of leaves when first read
+    CompactTree.from_entry(original)
+    compact, compact_size = _allocated(
+        lambda: CompactTree.from_entry(original))
+
+    assert len(compact) == 100 * 100 + 100 + 1
+    assert compact_size * MEMORY_RATIO < original_size
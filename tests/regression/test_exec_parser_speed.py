@@ -0,0 +1,22 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import timeit
+
+from pymenu.ext.pyxdg import exec_parser, tatsu_exec_parser
+
+
+EXEC_STRING = r'"a a" b "c \" 3" --flag %U'
+
+
+def test_exec_parser_is_an_order_of_magnitude_faster():
+    """
+    The single-pass tokenizer must stay much faster than the PEG parser.
+    """
+    fast = min(timeit.repeat(lambda: exec_parser(EXEC_STRING),
+                             number=100, repeat=3))
+    slow = min(timeit.repeat(lambda: tatsu_exec_parser(EXEC_STRING),
+                             number=100, repeat=3))
+
+    assert fast * 10 < slow
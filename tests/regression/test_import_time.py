@@ -0,0 +1,31 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import subprocess
+import sys
+import timeit
+
+
+#: Maximum time, in seconds, that ``import pymenu`` may add to the startup
+#: of a Python interpreter.
+IMPORT_BUDGET = 0.1
+
+
+def _startup_time(statement):
+    def run():
+        subprocess.check_call([sys.executable, '-c', statement])
+    return min(timeit.repeat(run, number=1, repeat=5))
+
+
+def test_import_does_not_load_pkg_resources():
+    statement = ('import sys, pymenu; '
+                 'sys.exit("pkg_resources" in sys.modules)')
+    subprocess.check_call([sys.executable, '-c', statement])
+
+
+def test_import_time_is_within_budget():
+    baseline = _startup_time('pass')
+    with_pymenu = _startup_time('import pymenu')
+
+    assert with_pymenu - baseline < IMPORT_BUDGET
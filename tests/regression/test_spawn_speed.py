@@ -0,0 +1,31 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import subprocess
+import time
+
+from pymenu.spawn import Spawner
+
+
+LAUNCHES = 200
+
+
+def test_spawner_returns_before_processes_are_started():
+    """
+    Launching many processes must not block the caller.
+    """
+    started = time.time()
+    processes = [subprocess.Popen(['true']) for _ in range(LAUNCHES)]
+    serial = time.time() - started
+    for process in processes:
+        process.wait()
+
+    spawner = Spawner()
+    started = time.time()
+    processes = [spawner.spawn(['true']) for _ in range(LAUNCHES)]
+    queued = time.time() - started
+    spawner.close()
+
+    assert [process.wait() for process in processes] == [0] * LAUNCHES
+    assert queued < serial / 2
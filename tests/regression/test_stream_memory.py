@@ -0,0 +1,52 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import gc
+import io
+import json
+
+import pytest
+
+from pymenu import DictMenuEntry
+from pymenu.stream import load_json_menu
+
+# Not available in Python 2
+tracemalloc = pytest.importorskip('tracemalloc')
+
+
+#: How many times less memory streaming with offsets must need at its peak.
+MEMORY_RATIO = 4
+
+
+def _peak(factory):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        factory()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _write_document(path, menus=20, leaves=100):
+    document = {'menu_{:d}'.format(menu): {
+        'leaf_{:d}'.format(leaf): 'x' * 2000 for leaf in range(leaves)}
+        for menu in range(menus)}
+    with io.open(path, 'w', encoding='utf8') as opened:
+        json.dump(document, opened)
+
+
+def _load_dict_menu(path):
+    with io.open(path, encoding='utf8') as opened:
+        return DictMenuEntry('root', json.load(opened))
+
+
+def test_streamed_menu_peak_memory(tmpdir):
+    path = str(tmpdir.join('menu.json'))
+    _write_document(path)
+
+    loaded_peak = _peak(lambda: _load_dict_menu(path))
+    streamed_peak = _peak(lambda: load_json_menu(path, offsets=True))
+
+    assert streamed_peak * MEMORY_RATIO < loaded_peak
@@ -0,0 +1,33 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import io
+import json
+import timeit
+
+from pymenu.stream import iter_json_events
+
+
+#: How many times slower parsing a long string in small chunks may be than
+#: parsing it at once.  Scanning the string again for every chunk made it
+#: hundreds of times slower.
+SPEED_RATIO = 5
+
+STRING_SIZE = 4 * 1024 * 1024
+
+
+def _parse(data, chunk_size):
+    return list(iter_json_events(io.BytesIO(data), chunk_size=chunk_size))
+
+
+def test_long_strings_are_scanned_once():
+    data = json.dumps({'long': 'x' * STRING_SIZE}).encode('utf8')
+    assert _parse(data, 4096) == _parse(data, len(data))
+
+    chunked = min(timeit.repeat(lambda: _parse(data, 4096),
+                                number=1, repeat=3))
+    whole = min(timeit.repeat(lambda: _parse(data, len(data)),
+                              number=1, repeat=3))
+
+    assert chunked < whole * SPEED_RATIO
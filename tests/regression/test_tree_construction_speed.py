@@ -0,0 +1,45 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import timeit
+
+import six
+
+from pymenu import DictMenuEntry, MenuEntry, _is_dict
+
+
+class RecursiveDictMenuEntry(MenuEntry):
+    """
+    The previous implementation, which calls its constructor recursively.
+    """
+
+    def __init__(self, name, data, parent=None):
+        menuvalue = data if not _is_dict(data) else None
+        super(RecursiveDictMenuEntry, self).__init__(name,
+                                                     value=menuvalue,
+                                                     parent=parent)
+        try:
+            for key, value in six.iteritems(data):
+                RecursiveDictMenuEntry(key, value, self)
+        except AttributeError:
+            pass
+
+
+def _make_data(width=50, leaves=10):
+    return dict(('menu {:d}'.format(menu),
+                 dict(('submenu {:d}'.format(submenu),
+                       dict(('leaf {:d}'.format(leaf), leaf)
+                            for leaf in range(leaves)))
+                      for submenu in range(width)))
+                for menu in range(width))
+
+
+def test_iterative_construction_is_not_slower():
+    data = _make_data()
+    iterative = min(timeit.repeat(lambda: DictMenuEntry('root', data),
+                                  number=1, repeat=3))
+    recursive = min(timeit.repeat(
+        lambda: RecursiveDictMenuEntry('root', data), number=1, repeat=3))
+
+    assert iterative <= recursive
@@ -2,9 +2,18 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import json
+
 import pytest
 
-from pymenu.ext.pyxdg import exec_parser
+from pymenu.ext.pyxdg import (CachedDesktopEntry, CachedMenu,
+                              CachedMenuEntry, XdgMenuEntry,
+                              _decode_menu, _encode_menu)
+from pymenu.ext.pyxdg import exec_parser, exec_tokenizer, tatsu_exec_parser
+
+
+#: A depth larger than the default recursion limit.
+DEEP = 10000
 
 
 class TestData(object):
@@ -57,3 +66,72 @@ def test_exec_parser(exec_string):
 
     """
     assert exec_parser(exec_string.input) == exec_string.expected
+
+
+def test_exec_tokenizer(exec_string):
+    executable, arguments = exec_string.expected
+    expected = [''.join(executable),
+                [''.join(argument) for argument in arguments]]
+
+    assert exec_tokenizer(exec_string.input) == expected
+
+
+def test_tatsu_exec_parser(exec_string):
+    assert _as_lists(tatsu_exec_parser(exec_string.input)) == \
+        exec_string.expected
+
+
+@pytest.mark.parametrize('malformed', ['', '   ', '"vim', 'vim "arg'])
+def test_exec_tokenizer_malformed(malformed):
+    with pytest.raises(ValueError):
+        exec_tokenizer(malformed)
+
+
+def _as_lists(ast):
+    if isinstance(ast, (list, tuple)):
+        return [_as_lists(node) for node in ast]
+    return ast
+
+
+def test_deep_xdg_menu_entry():
+    menu = CachedMenu('leaf menu', [], [])
+    for depth in range(DEEP):
+        menu = CachedMenu('menu {:d}'.format(depth), [menu], [])
+    entry = XdgMenuEntry(menu)
+
+    while entry.children:
+        entry = entry.children[0]
+
+    assert entry.name == 'leaf menu'
+    assert entry.depth == DEEP
+
+
+def _describe_menu(menu):
+    description = []
+    menus = [(0, menu)]
+    while menus:
+        depth, current = menus.pop()
+        description.append((depth, current.getName(), current.AppDirs))
+        for child in current.getEntries():
+            if isinstance(child, CachedMenu):
+                menus.append((depth + 1, child))
+            else:
+                entry = child.DesktopEntry
+                description.append((depth + 1, entry.getName(),
+                                    entry.getExec(), entry.filename))
+    return description
+
+
+def test_deep_menus_are_encoded_for_caching():
+    menu = CachedMenu('leaf menu', [CachedMenuEntry(
+        CachedDesktopEntry('Vim', 'vim %F', True, 'gvim', '/vim.desktop'))])
+    for depth in range(DEEP):
+        menu = CachedMenu('menu {:d}'.format(depth), [
+            menu,
+            CachedMenuEntry(CachedDesktopEntry('App {:d}'.format(depth),
+                                               'app')),
+        ], ['/apps'])
+
+    decoded = _decode_menu(json.loads(json.dumps(_encode_menu(menu))))
+
+    assert _describe_menu(decoded) == _describe_menu(menu)
@@ -0,0 +1,40 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import io
+
+import pytest
+import yaml
+
+from pymenu import DictMenuEntry
+from pymenu.ext.pyyaml import yaml_events
+from pymenu.stream import menu_from_events
+
+from tests.unit.test_stream import _describe
+
+
+DOCUMENT = """
+Development:
+  Editors:
+    Vim: vim
+    Emacs: emacs -nw
+  Python: 3.6
+  Tools: [make, {cmake: ~}]
+  Empty: {}
+Games:
+  Chess: yes
+  1999: "1999"
+"""
+
+
+def test_streamed_yaml_menu_matches_dict_menu():
+    streamed = menu_from_events('root', yaml_events(io.StringIO(DOCUMENT)))
+
+    assert (_describe(streamed)
+            == _describe(DictMenuEntry('root', yaml.safe_load(DOCUMENT))))
+
+
+def test_aliases_are_rejected():
+    with pytest.raises(ValueError):
+        list(yaml_events(io.StringIO('a: &x 1\nb: *x\n')))
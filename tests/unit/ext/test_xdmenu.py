@@ -0,0 +1,22 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import xdmenu
+
+from pymenu.ext.xdmenu import DmenuPrompt
+
+
+def test_dmenu_prompt_uses_the_configured_runner():
+    calls = []
+
+    def choose_last(cmd, input_lines=None):
+        calls.append((cmd, input_lines))
+        return input_lines[-1:]
+
+    prompt = DmenuPrompt(xdmenu.Dmenu(dmenu='my-dmenu',
+                                      proc_runner=choose_last))
+
+    assert prompt.prompt_for_one(iter(['vim', 'emacs'])) == 'emacs'
+    assert prompt.prompt_for_many(['vim', 'nano']) == ['nano']
+    assert calls[0] == (['my-dmenu'], ['vim', 'emacs'])
@@ -0,0 +1,72 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import asyncio
+
+from pymenu.aio import AsyncMenu, AsyncPrompt
+from pymenu.frecency import FrecencyStore
+
+from tests.unit.test_menu import _make_tree
+
+
+class ScriptedAsyncPrompt(AsyncPrompt):
+    def __init__(self, answers):
+        """
+        Answer prompts from a list instead of asking a user.
+
+        Args:
+            answers (list): The successive choices.
+        """
+        self._answers = list(answers)
+        self.prompted = []
+
+    async def prompt_for_one(self, choices):
+        choices = list(choices)
+        self.prompted.append(choices)
+        answer = self._answers.pop(0)
+        assert answer in choices
+        return answer
+
+    async def prompt_for_many(self, choices):
+        choices = list(choices)
+        self.prompted.append(choices)
+        answers = self._answers.pop(0)
+        assert all(answer in choices for answer in answers)
+        return answers
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_async_choose_value():
+    prompt = ScriptedAsyncPrompt(['Development', '..', 'Development',
+                                  'Editors', 'Vim'])
+    frecency = FrecencyStore()
+    menu = AsyncMenu(_make_tree(), prompt, frecency=frecency)
+
+    assert run(menu.choose_value()) == 'vim'
+    assert prompt.prompted[:2] == [['Development', 'Games'],
+                                   ['..', 'Editors', 'Python']]
+    assert frecency.score('Applications/Development/Editors/Vim') > 0
+
+
+def test_async_choose_menu():
+    prompt = ScriptedAsyncPrompt(['Games'])
+
+    chosen = run(AsyncMenu(_make_tree(), prompt).choose_menu())
+
+    assert isinstance(chosen, AsyncMenu)
+    assert chosen.entry.name == 'Games'
+
+
+def test_async_choose_values():
+    prompt = ScriptedAsyncPrompt([['Development'], ['Python', 'Editors']])
+
+    assert run(AsyncMenu(_make_tree(), prompt).choose_values()) == [
+        'python']
@@ -0,0 +1,62 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from pymenu import Menu
+from pymenu.compact import CompactTree
+
+from tests.unit.test_menu import ScriptedPrompt, _make_tree
+
+
+def test_compact_tree_views():
+    root = CompactTree.from_entry(_make_tree()).root
+    development, games = root.children
+    editors, python = development.children
+
+    assert root.name == 'Applications'
+    assert root.parent is None
+    assert [child.name for child in editors.children] == ['Vim', 'Emacs']
+    assert python.value == 'python'
+    assert python.is_leaf and not editors.is_leaf
+    assert editors.children[0].parent.parent == development
+    assert [entry.name for entry in python.path] == [
+        'Applications', 'Development', 'Python']
+    assert python.usage_key == 'Applications/Development/Python'
+
+
+def test_compact_tree_flat_choices_match_the_original():
+    original = _make_tree()
+    compact = CompactTree.from_entry(original).root
+
+    assert ([(label, entry.value)
+             for label, entry in compact.flat_choices(' > ').items()]
+            == [(label, entry.value)
+                for label, entry in original.flat_choices(' > ').items()])
+
+
+def test_menu_over_a_compact_tree():
+    prompt = ScriptedPrompt(['Development', '..', 'Games', 'Chess'])
+    root = CompactTree.from_entry(_make_tree()).root
+
+    assert Menu(root, prompt).choose_value() == 'chess'
+
+
+def test_names_are_interned():
+    tree = CompactTree('root')
+    tree.add_children([('a', 1), ('b', 2)])
+    tree.add_children([('same', 3)])
+    tree.add_children([('same', 4)])
+
+    assert len(tree) == 5
+    assert len(tree._names) == 4
+    assert [tree.value(index) for index in tree.children(0)] == [1, 2]
+
+
+def test_compact_tree_labeled_children_are_cached():
+    root = CompactTree.from_entry(_make_tree()).root
+    labeled_children = root.labeled_children()
+
+    assert list(labeled_children) == ['Development', 'Games']
+    assert root.labeled_children() is labeled_children
+    assert list(root.iter_labeled_children()) == list(
+        labeled_children.items())
@@ -0,0 +1,39 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import pytest
+
+from pymenu.filters import IgnorePatterns
+
+
+@pytest.mark.parametrize('pattern, path, is_directory, ignored', [
+    ('*.pyc', 'cli.pyc', False, True),
+    ('*.pyc', 'pymenu/ext/cli.pyc', False, True),
+    ('*.pyc', 'cli.py', False, False),
+    ('node_modules/', 'web/node_modules', True, True),
+    ('node_modules/', 'web/node_modules', False, False),
+    ('/build', 'build', True, True),
+    ('/build', 'docs/build', True, False),
+    ('docs/*.html', 'docs/index.html', False, True),
+    ('docs/*.html', 'docs/api/index.html', False, False),
+    ('docs/**/*.html', 'docs/api/index.html', False, True),
+    ('docs/**/*.html', 'docs/index.html', False, True),
+    ('**/cache', 'a/b/cache', True, True),
+    ('logs/**', 'logs/2017/01.log', False, True),
+    ('file?.txt', 'file1.txt', False, True),
+    ('file?.txt', 'file10.txt', False, False),
+    ('file[!0].txt', 'file0.txt', False, False),
+    ('file[!0].txt', 'file1.txt', False, True),
+    ('# comment', '# comment', False, False),
+])
+def test_ignore_patterns(pattern, path, is_directory, ignored):
+    assert IgnorePatterns([pattern]).ignores(path, is_directory) is ignored
+
+
+def test_last_matching_pattern_wins():
+    patterns = IgnorePatterns(['*.log', '!important.log', 'old/'])
+
+    assert patterns.ignores('debug.log', False)
+    assert not patterns.ignores('important.log', False)
+    assert patterns.ignores('old', True)
@@ -0,0 +1,59 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from pymenu import Menu
+from pymenu.frecency import FrecencyStore
+
+from tests.unit.test_menu import ScriptedPrompt, _make_tree
+
+
+DAY = 24 * 60 * 60
+
+
+def test_recent_uses_outweigh_old_ones():
+    store = FrecencyStore(half_life=DAY)
+    now = 100 * DAY
+    store.record('old', now - 10 * DAY)
+    store.record('old', now - 10 * DAY)
+    store.record('recent', now)
+
+    assert store.rank('recent') > store.rank('old')
+    assert store.rank('old') > store.rank('never')
+
+
+def test_score_halves_every_half_life():
+    store = FrecencyStore(half_life=DAY)
+    store.record('vim', 0)
+    store.record('vim', 0)
+
+    assert abs(store.score('vim', now=0) - 2) < 1e-9
+    assert abs(store.score('vim', now=DAY) - 1) < 1e-9
+
+
+def test_chosen_entries_are_listed_first():
+    store = FrecencyStore()
+    root = _make_tree()
+    prompt = ScriptedPrompt(['Games', 'Chess',
+                             'Development', 'Editors', 'Emacs',
+                             'Development', 'Editors', 'Emacs'])
+    menu = Menu(root, prompt, frecency=store)
+
+    assert menu.choose_value() == 'chess'
+    assert menu.choose_value() == 'emacs'
+    assert menu.choose_value() == 'emacs'
+
+    assert prompt.prompted[2] == ['Games', 'Development']
+    assert prompt.prompted[4] == ['..', 'Vim', 'Emacs']
+    assert prompt.prompted[5] == ['Development', 'Games']
+    assert prompt.prompted[7] == ['..', 'Emacs', 'Vim']
+
+
+def test_flat_choices_by_frecency():
+    store = FrecencyStore()
+    prompt = ScriptedPrompt(['Games/Chess', 'Games/Chess'])
+    menu = Menu(_make_tree(), prompt, frecency=store)
+
+    assert menu.choose_flat_value() == 'chess'
+    assert menu.choose_flat_value() == 'chess'
+    assert prompt.prompted[1][0] == 'Games/Chess'
@@ -0,0 +1,393 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from collections import OrderedDict
+
+import pytest
+
+from pymenu import (DictMenuEntry, LazyDictMenuEntry, Menu, MenuEntry, Prompt,
+                    SimpleCommandPrompt)
+from pymenu.frecency import FrecencyStore
+
+
+class ScriptedPrompt(Prompt):
+    def __init__(self, answers):
+        """
+        Answer prompts from a list instead of asking a user.
+
+        Args:
+            answers (list): The successive choices.
+        """
+        self._answers = list(answers)
+        self.prompted = []
+
+    def prompt_for_one(self, choices):
+        choices = list(choices)
+        self.prompted.append(choices)
+        answer = self._answers.pop(0)
+        assert answer in choices
+        return answer
+
+    def prompt_for_many(self, choices):
+        choices = list(choices)
+        self.prompted.append(choices)
+        answers = self._answers.pop(0)
+        assert all(answer in choices for answer in answers)
+        return answers
+
+
+def _make_tree():
+    return DictMenuEntry('Applications', OrderedDict([
+        ('Development', OrderedDict([
+            ('Editors', OrderedDict([('Vim', 'vim'), ('Emacs', 'emacs')])),
+            ('Python', 'python')])),
+        ('Games', OrderedDict([('Chess', 'chess')]))]))
+
+
+def test_choose_value():
+    prompt = ScriptedPrompt(['Development', 'Editors', 'Vim'])
+
+    assert Menu(_make_tree(), prompt).choose_value() == 'vim'
+
+
+def test_choose_flat_value():
+    prompt = ScriptedPrompt(['Development/Editors/Emacs'])
+
+    assert Menu(_make_tree(), prompt).choose_flat_value() == 'emacs'
+    assert prompt.prompted == [['Development/Editors/Vim',
+                                'Development/Editors/Emacs',
+                                'Development/Python',
+                                'Games/Chess']]
+
+
+def test_flat_choices_are_cached_until_the_tree_changes():
+    root = _make_tree()
+    choices = root.flat_choices()
+
+    assert root.flat_choices() is choices
+
+    games = root.children[1]
+    MenuEntry('Go', value='go', parent=games)
+    choices = root.flat_choices()
+
+    assert choices['Games/Go'].value == 'go'
+    assert root.flat_choices() is choices
+
+
+def test_flat_choices_are_kept_when_other_trees_change():
+    root = _make_tree()
+    choices = root.flat_choices()
+    _make_tree()
+
+    assert root.flat_choices() is choices
+
+    chess = root.children[1].children[0]
+    MenuEntry('Rules', value='rules', parent=chess)
+
+    assert root.flat_choices() is not choices
+    assert list(root.flat_choices())[-1] == 'Games/Chess/Rules'
+    assert root.flat_choices('>') is not root.flat_choices()
+
+
+def test_flat_choices_do_not_unload_lazy_entries():
+    root = LazyDictMenuEntry('root', OrderedDict(
+        (letter, OrderedDict([(letter.lower() + '1', 1),
+                              (letter.lower() + '2', 2)]))
+        for letter in 'ABCD'), max_loaded=2)
+    choices = root.flat_choices()
+
+    assert list(choices)[:2] == ['A/a1', 'A/a2']
+    assert all(entry.root is root for entry in choices.values())
+    assert choices['A/a1'].usage_key == 'root/A/a1'
+
+
+def test_flat_choices_with_duplicated_labels():
+    root = MenuEntry('root')
+    MenuEntry('Vim', value='vim', parent=root)
+    MenuEntry('Vim', value='gvim', parent=root)
+
+    assert [(label, entry.value)
+            for label, entry in root.flat_choices(' > ').items()] == [
+        ('Vim', 'vim'), ('Vim (2)', 'gvim')]
+
+
+def test_deep_dict_menu_entry():
+    depth = 10000
+    data = 'leaf'
+    for level in range(depth):
+        data = {'level {:d}'.format(level): data}
+    entry = DictMenuEntry('root', data)
+
+    leaf, = entry.flat_choices().values()
+
+    assert leaf.value == 'leaf'
+    assert leaf.depth == depth
+
+
+class TaggedDictMenuEntry(DictMenuEntry):
+    def __init__(self, name, data, parent=None, tag='root'):
+        self.tag = tag
+        super(TaggedDictMenuEntry, self).__init__(name, data, parent=parent)
+
+    def init_new_child(self, child):
+        child.tag = self.tag
+
+
+def test_dict_menu_entry_subclasses_initialize_children():
+    root = TaggedDictMenuEntry('root', {'Editors': {'Vim': 'vim'}},
+                               tag='apps')
+
+    leaf, = root.flat_choices().values()
+
+    assert isinstance(leaf, TaggedDictMenuEntry)
+    assert leaf.tag == leaf.parent.tag == 'apps'
+
+
+def test_deep_lazy_dict_menu_entry_is_unloaded():
+    depth = 10000
+    data = 'leaf'
+    for level in range(depth):
+        data = {'level {:d}'.format(level): data}
+    root = LazyDictMenuEntry('root', data)
+    leaf, = root.flat_choices().values()
+    deepest = leaf.parent
+
+    root.unload()
+
+    assert not root._loaded and not deepest._loaded
+    assert leaf.parent is None
+    assert root.flat_choices()['/'.join(
+        'level {:d}'.format(level) for level in reversed(range(depth)))
+    ].value == 'leaf'
+
+
+def test_lazy_dict_menu_entry_matches_dict_menu_entry():
+    data = OrderedDict([
+        ('Development', OrderedDict([
+            ('Editors', OrderedDict([('Vim', 'vim'), ('Emacs', 'emacs')])),
+            ('Python', 'python'),
+            ('Empty', {})])),
+        ('Games', OrderedDict([('Chess', 'chess')]))])
+
+    assert ([(label, entry.value) for label, entry in
+             LazyDictMenuEntry('root', data).flat_choices().items()]
+            == [(label, entry.value) for label, entry in
+                DictMenuEntry('root', data).flat_choices().items()])
+
+
+def test_lazy_dict_menu_entry_loads_visited_entries_only():
+    root = LazyDictMenuEntry('root', {'Development': {'Editors': {
+        'Vim': 'vim'}}, 'Games': {'Chess': 'chess'}})
+    prompt = ScriptedPrompt(['Development', 'Editors', 'Vim'])
+
+    assert Menu(root, prompt).choose_value() == 'vim'
+    development, games = sorted(root.loaded_children, key=_name)
+    assert development.is_loaded and not games.is_loaded
+    assert not games.is_leaf
+
+
+def test_lazy_dict_menu_entry_submenu_factories():
+    calls = []
+
+    def list_windows():
+        calls.append(None)
+        return {'Terminal': 1, 'Browser': 2}
+
+    def list_workspaces():
+        for number in range(3):
+            yield 'Workspace {:d}'.format(number), number
+
+    root = LazyDictMenuEntry('root', OrderedDict([
+        ('Windows', list_windows),
+        ('Workspaces', list_workspaces())]), max_loaded=1)
+    windows, workspaces = root.children
+
+    assert not calls and not windows.is_leaf
+    assert sorted(_name(entry) for entry in windows.children) == [
+        'Browser', 'Terminal']
+    assert len(calls) == 1
+    # Loading another entry unloads the windows, which are listed again
+    assert [entry.value for entry in workspaces.children] == [0, 1, 2]
+    assert not windows.is_loaded
+    windows.children
+    assert len(calls) == 2
+    assert [entry.value for entry in workspaces.children] == [0, 1, 2]
+
+
+def test_lazy_entries_failing_to_load_are_loaded_again():
+    failures = [ValueError('once')]
+
+    def list_windows():
+        if failures:
+            raise failures.pop()
+        return {'Terminal': 1}
+
+    def list_partially():
+        yield 'First', 1
+        if failures:
+            raise failures.pop()
+        yield 'Second', 2
+
+    windows = LazyDictMenuEntry('Windows', list_windows)
+
+    with pytest.raises(ValueError):
+        windows.children
+    assert not windows.is_loaded and not windows.is_leaf
+    assert [_name(entry) for entry in windows.children] == ['Terminal']
+
+    failures.append(ValueError('once'))
+    partial = LazyDictMenuEntry('Partial', list_partially)
+
+    with pytest.raises(ValueError):
+        list(partial.iter_children())
+    assert not partial.is_loaded and partial.loaded_children == ()
+    assert [_name(entry) for entry in partial.iter_children()] == [
+        'First', 'Second']
+
+
+def _name(entry):
+    return entry.name
+
+
+def test_iter_children_loads_remaining_entries():
+    root = LazyDictMenuEntry('root', OrderedDict([('Vim', 'vim'),
+                                                  ('Emacs', 'emacs')]))
+    children = root.iter_children()
+
+    assert next(children).name == 'Vim'
+    assert len(root.loaded_children) == 1
+    children.close()
+    assert [entry.name for entry in root.children] == ['Vim', 'Emacs']
+    assert [entry.name for entry in root.iter_children()] == ['Vim', 'Emacs']
+
+
+def test_choices_are_streamed_to_prompts():
+    prompt = ScriptedPrompt(['Development', 'Editors', 'Vim'])
+    streamed = []
+    prompt.prompt_for_one = lambda choices: streamed.append(choices) or (
+        ScriptedPrompt.prompt_for_one(prompt, choices))
+
+    assert Menu(_make_tree(), prompt).choose_value() == 'vim'
+    assert all(iter(choices) is choices for choices in streamed)
+    assert prompt.prompted[1] == ['..', 'Editors', 'Python']
+
+
+def _duplicated_names_tree():
+    root = MenuEntry('root')
+    MenuEntry('Vim', value='vim', parent=root)
+    MenuEntry('..', value='dots', parent=root)
+    MenuEntry('Vim', value='gvim', parent=root)
+    return root
+
+
+def test_labeled_children_with_duplicated_names():
+    root = _duplicated_names_tree()
+
+    assert [(label, entry.value)
+            for label, entry in root.labeled_children().items()] == [
+        ('Vim', 'vim'), ('.. (2)', 'dots'), ('Vim (2)', 'gvim')]
+    assert list(root.iter_labeled_children()) == list(
+        root.labeled_children().items())
+
+
+def test_labeled_children_are_cached_until_children_change():
+    root = _duplicated_names_tree()
+    labeled_children = root.labeled_children()
+
+    assert root.labeled_children() is labeled_children
+
+    gvim = root.children[2]
+    gvim.parent = None
+    labeled_children = root.labeled_children()
+
+    assert list(labeled_children) == ['Vim', '.. (2)']
+    assert root.labeled_children() is labeled_children
+
+    gvim.parent = root
+
+    assert list(root.labeled_children()) == ['Vim', '.. (2)', 'Vim (2)']
+
+
+def test_labeled_children_are_cached_until_children_are_renamed():
+    root = _make_tree()
+    development = root.children[0]
+    labels = list(root.labeled_children())
+    flat_labels = list(root.flat_choices())
+
+    development.name = 'Programming'
+
+    assert list(root.labeled_children()) == ['Programming'] + labels[1:]
+    assert list(root.flat_choices()) == [
+        label.replace('Development', 'Programming') for label in flat_labels]
+
+
+def test_lazy_labeled_children_are_loaded_again():
+    root = LazyDictMenuEntry('root', OrderedDict([('Vim', 'vim')]))
+
+    assert list(root.labeled_children()) == ['Vim']
+    root.unload()
+    assert not root.is_loaded
+    assert list(root.labeled_children()) == ['Vim']
+    assert root.is_loaded
+
+
+def test_menus_tell_apart_entries_with_the_same_name():
+    prompt = ScriptedPrompt(['Vim (2)'])
+
+    assert Menu(_duplicated_names_tree(), prompt).choose_value() == 'gvim'
+    assert prompt.prompted == [['Vim', '.. (2)', 'Vim (2)']]
+
+
+def test_menus_sort_labeled_children_by_frecency():
+    root = _duplicated_names_tree()
+    frecency = FrecencyStore()
+    frecency.record_entry(root.children[1])
+    prompt = ScriptedPrompt(['.. (2)', 'Vim (2)'])
+
+    assert Menu(root, prompt, frecency=frecency).choose_value() == 'dots'
+    assert Menu(root, prompt, frecency=frecency).choose_value() == 'gvim'
+    assert prompt.prompted[0] == ['.. (2)', 'Vim', 'Vim (2)']
+
+
+def test_choose_values():
+    prompt = ScriptedPrompt([['Development'], ['Editors'], ['..'],
+                             ['..', 'Python', 'Editors']])
+
+    assert Menu(_make_tree(), prompt).choose_values() == ['python']
+    assert prompt.prompted[-1] == ['..', 'Editors', 'Python']
+
+    prompt = ScriptedPrompt([['Development'], ['Editors'], ['Emacs', 'Vim']])
+
+    assert Menu(_make_tree(), prompt).choose_values() == ['emacs', 'vim']
+
+
+def test_choose_values_ignores_submenus_chosen_together():
+    prompt = ScriptedPrompt([['Games', 'Development']])
+
+    assert Menu(_make_tree(), prompt).choose_values() == []
+
+
+def test_choose_values_with_single_choice_prompts():
+    prompt = ScriptedPrompt(['Games', 'Chess'])
+    prompt.prompt_for_many = lambda choices: Prompt.prompt_for_many(
+        prompt, choices)
+
+    assert Menu(_make_tree(), prompt).choose_values() == ['chess']
+
+    prompt.prompt_for_one = lambda choices: None
+
+    assert Menu(_make_tree(), prompt).choose_values() == []
+
+
+def test_simple_command_prompt_for_many(monkeypatch, capsys):
+    monkeypatch.setattr('pymenu.input', lambda prompt: '3, 0-1', raising=False)
+    prompt = SimpleCommandPrompt()
+
+    assert prompt.prompt_for_many(['a', 'b', 'c', 'd']) == ['d', 'a', 'b']
+    assert '   3 d' in capsys.readouterr().out
+
+    monkeypatch.setattr('pymenu.input', lambda prompt: '0,4', raising=False)
+
+    with pytest.raises(KeyError):
+        prompt.prompt_for_many(['a', 'b', 'c', 'd'])
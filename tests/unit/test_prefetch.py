@@ -0,0 +1,51 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from collections import OrderedDict
+import threading
+
+from pymenu import LazyDictMenuEntry, MenuEntry
+from pymenu.prefetch import load_entries, unloaded_entries
+
+
+def _broken():
+    raise ValueError('Unavailable')
+
+
+def _make_lazy_tree():
+    return LazyDictMenuEntry('root', OrderedDict([
+        ('Windows', lambda: {'Terminal': 'terminal'}),
+        ('Broken', _broken),
+        ('Games', {'Chess': 'chess'})]))
+
+
+def test_unloaded_entries():
+    root = _make_lazy_tree()
+    windows, broken, games = root.children
+    games.load()
+
+    assert unloaded_entries(root.children) == [windows, broken]
+    assert unloaded_entries(root.children, limit=1) == [windows]
+    assert unloaded_entries([MenuEntry('eager')]) == []
+
+
+def test_load_entries():
+    root = _make_lazy_tree()
+    windows, broken, games = root.children
+
+    load_entries(root.children, threading.Event())
+
+    assert windows.is_loaded and games.is_loaded
+    assert not broken.is_loaded
+
+
+def test_load_entries_until_stopped_or_out_of_budget():
+    root = _make_lazy_tree()
+    stopped = threading.Event()
+    stopped.set()
+
+    load_entries(root.children, stopped)
+    load_entries(root.children, threading.Event(), budget=0)
+
+    assert not any(entry.is_loaded for entry in root.children)
@@ -0,0 +1,92 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from collections import OrderedDict
+
+from pymenu import DictMenuEntry
+from pymenu.search import SearchIndex, fuzzy_score
+
+
+def _make_index():
+    return SearchIndex(DictMenuEntry('Applications', OrderedDict([
+        ('Development', OrderedDict([
+            ('Editors', OrderedDict([('Vim', 'vim'),
+                                     ('Emacs', 'emacs'),
+                                     ('GEdit', 'gedit')])),
+            ('Python', 'python')])),
+        ('Multimedia', OrderedDict([('VLC media player', 'vlc'),
+                                    ('Video Editor', 'kdenlive')]))])))
+
+
+def test_search_ranks_boundaries_first():
+    results = _make_index().search('vi')
+
+    assert [result.label for result in results[:2]] == [
+        'Development/Editors/Vim',
+        'Multimedia/Video Editor',
+    ]
+    assert results[0].entry.value == 'vim'
+    assert results[0].score > results[2].score
+
+
+def test_search_is_case_insensitive_and_limited():
+    index = _make_index()
+
+    assert len(index.search('E')) == 6
+    assert len(index.search('E', limit=2)) == 2
+    assert index.search('gedit')[0].label == 'Development/Editors/GEdit'
+    assert index.search('zzz') == []
+
+
+def test_session_narrows_and_widens():
+    index = _make_index()
+    session = index.session(limit=None)
+
+    assert [r.label for r in session.update('v')] == \
+        [r.label for r in index.search('v', limit=None)]
+    assert [r.entry.value for r in session.update('vlc')] == ['vlc',
+                                                              'emacs']
+    assert [r.entry.value for r in session.update('vlc m')] == ['vlc']
+    assert session.update('py')[0].entry.value == 'python'
+
+
+def _make_large_index():
+    words = ['video', 'editor', 'window', 'audio', 'office', 'terminal']
+    return SearchIndex(DictMenuEntry('Applications', OrderedDict(
+        [('Viewer', 'viewer')]
+        + [(first.title(), OrderedDict(
+            ('{} {} {:d}'.format(second.title(), third, number), number)
+            for second in words for third in words
+            for number in range(3)))
+           for first in words])))
+
+
+def test_session_ranks_like_search():
+    index = _make_large_index()
+    session = index.session(limit=5)
+
+    for query in ['v', 'vi', 'vid', 'vide', 'video', 'video e', 'vo', 'view',
+                  'te']:
+        assert session.update(query) == index.search(query, limit=5)
+
+
+def test_session_does_not_score_hopeless_matches(monkeypatch):
+    index = SearchIndex(DictMenuEntry('Applications', OrderedDict(
+        [('Viewer', 'viewer')]
+        + [('Vintage Window {:d}'.format(number), number)
+           for number in range(20)])))
+    session = index.session(limit=1)
+    scored = []
+
+    def counting_score(*args):
+        scored.append(args[1])
+        return fuzzy_score(*args)
+
+    monkeypatch.setattr('pymenu.search.fuzzy_score', counting_score)
+    session.update('vi')
+    session.update('vie')
+    del scored[:]
+
+    assert session.update('view')[0].label == 'Viewer'
+    assert scored == ['viewer']
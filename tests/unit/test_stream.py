@@ -0,0 +1,70 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import io
+import json
+
+import pytest
+
+from pymenu import DictMenuEntry
+from pymenu.stream import iter_json_events, menu_from_events
+
+
+DOCUMENT = {
+    'Development': {
+        'Editors': {'Vim': 'vim', 'Emacs': 'emacs -nw "file"'},
+        'Python': 3.6,
+        'Tools': ['make', {'cmake': None}],
+        'Empty': {},
+    },
+    'Games': {'Chess': True, 'Solitaire': -12},
+    'Unicode é\\': 'café\n',
+}
+
+
+def _describe(entry):
+    return [(node.name, node.value if node.is_leaf else None)
+            for node in entry.descendants]
+
+
+def _stream_menu(document, chunk_size):
+    data = json.dumps(document).encode('utf8')
+    events = iter_json_events(io.BytesIO(data), chunk_size=chunk_size)
+    return menu_from_events('root', events)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 64 * 1024])
+def test_streamed_menu_matches_dict_menu(chunk_size):
+    streamed = _stream_menu(DOCUMENT, chunk_size)
+
+    assert _describe(streamed) == _describe(DictMenuEntry('root', DOCUMENT))
+
+
+def test_numbers_split_across_chunks():
+    events = list(iter_json_events(io.BytesIO(b'[12345, -1.5e10]'),
+                                   chunk_size=2))
+
+    assert events[1:3] == [('number', 12345), ('number', -1.5e10)]
+
+
+def test_scalar_document_is_the_root_value():
+    assert _stream_menu('vim', 4).value == 'vim'
+
+
+@pytest.mark.parametrize('data', [b'{"a": 1', b'{"a": 1]', b'{"a": tru}',
+                                  b'{"a": 1} x', b'{"a" 1}', b'[1,,2]',
+                                  b'{"a": 01}', b'{"a": 1,}', b'[1 2]',
+                                  b'{1: 2}', b'[1: 2]', b''])
+def test_invalid_documents(data):
+    with pytest.raises(ValueError):
+        list(iter_json_events(io.BytesIO(data), chunk_size=4))
+
+
+@pytest.mark.parametrize('start', [b'[x', b'{"a": tx', b'[1, -a', b'[nul '])
+def test_invalid_tokens_are_reported_before_the_end(start):
+    stream = io.BytesIO(start + b' ' * 100000)
+
+    with pytest.raises(ValueError):
+        list(iter_json_events(stream, chunk_size=4))
+    assert stream.tell() < 100
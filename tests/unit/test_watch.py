@@ -0,0 +1,22 @@
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from pymenu import DictMenuEntry
+from pymenu.watch import merge_entries
+
+
+def test_merge_entries_keeps_unchanged_entries():
+    entry = DictMenuEntry('root', {'a': {'x': 1, 'y': 2}, 'b': 3})
+    kept_a = [child for child in entry.children if child.name == 'a'][0]
+    kept_x = [child for child in kept_a.children if child.name == 'x'][0]
+
+    new_entry = DictMenuEntry('root', {'a': {'x': 10, 'z': 4}, 'c': 5})
+    changed = merge_entries(entry, new_entry)
+
+    assert set(changed) == {entry, kept_a}
+    assert [child.name for child in entry.children] == ['a', 'c']
+    assert entry.children[0] is kept_a
+    assert [child.name for child in kept_a.children] == ['x', 'z']
+    assert kept_a.children[0] is kept_x
+    assert kept_x.value == 10